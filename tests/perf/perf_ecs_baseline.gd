@@ -1,7 +1,12 @@
 extends SceneTree
 
+# Defaults; override with user args, e.g. `++ --entities=1000 --frames=240 --warmup-frames=30`
 const ENTITY_COUNT := 100
 const FRAMES_TO_SIMULATE := 120
+const WARMUP_FRAMES := 0
+
+# Prefix of the single-line JSON result parsed by tools/bench_ecs.py
+const RESULT_PREFIX := "PERF_ECS_RESULT "
 
 const ECS_MANAGER := preload("res://scripts/core/managers/m_ecs_manager.gd")
 const ECS_SYSTEM := preload("res://scripts/core/ecs/base_ecs_system.gd")
@@ -34,10 +39,27 @@ const RS_LANDING := preload("res://scripts/core/resources/ecs/rs_landing_indicat
 var _origin: Node
 var _manager: M_ECSManager
 var _systems: Array[BaseECSSystem] = []
+var _entity_count: int = ENTITY_COUNT
+var _frames_to_simulate: int = FRAMES_TO_SIMULATE
+var _warmup_frames: int = WARMUP_FRAMES
 
 func _initialize() -> void:
+	_parse_user_args()
 	call_deferred("_run_baseline")
 
+func _parse_user_args() -> void:
+	for arg in OS.get_cmdline_user_args():
+		var parts := arg.split("=", true, 1)
+		if parts.size() != 2 or not parts[1].is_valid_int():
+			continue
+		match parts[0]:
+			"--entities":
+				_entity_count = maxi(1, parts[1].to_int())
+			"--frames":
+				_frames_to_simulate = maxi(1, parts[1].to_int())
+			"--warmup-frames":
+				_warmup_frames = maxi(0, parts[1].to_int())
+
 func _run_baseline() -> void:
 	_origin = Node.new()
 	_origin.name = "PerfRoot"
@@ -91,7 +113,7 @@ func _setup_entities() -> void:
 	entities_root.name = "Entities"
 	_origin.add_child(entities_root)
 
-	for index in range(ENTITY_COUNT):
+	for index in range(_entity_count):
 		var entity := Node3D.new()
 		entity.name = "E_Perf_%03d" % index
 		entities_root.add_child(entity)
@@ -177,7 +199,11 @@ func _simulate_frames() -> Dictionary:
 
 	var delta := 0.016
 
-	for _i in range(FRAMES_TO_SIMULATE):
+	for _i in range(_warmup_frames):
+		for system in _manager.get_systems():
+			system.process_tick(delta)
+
+	for _i in range(_frames_to_simulate):
 		var frame_start := Time.get_ticks_usec()
 		var systems := _manager.get_systems()
 		for system in systems:
@@ -195,15 +221,26 @@ func _report_results(setup_duration_ms: int, measurements: Dictionary) -> void:
 	var total_time_usec: int = measurements["total_time_usec"]
 	var system_time_totals: Dictionary = measurements["system_time_totals"]
 
-	var avg_frame_time_ms: float = float(total_time_usec) / float(FRAMES_TO_SIMULATE) / 1000.0
+	var avg_frame_time_ms: float = float(total_time_usec) / float(_frames_to_simulate) / 1000.0
+	var system_avg_ms: Dictionary = {}
 
 	print("--- ECS Baseline Performance ---")
-	print("Entities: %d | Components per entity: 7" % ENTITY_COUNT)
+	print("Entities: %d | Components per entity: 7" % _entity_count)
 	print("Setup time (ms): %d" % setup_duration_ms)
-	print("Simulated frames: %d" % FRAMES_TO_SIMULATE)
+	print("Simulated frames: %d (warmup: %d)" % [_frames_to_simulate, _warmup_frames])
 	print("Average frame time (ms): %.4f" % avg_frame_time_ms)
 
 	print("Average system time per frame (ms):")
 	for system_name in system_time_totals.keys():
-		var avg_ms := float(system_time_totals[system_name]) / float(FRAMES_TO_SIMULATE) / 1000.0
+		var avg_ms := float(system_time_totals[system_name]) / float(_frames_to_simulate) / 1000.0
+		system_avg_ms[String(system_name)] = avg_ms
 		print("  %s: %.4f" % [system_name, avg_ms])
+
+	print(RESULT_PREFIX + JSON.stringify({
+		"entities": _entity_count,
+		"frames": _frames_to_simulate,
+		"warmup_frames": _warmup_frames,
+		"setup_ms": setup_duration_ms,
+		"frame_ms": avg_frame_time_ms,
+		"systems": system_avg_ms,
+	}))
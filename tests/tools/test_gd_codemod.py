@@ -0,0 +1,129 @@
+"""Tests for the edit merging, applying and diffing in gd_codemod."""
+
+import subprocess
+
+import pytest
+
+from gd_codemod import SourceFile, apply_edits, merge_edits, unified_diff
+
+
+def edit(start, end, replacement, rule="rule"):
+    return {'rule': rule, 'start': start, 'end': end, 'replacement': replacement,
+            'line': 1, 'end_line': 1}
+
+
+def merged_text(text, edits_by_rule):
+    accepted, conflicts = merge_edits(edits_by_rule)
+    return apply_edits(text, accepted), conflicts
+
+
+def test_disjoint_edits_from_several_rules_all_apply():
+    text, conflicts = merged_text("abcdefghij", [
+        ("a", [edit(0, 1, "A", "a"), edit(8, 10, "", "a")]),
+        ("b", [edit(3, 5, "DE", "b")]),
+    ])
+    assert text == "AbcDEfgh"
+    assert conflicts == []
+
+
+def test_exact_duplicate_is_dropped_silently():
+    text, conflicts = merged_text("abcdef", [
+        ("a", [edit(1, 3, "", "a")]),
+        ("b", [edit(1, 3, "", "b")]),
+    ])
+    assert text == "adef"
+    assert conflicts == []
+
+
+def test_overlapping_edit_of_later_rule_is_a_conflict():
+    text, conflicts = merged_text("abcdefghij", [
+        ("a", [edit(2, 6, "", "a")]),
+        ("b", [edit(4, 8, "", "b")]),
+    ])
+    assert text == "abghij"
+    assert conflicts == [{'rule': "b", 'line': 1, 'with_rule': "a", 'with_line': 1}]
+
+
+def test_insert_inside_deletion_is_a_conflict():
+    text, conflicts = merged_text("abcdefghij", [
+        ("delete", [edit(2, 8, "", "delete")]),
+        ("insert", [edit(5, 5, "XYZ", "insert")]),
+    ])
+    assert text == "abij"
+    assert [c['rule'] for c in conflicts] == ["insert"]
+
+
+def test_deletion_around_accepted_insert_is_a_conflict():
+    text, conflicts = merged_text("abcdefghij", [
+        ("insert", [edit(5, 5, "XYZ", "insert")]),
+        ("delete", [edit(2, 8, "", "delete")]),
+    ])
+    assert text == "abcdeXYZfghij"
+    assert [c['rule'] for c in conflicts] == ["delete"]
+
+
+def test_inserts_at_deletion_boundaries_are_not_conflicts():
+    text, conflicts = merged_text("abcdefghij", [
+        ("delete", [edit(2, 8, "", "delete")]),
+        ("insert", [edit(8, 8, "<", "insert")]),
+    ])
+    assert text == "ab<ij"
+    assert conflicts == []
+
+
+def test_two_inserts_at_one_point_conflict():
+    text, conflicts = merged_text("abc", [
+        ("a", [edit(1, 1, "X", "a")]),
+        ("b", [edit(1, 1, "Y", "b")]),
+    ])
+    assert text == "aXbc"
+    assert [c['rule'] for c in conflicts] == ["b"]
+
+
+def test_wide_edit_spanning_several_accepted_edits_is_a_conflict():
+    text, conflicts = merged_text("abcdefghijklmnop", [
+        ("small", [edit(1, 2, "B", "small"), edit(4, 5, "E", "small"),
+                   edit(7, 8, "H", "small"), edit(10, 10, "+", "small")]),
+        ("wide", [edit(0, 12, "", "wide")]),
+    ])
+    assert text == "aBcdEfgHij+klmnop"
+    assert [c['rule'] for c in conflicts] == ["wide"]
+
+
+def test_edit_inside_earlier_wide_edit_is_a_conflict():
+    # The clash is several accepted edits before the insertion point
+    text, conflicts = merged_text("abcdefghijklmnop", [
+        ("wide", [edit(0, 12, "", "wide"), edit(13, 14, "N", "wide")]),
+        ("small", [edit(9, 10, "J", "small")]),
+    ])
+    assert text == "mNop"
+    assert [c['rule'] for c in conflicts] == ["small"]
+
+
+def test_delete_lines_covers_the_trailing_newline():
+    source = SourceFile(None, "x.gd", "one\ntwo\nthree\n")
+    assert apply_edits(source.text, [source.delete_lines(2, 2, "rule")]) == "one\nthree\n"
+    assert source.line_text(3) == "three"
+
+
+@pytest.mark.parametrize("old, new", [
+    ("a\nb\n", "a\nc\n"),
+    ("a\nb", "a\nc"),
+    ("a\nb", "a\nb\n"),
+    ("a\nb\n", "a\nb"),
+    ("a\nb\nc", "a\nc"),
+])
+def test_unified_diff_applies_with_git(tmp_path, old, new):
+    (tmp_path / "x.gd").write_bytes(old.encode())
+    patch = tmp_path / "x.diff"
+    patch.write_bytes(unified_diff("x.gd", old, new).encode())
+
+    subprocess.run(["git", "apply", str(patch)], cwd=tmp_path, check=True)
+
+    assert (tmp_path / "x.gd").read_bytes() == new.encode()
+
+
+def test_unified_diff_marks_missing_newline():
+    assert unified_diff("x.gd", "a\nb", "a\nc").splitlines()[-4:] == [
+        "-b", "\\ No newline at end of file", "+c", "\\ No newline at end of file",
+    ]
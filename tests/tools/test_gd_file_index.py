@@ -0,0 +1,91 @@
+"""Tests for the stat/hash validation of gd_file_index.FileIndex."""
+
+import os
+
+from gd_file_index import FileIndex
+
+SOURCE = 'class_name Foo\nconst Bar = preload("res://bar.gd")\n'
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def reload(index):
+    index.save()
+    return FileIndex.load(index.project_root, path=index.path)
+
+
+def test_facts_survive_a_reload_without_reparsing(tmp_path):
+    script = tmp_path / "foo.gd"
+    write(script, SOURCE, 1_000_000_000)
+    index = FileIndex.load(tmp_path, path=tmp_path / "index.json")
+
+    facts = index.get_facts(script)
+    assert facts['class_name'] == "Foo"
+    assert [p['const_name'] for p in facts['const_preloads']] == ["Bar"]
+    assert (index.hits, index.misses) == (0, 1)
+
+    index = reload(index)
+    assert index.get_facts(script) == facts
+    assert (index.hits, index.misses) == (1, 0)
+
+
+def test_touched_but_unchanged_file_is_a_hash_hit(tmp_path):
+    script = tmp_path / "foo.gd"
+    write(script, SOURCE, 1_000_000_000)
+    index = FileIndex.load(tmp_path, path=tmp_path / "index.json")
+    index.get_facts(script)
+
+    write(script, SOURCE, 2_000_000_000)
+    index = reload(index)
+    assert index.get_facts(script)['class_name'] == "Foo"
+    assert (index.hits, index.misses) == (1, 0)
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    script = tmp_path / "foo.gd"
+    write(script, SOURCE, 1_000_000_000)
+    index = FileIndex.load(tmp_path, path=tmp_path / "index.json")
+    index.get_facts(script)
+
+    write(script, SOURCE.replace("Foo", "Baz"), 2_000_000_000)
+    index = reload(index)
+    assert index.get_facts(script)['class_name'] == "Baz"
+    assert (index.hits, index.misses) == (0, 1)
+
+
+def test_stale_version_starts_empty(tmp_path):
+    (tmp_path / "index.json").write_text('{"version": -1, "entries": {"foo.gd": {}}}', encoding='utf-8')
+    assert FileIndex.load(tmp_path, path=tmp_path / "index.json").entries == {}
+
+
+def test_unreadable_file_has_no_facts(tmp_path, capsys):
+    index = FileIndex.load(tmp_path, path=tmp_path / "index.json")
+    assert index.get_facts(tmp_path / "missing.gd") is None
+    assert "Error reading" in capsys.readouterr().out
+
+
+def test_extract_content_records_nothing(tmp_path):
+    script = tmp_path / "foo.gd"
+    write(script, SOURCE, 1_000_000_000)
+    index = FileIndex.load(tmp_path, path=tmp_path / "index.json")
+
+    staged = index.extract_content(script, SOURCE.replace("Foo", "Staged").encode('utf-8'))
+    assert staged['class_name'] == "Staged"
+    assert index.entries == {}
+    assert index.get_facts(script)['class_name'] == "Foo"
+
+
+def test_prune_drops_files_not_requested(tmp_path):
+    for name in ("a.gd", "b.gd"):
+        write(tmp_path / name, SOURCE, 1_000_000_000)
+    index = FileIndex.load(tmp_path, path=tmp_path / "index.json")
+    index.get_facts(tmp_path / "a.gd")
+    index.get_facts(tmp_path / "b.gd")
+
+    index = reload(index)
+    index.get_facts(tmp_path / "a.gd")
+    assert index.prune() == 1
+    assert list(index.entries) == ["a.gd"]
@@ -0,0 +1,75 @@
+"""Tests for the NEWLINE/INDENT/DEDENT structure produced by gd_lexer."""
+
+import pytest
+
+from gd_lexer import DEDENT, EOF, INDENT, NAME, NEWLINE, STRING, tokenize
+
+
+def layout(source):
+    """Return the token kinds, with NAME tokens as their value."""
+    return [token.value if token.kind == NAME else token.kind for token in tokenize(source)]
+
+
+def test_nested_blocks_close_with_one_dedent_per_level():
+    source = "func f():\n\tif a:\n\t\tb\nc\n"
+    assert layout(source) == [
+        "func", "f", "OP", "OP", "OP", NEWLINE,
+        INDENT, "if", "a", "OP", NEWLINE,
+        INDENT, "b", NEWLINE,
+        DEDENT, DEDENT, "c", NEWLINE,
+        EOF,
+    ]
+
+
+def test_blank_and_comment_lines_do_not_change_indentation():
+    source = "if a:\n\tb\n\n# note\n        \n\t# indented note\n\tc\nd\n"
+    assert layout(source) == [
+        "if", "a", "OP", NEWLINE,
+        INDENT, "b", NEWLINE, "c", NEWLINE,
+        DEDENT, "d", NEWLINE,
+        EOF,
+    ]
+
+
+def test_open_blocks_are_closed_at_eof_without_trailing_newline():
+    assert layout("if a:\n\tif b:\n\t\tc") == [
+        "if", "a", "OP", NEWLINE,
+        INDENT, "if", "b", "OP", NEWLINE,
+        INDENT, "c", NEWLINE,
+        DEDENT, DEDENT, EOF,
+    ]
+
+
+def test_tabs_and_spaces_are_compared_by_width():
+    assert layout("if a:\n\tb\n    c\n") == [
+        "if", "a", "OP", NEWLINE, INDENT, "b", NEWLINE, "c", NEWLINE, DEDENT, EOF,
+    ]
+
+
+def test_bracketed_lines_are_one_logical_line():
+    source = "var x = [\n\t1,\n\t\t2,\n]\ny\n"
+    kinds = layout(source)
+    assert INDENT not in kinds and DEDENT not in kinds
+    assert kinds.count(NEWLINE) == 2
+    assert kinds[-3:] == ["y", NEWLINE, EOF]
+
+
+def test_backslash_continuation_is_one_logical_line():
+    source = "var x = a + \\\n\t\tb\nc\n"
+    tokens = list(tokenize(source))
+    assert [t.kind for t in tokens].count(NEWLINE) == 2
+    assert INDENT not in [t.kind for t in tokens]
+    assert tokens[-2].line == 3
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_line_numbers_follow_multiline_strings(newline):
+    source = newline.join(['var s = """one', 'two"""', 'if a:', '\tb', ''])
+    tokens = list(tokenize(source))
+    assert [t.kind for t in tokens if t.kind in (STRING, INDENT, DEDENT)] == [STRING, INDENT, DEDENT]
+    assert next(t for t in tokens if t.value == "b").line == 4
+
+
+def test_empty_source_is_just_eof():
+    assert layout("") == [EOF]
+    assert layout("\n\n# only a comment\n") == [EOF]
@@ -0,0 +1,34 @@
+"""Tests for gd_parser's handling of malformed function headers."""
+
+import pytest
+
+from gd_parser import parse_source
+
+
+def function_names(source):
+    return [func['name'] for func in parse_source(source)['functions']]
+
+
+@pytest.mark.parametrize("source", [
+    "func broken(a, b",
+    "func broken(a, b)\n",
+    "func broken(\n\ta,\n",
+    "func broken -> int\n",
+])
+def test_truncated_header_is_skipped(source):
+    assert function_names(source) == []
+
+
+def test_parsing_continues_after_a_malformed_header():
+    source = "func nope\n\tpass\nfunc ok():\n\tpass\nvar after = 1\n"
+    tree = parse_source(source)
+    assert [func['name'] for func in tree['functions']] == ["ok"]
+    assert [var['name'] for var in tree['vars']] == ["after"]
+
+
+def test_header_parts():
+    source = "static func f(a, b: int = 3) -> Array[int]:\n\treturn [a, b]\nfunc g(): pass\n"
+    f, g = parse_source(source)['functions']
+    assert (f['name'], f['static'], f['return_type']) == ("f", True, "Array[int]")
+    assert [(p['name'], p['type'], p['default']) for p in f['params']] == [("a", None, None), ("b", "int", "3")]
+    assert (g['name'], g['return_type'], g['params']) == ("g", None, [])
@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+"""
+Asset budget analyzer for textures, audio, models and fonts.
+
+For every asset under the asset roots (default: assets/) this reads the
+metadata in its header, never decoding pixels or samples:
+
+- Images:  PNG, JPEG and WebP dimensions and alpha; SVG width/height/viewBox
+- Audio:   WAV format chunk, Ogg Vorbis/Opus identification header plus the
+           last page's granule position, MP3 frame header plus Xing/VBRI
+           frame count (or the CBR estimate) -> duration, rate, channels
+- Models:  glTF/GLB JSON chunk -> meshes, vertices, triangles, images
+- Fonts:   TTF/OTF maxp table -> glyph count
+
+and joins it with the asset's .import sidecar (compression mode, mipmaps,
+size limit, SVG scale). Referrers come from the res:// dependency graph
+(ext_resource, preload, load, project.godot) plus res:// and uid:// string
+literals in scripts and project.godot. A directory literal covers every
+asset below it only when a script builds paths from it (`dir + name`,
+path_join, DirAccess listing), directly or through the variable holding it.
+
+Flags:
+- asset-texture-oversized:     largest imported side over --max-texture-size
+- asset-texture-uncompressed:  not VRAM-compressed and over --max-uncompressed-kb of VRAM
+- asset-audio-not-streamed:    WAV (decoded fully into memory) longer than --max-wav-seconds;
+                               MP3 and Ogg stay compressed and stream on playback
+- asset-unreferenced:          nothing refers to the asset
+
+VRAM is estimated as width x height x bytes per pixel (4 with alpha, 3
+without; 1 and 0.5 when VRAM-compressed) x 4/3 with mipmaps. Export size
+uses the imported artifact when .godot/imported has one.
+
+Header metadata is cached per asset in .tools_cache/asset_index.json,
+validated by content hash.
+
+Usage:
+    python3 tools/asset_budget.py                         # Report and flag everything under assets/
+    python3 tools/asset_budget.py --roots assets/core/
+    python3 tools/asset_budget.py --max-texture-size 1024 --max-wav-seconds 3
+    python3 tools/asset_budget.py --format sarif > assets.sarif
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from gd_config import load_config
+from gd_file_index import FileIndex
+from gd_lexer import NAME, OP, STRING, string_value, tokenize
+from gd_output import EXIT_CLEAN, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_profile import add_profile_arguments, start_profiler
+from gd_scanner import walk_tree
+from preload_cost_report import format_bytes, load_bytes
+from res_dep_graph import EXCLUDED_DIRS, GraphBuilder, PROJECT_FILE
+
+ASSET_ROOTS = ["assets/"]
+
+TEXTURE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".svg"}
+AUDIO_SUFFIXES = {".wav", ".ogg", ".mp3"}
+MODEL_SUFFIXES = {".glb", ".gltf"}
+FONT_SUFFIXES = {".ttf", ".otf"}
+CATEGORIES = {
+    "textures": TEXTURE_SUFFIXES,
+    "audio": AUDIO_SUFFIXES,
+    "models": MODEL_SUFFIXES,
+    "fonts": FONT_SUFFIXES,
+}
+
+# compress/mode of the texture importer
+TEXTURE_MODES = ["lossless", "lossy", "vram_compressed", "vram_uncompressed", "basis_universal"]
+VRAM_COMPRESSED_MODES = {"vram_compressed", "basis_universal"}
+
+# Literal res:// and uid:// strings in scripts and project.godot
+REFERENCE_LITERAL_PATTERN = re.compile(r'"\*?((?:res|uid)://[^"]*)"')
+# A res:// directory literal in a script, a candidate for building asset paths
+DIRECTORY_LITERAL_PATTERN = re.compile(r'"res://[^"]*/"')
+# Calls that list a directory, so a directory passed to them reaches its files
+DIRECTORY_LISTING_CALLS = {"open", "get_files_at", "get_directories_at", "list_directory"}
+SVG_SIZE_PATTERN = re.compile(r'\b(width|height)="([\d.]+)(?:px)?"')
+SVG_VIEWBOX_PATTERN = re.compile(r'\bviewBox="[\d.\-]+[ ,]+[\d.\-]+[ ,]+([\d.]+)[ ,]+([\d.]+)"')
+
+MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = [44100, 48000, 32000]
+
+RULES = {
+    "asset-texture-oversized": "texture larger than the size budget",
+    "asset-texture-uncompressed": "uncompressed texture over the VRAM budget",
+    "asset-audio-not-streamed": "long audio decoded fully into memory",
+    "asset-unreferenced": "asset that nothing refers to",
+}
+
+
+def category_of(rel_path):
+    suffix = os.path.splitext(rel_path)[1].lower()
+    return next((name for name, suffixes in CATEGORIES.items() if suffix in suffixes), None)
+
+
+# --- Header readers: each takes the file bytes and returns a metadata dict ---
+
+def png_info(data):
+    if data[:8] != b"\x89PNG\r\n\x1a\n" or data[12:16] != b"IHDR":
+        return None
+    width, height, _bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    has_alpha = color_type in (4, 6) or b"tRNS" in data[33:data.find(b"IDAT")]
+    return {'width': width, 'height': height, 'alpha': has_alpha}
+
+
+def jpeg_info(data):
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        length = struct.unpack(">H", data[i + 2:i + 4])[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return {'width': width, 'height': height, 'alpha': False}
+        i += 2 + length
+    return None
+
+
+def webp_info(data):
+    if data[:4] != b"RIFF" or data[8:12] != b"WEBP":
+        return None
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[26:30])
+        return {'width': width & 0x3FFF, 'height': height & 0x3FFF, 'alpha': False}
+    if chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], 'little')
+        return {'width': (bits & 0x3FFF) + 1, 'height': ((bits >> 14) & 0x3FFF) + 1,
+                'alpha': bool((bits >> 28) & 1)}
+    if chunk == b"VP8X":
+        return {'width': int.from_bytes(data[24:27], 'little') + 1,
+                'height': int.from_bytes(data[27:30], 'little') + 1,
+                'alpha': bool(data[20] & 0x10)}
+    return None
+
+
+def svg_info(data):
+    head = data[:4096].decode('utf-8', 'replace')
+    start = head.find("<svg")
+    if start < 0:
+        return None
+    tag = head[start:head.find(">", start)]
+    sizes = dict(SVG_SIZE_PATTERN.findall(tag))
+    if 'width' in sizes and 'height' in sizes:
+        width, height = float(sizes['width']), float(sizes['height'])
+    else:
+        match = SVG_VIEWBOX_PATTERN.search(tag)
+        if not match:
+            return None
+        width, height = float(match.group(1)), float(match.group(2))
+    return {'width': round(width), 'height': round(height), 'alpha': True}
+
+
+def wav_info(data):
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    info = {}
+    i = 12
+    while i + 8 <= len(data):
+        chunk, size = data[i:i + 4], struct.unpack("<I", data[i + 4:i + 8])[0]
+        if chunk == b"fmt ":
+            _format, channels, rate, byte_rate, _align, bits = struct.unpack("<HHIIHH", data[i + 8:i + 24])
+            info.update(channels=channels, sample_rate=rate, byte_rate=byte_rate, bits=bits)
+        elif chunk == b"data":
+            if not info.get('byte_rate'):
+                return None
+            info['duration'] = size / info['byte_rate']
+            return {'codec': "wav", 'duration': info['duration'], 'sample_rate': info['sample_rate'],
+                    'channels': info['channels'], 'bits': info['bits']}
+        i += 8 + size + (size & 1)
+    return None
+
+
+def ogg_info(data):
+    if data[:4] != b"OggS":
+        return None
+    page_header = 27 + data[26]
+    packet = data[page_header:page_header + 30]
+    if packet[:7] == b"\x01vorbis":
+        codec, channels, rate = "vorbis", packet[11], struct.unpack("<I", packet[12:16])[0]
+        granule_rate = rate
+    elif packet[:8] == b"OpusHead":
+        codec, channels, rate = "opus", packet[9], struct.unpack("<I", packet[12:16])[0]
+        granule_rate = 48000
+    else:
+        return None
+    last = data.rfind(b"OggS", max(0, len(data) - 65536))
+    granule = struct.unpack("<q", data[last + 6:last + 14])[0] if last >= 0 else 0
+    return {'codec': codec, 'duration': max(granule, 0) / granule_rate if granule_rate else 0,
+            'sample_rate': rate, 'channels': channels}
+
+
+def mp3_info(data):
+    i = 0
+    if data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        i = 10 + size + (10 if data[5] & 0x10 else 0)
+    limit = min(len(data) - 4, i + 65536)
+    while i < limit and not (data[i] == 0xFF and data[i + 1] & 0xE0 == 0xE0):
+        i += 1
+    if i >= limit:
+        return None
+
+    header = struct.unpack(">I", data[i:i + 4])[0]
+    version_bits = (header >> 19) & 3
+    mpeg = 1 if version_bits == 3 else 2
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 3
+    if (header >> 17) & 3 != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    rate = MP3_SAMPLE_RATES[rate_index] // (1 if version_bits == 3 else 2 if version_bits == 2 else 4)
+    channels = 1 if (header >> 6) & 3 == 3 else 2
+    samples_per_frame = 1152 if mpeg == 1 else 576
+    bitrate = MP3_BITRATES[mpeg][bitrate_index] * 1000
+
+    side_info = (32 if channels == 2 else 17) if mpeg == 1 else (17 if channels == 2 else 9)
+    frames = None
+    xing = i + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and struct.unpack(">I", data[xing + 4:xing + 8])[0] & 1:
+        frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+    elif data[i + 36:i + 40] == b"VBRI":
+        frames = struct.unpack(">I", data[i + 50:i + 54])[0]
+    if frames:
+        duration = frames * samples_per_frame / rate
+    else:
+        duration = (len(data) - i) * 8 / bitrate
+    return {'codec': "mp3", 'duration': duration, 'sample_rate': rate, 'channels': channels,
+            'bitrate': bitrate}
+
+
+def gltf_info(data):
+    if data[:4] == b"glTF":
+        length, kind = struct.unpack("<I4s", data[12:20])
+        if kind != b"JSON":
+            return None
+        document = data[20:20 + length]
+    else:
+        document = data
+    try:
+        gltf = json.loads(document.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+    accessors = gltf.get('accessors', [])
+
+    def accessor_count(index):
+        return accessors[index].get('count', 0) if isinstance(index, int) and index < len(accessors) else 0
+
+    vertices = 0
+    triangles = 0
+    primitives = 0
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            primitives += 1
+            count = accessor_count(primitive.get('attributes', {}).get('POSITION'))
+            vertices += count
+            if primitive.get('mode', 4) == 4:
+                indices = primitive.get('indices')
+                triangles += (accessor_count(indices) if indices is not None else count) // 3
+    return {'meshes': len(gltf.get('meshes', [])), 'primitives': primitives, 'vertices': vertices,
+            'triangles': triangles, 'images': len(gltf.get('images', [])),
+            'animations': len(gltf.get('animations', [])), 'skins': len(gltf.get('skins', []))}
+
+
+def font_info(data):
+    if data[:4] not in (b"\x00\x01\x00\x00", b"OTTO", b"true"):
+        return None
+    num_tables = struct.unpack(">H", data[4:6])[0]
+    for t in range(num_tables):
+        entry = 12 + 16 * t
+        tag, _checksum, offset, _length = struct.unpack(">4sIII", data[entry:entry + 16])
+        if tag == b"maxp":
+            return {'glyphs': struct.unpack(">H", data[offset + 4:offset + 6])[0]}
+    return None
+
+
+HEADER_READERS = {
+    ".png": png_info,
+    ".jpg": jpeg_info,
+    ".jpeg": jpeg_info,
+    ".webp": webp_info,
+    ".svg": svg_info,
+    ".wav": wav_info,
+    ".ogg": ogg_info,
+    ".mp3": mp3_info,
+    ".glb": gltf_info,
+    ".gltf": gltf_info,
+    ".ttf": font_info,
+    ".otf": font_info,
+}
+
+
+def read_metadata(rel_path, data):
+    """Return the header metadata for an asset's bytes ({} if the format is not recognised)."""
+    reader = HEADER_READERS.get(os.path.splitext(rel_path)[1].lower())
+    try:
+        info = reader(data) if reader else None
+    except (struct.error, IndexError, ZeroDivisionError):
+        info = None
+    return info or {}
+
+
+class AssetIndex(FileIndex):
+    """FileIndex variant whose entries hold each asset's header metadata."""
+
+    version = 1
+    filename = "asset_index.json"
+
+    extract_phase = "headers"
+
+    def extract(self, key, data):
+        return read_metadata(key, data)
+
+
+def read_import_settings(import_path):
+    """Return {'importer', 'type', 'params'} from an .import sidecar, or None without one."""
+    settings = {'importer': None, 'type': None, 'params': {}}
+    section = None
+    try:
+        with open(import_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('[') and line.endswith(']'):
+                    section = line[1:-1]
+                    continue
+                key, sep, value = line.partition('=')
+                if not sep:
+                    continue
+                value = value.strip('"')
+                if section == "remap" and key in ("importer", "type"):
+                    settings[key] = value
+                elif section == "params":
+                    settings['params'][key] = value
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Error reading {import_path}: {e}")
+        return None
+    return settings
+
+
+def texture_budget(meta, settings):
+    """Return (width, height, mode, mipmaps, vram_bytes) as imported."""
+    params = settings['params'] if settings else {}
+    width, height = meta['width'], meta['height']
+    scale = float(params.get('svg/scale', 1.0))
+    width, height = round(width * scale), round(height * scale)
+    limit = int(params.get('process/size_limit', 0) or 0)
+    if limit and max(width, height) > limit:
+        factor = limit / max(width, height)
+        width, height = max(1, round(width * factor)), max(1, round(height * factor))
+
+    mode_index = int(params.get('compress/mode', 0))
+    mode = TEXTURE_MODES[mode_index] if mode_index < len(TEXTURE_MODES) else "lossless"
+    mipmaps = params.get('mipmaps/generate') == "true"
+    if mode in VRAM_COMPRESSED_MODES:
+        bytes_per_pixel = 1 if meta['alpha'] else 0.5
+    else:
+        bytes_per_pixel = 4 if meta['alpha'] else 3
+    vram = width * height * bytes_per_pixel * (4 / 3 if mipmaps else 1)
+    return width, height, mode, mipmaps, int(vram)
+
+
+def _builds_path(tokens, i):
+    """Whether the operand at tokens[i] is joined onto or listed as a directory."""
+    following = tokens[i + 1] if i + 1 < len(tokens) else None
+    if following is not None and following.kind == OP:
+        if following.value == '+':
+            return True
+        if following.value == '.' and i + 2 < len(tokens) and tokens[i + 2].value == "path_join":
+            return True
+    return (i >= 2 and tokens[i - 1].value == '(' and tokens[i - 2].kind == NAME
+            and tokens[i - 2].value in DIRECTORY_LISTING_CALLS)
+
+
+def path_prefix_literals(text):
+    """
+    Return the res:// directory literals a script builds paths from.
+
+    A directory counts when it is concatenated with `+`, extended with
+    path_join or listed through DirAccess, either directly or through the
+    const or var it is assigned to; begins_with checks and similar tests
+    do not reach any file.
+    """
+    tokens = list(tokenize(text))
+    found = set()
+    bound = {}
+    for i, token in enumerate(tokens):
+        if token.kind != STRING:
+            continue
+        value = string_value(token.value)
+        if not (value.startswith("res://") and value.endswith('/')):
+            continue
+        if _builds_path(tokens, i):
+            found.add(value)
+        elif i >= 2 and tokens[i - 1].value in ('=', ':='):
+            # name = "...", name := "..." or name: String = "..."
+            j = i - 2
+            if j >= 2 and tokens[j].kind == NAME and tokens[j - 1].value == ':':
+                j -= 2
+            if tokens[j].kind == NAME:
+                bound[tokens[j].value] = value
+    if bound:
+        for i, token in enumerate(tokens):
+            if token.kind == NAME and token.value in bound and _builds_path(tokens, i):
+                found.add(bound[token.value])
+    return found
+
+
+def collect_references(project_root, tree, asset_paths):
+    """Return {rel_path: sorted referrer rel paths} for asset_paths."""
+    builder = GraphBuilder(project_root)
+    graph = builder.build()
+    reverse = graph.reverse()
+
+    referrers = defaultdict(set)
+    for rel_path in asset_paths:
+        node = graph.ids.get("res://" + rel_path)
+        if node is None:
+            continue
+        for source in reverse[node]:
+            referrers[rel_path].add(graph.paths[source][len("res://"):])
+
+    # String literals: exact paths, uids, and directories that scripts build paths from
+    literal_sources = [(path, rel) for path, rel in tree.files if rel.endswith(".gd")]
+    literal_sources.append((Path(project_root) / PROJECT_FILE, PROJECT_FILE))
+    asset_set = set(asset_paths)
+    for path, rel in literal_sources:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except OSError as e:
+            print(f"Error reading {path}: {e}")
+            continue
+        if "://" not in text:
+            continue
+        for literal in REFERENCE_LITERAL_PATTERN.findall(text):
+            if literal.startswith("uid://"):
+                literal = builder.uid_to_path.get(literal, literal)
+            target = literal[len("res://"):]
+            if target in asset_set:
+                referrers[target].add(rel)
+        # project.godot's directory literals are editor settings such as
+        # folder_colors, so only scripts that build paths count here; a path
+        # built on the bare "res://" says nothing about which asset it reaches
+        if rel.endswith(".gd") and DIRECTORY_LITERAL_PATTERN.search(text):
+            for literal in path_prefix_literals(text):
+                target = literal[len("res://"):]
+                if not target:
+                    continue
+                for asset in asset_paths:
+                    if asset.startswith(target):
+                        referrers[asset].add(rel)
+    return {rel_path: sorted(sources) for rel_path, sources in referrers.items()}
+
+
+def analyze_assets(project_root, tree, index, roots, args):
+    """Return (assets, findings): one record per asset and (rule, rel_path, message, extra) tuples."""
+    asset_files = [(path, rel) for path, rel in tree.files
+                   if category_of(rel) and any(rel.startswith(root) for root in roots)]
+    references = collect_references(project_root, tree, [rel for _path, rel in asset_files])
+
+    assets = []
+    findings = []
+    for path, rel_path in asset_files:
+        meta = index.get_facts(path)
+        if meta is None:
+            continue
+        settings = read_import_settings(str(path) + ".import")
+        if settings and settings['importer'] in ("skip", "keep"):
+            continue
+        size = path.stat().st_size
+        record = {
+            'path': rel_path,
+            'category': category_of(rel_path),
+            'meta': meta,
+            'export_bytes': load_bytes(Path(project_root), "res://" + rel_path, size),
+            'referrers': references.get(rel_path, []),
+            'vram': 0,
+            'memory': 0,
+        }
+        assets.append(record)
+
+        if record['category'] == "textures" and 'width' in meta:
+            width, height, mode, mipmaps, vram = texture_budget(meta, settings)
+            record.update(width=width, height=height, mode=mode, mipmaps=mipmaps, vram=vram)
+            if max(width, height) > args.max_texture_size:
+                findings.append(("asset-texture-oversized", rel_path,
+                                 f"{width}x{height} exceeds {args.max_texture_size}px; set "
+                                 f"process/size_limit or downscale the source",
+                                 {'width': width, 'height': height}))
+            if mode not in VRAM_COMPRESSED_MODES and vram > args.max_uncompressed_kb * 1024:
+                findings.append(("asset-texture-uncompressed", rel_path,
+                                 f"{mode} {width}x{height} uses ~{format_bytes(vram)} of VRAM; "
+                                 f"use VRAM Compressed", {'mode': mode, 'vram_bytes': vram}))
+        elif record['category'] == "audio" and 'duration' in meta:
+            if meta['codec'] == "wav":
+                params = settings['params'] if settings else {}
+                bits = {0: meta.get('bits', 16), 1: 4, 2: 3.2}.get(int(params.get('compress/mode', 0)), 16)
+                record['memory'] = int(meta['duration'] * meta['sample_rate'] * meta['channels'] * bits / 8)
+                if meta['duration'] > args.max_wav_seconds:
+                    findings.append(("asset-audio-not-streamed", rel_path,
+                                     f"{meta['duration']:.1f}s WAV is decoded into memory "
+                                     f"(~{format_bytes(record['memory'])}); use Ogg Vorbis or MP3 to stream it",
+                                     {'duration': round(meta['duration'], 2), 'memory_bytes': record['memory']}))
+            else:
+                record['memory'] = size
+
+        if not record['referrers']:
+            findings.append(("asset-unreferenced", rel_path,
+                             f"no scene, resource, script or project setting refers to it "
+                             f"({format_bytes(record['export_bytes'])} exported)",
+                             {'export_bytes': record['export_bytes']}))
+    return assets, findings
+
+
+def describe(record):
+    meta = record['meta']
+    if record['category'] == "textures" and 'width' in record:
+        mips = " +mips" if record['mipmaps'] else ""
+        return f"{record['width']}x{record['height']} {record['mode']}{mips}, VRAM ~{format_bytes(record['vram'])}"
+    if record['category'] == "audio" and 'duration' in meta:
+        channels = "stereo" if meta['channels'] == 2 else f"{meta['channels']}ch"
+        return f"{meta['codec']} {meta['duration']:.1f}s {meta['sample_rate']} Hz {channels}"
+    if record['category'] == "models" and 'vertices' in meta:
+        return (f"{meta['meshes']} meshes, {meta['vertices']} verts, {meta['triangles']} tris, "
+                f"{meta['images']} images, {meta['animations']} anims")
+    if record['category'] == "fonts" and 'glyphs' in meta:
+        return f"{meta['glyphs']} glyphs"
+    return "unrecognised header"
+
+
+def print_report(assets, findings_by_path, top):
+    for category in CATEGORIES:
+        records = [r for r in assets if r['category'] == category]
+        if not records:
+            continue
+        key = 'vram' if category == "textures" else 'export_bytes'
+        records.sort(key=lambda r: (-r[key], r['path']))
+        print(f"=== {category.capitalize()} ({len(records)}) ===")
+        for record in records[:top or None]:
+            marker = "⚠️ " if record['path'] in findings_by_path else "  "
+            print(f"{marker}{format_bytes(record['export_bytes']):>10}  {record['path']}")
+            print(f"              {describe(record)}; {len(record['referrers'])} referrers")
+            for rule, message in findings_by_path.get(record['path'], []):
+                print(f"              {rule}: {message}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit asset metadata and import settings against budgets')
+    parser.add_argument('--roots', nargs='+', default=ASSET_ROOTS,
+                        help='Project-relative asset directories (default: assets/)')
+    parser.add_argument('--top', type=int, default=20, help='Assets to list per category, 0 = all (default: 20)')
+    parser.add_argument('--max-texture-size', type=int, default=2048,
+                        help='Largest imported texture side in pixels (default: 2048)')
+    parser.add_argument('--max-uncompressed-kb', type=int, default=1024,
+                        help='VRAM a texture may use without VRAM compression, in KB (default: 1024)')
+    parser.add_argument('--max-wav-seconds', type=float, default=5.0,
+                        help='Longest WAV that may be decoded into memory (default: 5)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-read every asset')
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    roots = [root.rstrip('/') + '/' for root in args.roots]
+    writer = open_writer(args.format, "asset_budget", RULES)
+    profiler = start_profiler("asset_budget", project_root, args)
+
+    print("=== Asset Budget Report ===")
+    print(f"Roots: {', '.join(roots)}")
+    print()
+
+    with profiler.phase("index_load"):
+        index = AssetIndex(project_root) if args.no_cache else AssetIndex.load(project_root)
+    with profiler.phase("walk"):
+        tree = walk_tree(project_root, EXCLUDED_DIRS, config['exclude'])
+    with profiler.phase("analyze"):
+        assets, findings = analyze_assets(project_root, tree, index, roots, args)
+    with profiler.phase("index_save"):
+        index.prune()
+        index.save()
+
+    if writer is not None:
+        for rule, rel_path, message, extra in findings:
+            level = 'note' if rule == "asset-unreferenced" else 'warning'
+            writer.emit(rule, rel_path, 1, message, level=level, **extra)
+        profiler.finish(index)
+        sys.exit(writer.close({'assets': len(assets),
+                               'vram_bytes': sum(r['vram'] for r in assets),
+                               'export_bytes': sum(r['export_bytes'] for r in assets)}))
+
+    findings_by_path = defaultdict(list)
+    for rule, rel_path, message, _extra in findings:
+        findings_by_path[rel_path].append((rule, message))
+    with profiler.phase("report"):
+        print_report(assets, findings_by_path, args.top)
+
+    counts = defaultdict(int)
+    for rule, _rel, _message, _extra in findings:
+        counts[rule] += 1
+    print("=== Summary ===")
+    print(f"Assets: {len(assets)}")
+    print(f"Export size: {format_bytes(sum(r['export_bytes'] for r in assets))}")
+    print(f"Texture VRAM (estimate): {format_bytes(sum(r['vram'] for r in assets))}")
+    print(f"Audio memory: {format_bytes(sum(r['memory'] for r in assets))}")
+    for rule in RULES:
+        if counts[rule]:
+            print(f"{rule}: {counts[rule]}")
+    print(index.summary())
+    profiler.finish(index)
+
+    if findings:
+        sys.exit(EXIT_FINDINGS)
+    print("✅ All assets within budget")
+    sys.exit(EXIT_CLEAN)
+
+
+if __name__ == "__main__":
+    main()
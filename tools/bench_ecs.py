@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Benchmark driver and regression tracker for tests/perf/perf_ecs_baseline.gd.
+
+Runs the ECS baseline headless over a sweep of entity counts, with warmup
+runs (discarded) and repeated trials per point. The per-system averages
+the script prints are parsed, stored in .tools_cache/perf_ecs_history.json
+keyed by git revision, and compared against a baseline revision with a
+Welch t-test: a metric is flagged only when the 95% confidence interval of
+the slowdown excludes zero and the slowdown exceeds --min-effect.
+
+A working tree with uncommitted changes is keyed by revision plus a hash
+of the diff (<rev>-dirty-<hash>), so samples are only pooled across runs
+of the same code. Samples taken with different --frames/--warmup-frames
+are never pooled or compared: a recorded point with other settings is
+replaced, and a baseline with other settings is refused.
+
+Usage:
+    python3 tools/bench_ecs.py
+    python3 tools/bench_ecs.py --entities 100,1000,10000 --trials 7
+    python3 tools/bench_ecs.py --baseline main --fail-on-regression
+    python3 tools/bench_ecs.py --report            # history only, no runs
+    GODOT_BIN=/path/to/godot python3 tools/bench_ecs.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from run_gut_sharded import DEFAULT_GODOT_BIN, shard_env
+
+BENCH_SCRIPT = "res://tests/perf/perf_ecs_baseline.gd"
+RESULT_PREFIX = "PERF_ECS_RESULT "
+
+CACHE_DIR = ".tools_cache"
+HISTORY_FILENAME = "perf_ecs_history.json"
+HISTORY_VERSION = 1
+
+DEFAULT_ENTITIES = "100,1000,10000"
+FRAME_METRIC = "frame"
+
+# Two-sided 95% Student t critical values by degrees of freedom
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086,
+    25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def t_critical(df):
+    """Return the 95% two-sided t value, using the next lower tabulated df."""
+    if df < 1:
+        return float('inf')
+    best = 1
+    for key in T_CRITICAL_95:
+        if key <= df:
+            best = max(best, key)
+    return T_CRITICAL_95[best] if df < 1000 else 1.960
+
+
+def mean_ci(samples):
+    """Return (mean, 95% CI half-width) of a sample list."""
+    n = len(samples)
+    mean = sum(samples) / n
+    if n < 2:
+        return mean, float('inf')
+    variance = sum((x - mean) ** 2 for x in samples) / (n - 1)
+    return mean, t_critical(n - 1) * math.sqrt(variance / n)
+
+
+def welch_difference(baseline, current):
+    """Return (difference of means, 95% CI half-width) using Welch's t-test."""
+    n1, n2 = len(baseline), len(current)
+    m1, m2 = sum(baseline) / n1, sum(current) / n2
+    if n1 < 2 or n2 < 2:
+        return m2 - m1, float('inf')
+    v1 = sum((x - m1) ** 2 for x in baseline) / (n1 - 1) / n1
+    v2 = sum((x - m2) ** 2 for x in current) / (n2 - 1) / n2
+    se = math.sqrt(v1 + v2)
+    if se == 0:
+        return m2 - m1, 0.0
+    df = (v1 + v2) ** 2 / ((v1 ** 2) / (n1 - 1) + (v2 ** 2) / (n2 - 1)) if v1 or v2 else n1 + n2 - 2
+    return m2 - m1, t_critical(int(df)) * se
+
+
+def revision_key(project_root):
+    """
+    Return the history key for the working tree, or None outside git.
+
+    A clean tree is keyed by its short revision; uncommitted changes to
+    tracked files and untracked (not ignored) files add a hash of the diff
+    and of the new files' paths and contents, so two different edits of
+    the same revision never share samples.
+    """
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                             text=True, cwd=project_root, check=True).stdout.strip()
+        diff = subprocess.run(['git', 'diff', 'HEAD', '--binary'], capture_output=True,
+                              cwd=project_root, check=True).stdout
+        untracked = subprocess.run(['git', 'ls-files', '-z', '--others', '--exclude-standard'],
+                                   capture_output=True, cwd=project_root, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if not diff and not untracked:
+        return rev
+
+    digest = hashlib.blake2b(diff, digest_size=4)
+    for rel_path in sorted(untracked.split(b'\0')):
+        if not rel_path:
+            continue
+        digest.update(b'\0' + rel_path + b'\0')
+        try:
+            with open(Path(project_root) / os.fsdecode(rel_path), 'rb') as f:
+                digest.update(hashlib.blake2b(f.read()).digest())
+        except OSError:
+            # Removed while listing; the path alone still marks it
+            pass
+    return f"{rev}-dirty-{digest.hexdigest()}"
+
+
+def resolve_revision(project_root, rev):
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', rev], capture_output=True,
+                              text=True, cwd=project_root, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return rev
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == HISTORY_VERSION:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {'version': HISTORY_VERSION, 'revisions': {}}
+
+
+def save_history(path, history):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing {path}: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def parse_result(output):
+    """Return the result dict from the benchmark's RESULT_PREFIX line, or None."""
+    for line in output.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            try:
+                return json.loads(line[len(RESULT_PREFIX):])
+            except ValueError:
+                return None
+    return None
+
+
+def run_trial(godot_bin, project_root, home, entities, frames, warmup_frames, timeout):
+    """Run the benchmark once; return its parsed result or raise RuntimeError."""
+    command = [
+        godot_bin, "--headless", "--path", str(project_root), "-s", BENCH_SCRIPT,
+        "++", f"--entities={entities}", f"--frames={frames}", f"--warmup-frames={warmup_frames}",
+    ]
+    try:
+        completed = subprocess.run(command, cwd=project_root, env=shard_env(home),
+                                   capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"timed out after {timeout:.0f}s")
+    result = parse_result(completed.stdout)
+    if result is None:
+        tail = (completed.stdout + completed.stderr).strip().splitlines()[-5:]
+        raise RuntimeError(f"no result (exit {completed.returncode}): " + " | ".join(tail))
+    return result
+
+
+def record_samples(point, result):
+    """Append one trial's metrics to a history point {metric: [ms, ...]}."""
+    point.setdefault(FRAME_METRIC, []).append(result['frame_ms'])
+    for system, value in result.get('systems', {}).items():
+        point.setdefault(system, []).append(value)
+
+
+def run_settings(entry):
+    """Return the (frames, warmup_frames) a history entry was recorded with."""
+    return entry.get('frames'), entry.get('warmup_frames')
+
+
+def pick_baseline(history, current_key, requested, settings):
+    """
+    Return the history key to compare against, or None.
+
+    An explicit revision matches its clean entry first, then its most
+    recent dirty one. Otherwise the latest other clean revision recorded
+    with the same settings is used.
+    """
+    revisions = history['revisions']
+    if requested:
+        if requested in revisions:
+            return requested
+        dirty = [(entry.get('updated', ''), key) for key, entry in revisions.items()
+                 if key.startswith(requested + "-dirty")]
+        return max(dirty)[1] if dirty else None
+    others = [(entry.get('updated', ''), key) for key, entry in revisions.items()
+              if key != current_key and "-dirty" not in key and run_settings(entry) == settings]
+    return max(others)[1] if others else None
+
+
+def compare(baseline_points, current_points, min_effect):
+    """Return rows (entities, metric, base, current, diff, ci, flag) for shared metrics."""
+    rows = []
+    for entities in sorted(current_points, key=int):
+        if entities not in baseline_points:
+            continue
+        base_metrics = baseline_points[entities]
+        for metric in sorted(current_points[entities], key=lambda m: (m != FRAME_METRIC, m)):
+            if metric not in base_metrics:
+                continue
+            base = base_metrics[metric]
+            current = current_points[entities][metric]
+            diff, ci = welch_difference(base, current)
+            base_mean = sum(base) / len(base)
+            relative = diff / base_mean if base_mean else 0.0
+            if diff - ci > 0 and relative > min_effect:
+                flag = "regression"
+            elif diff + ci < 0 and -relative > min_effect:
+                flag = "improvement"
+            else:
+                flag = ""
+            rows.append((entities, metric, mean_ci(base), mean_ci(current), relative, ci, flag))
+    return rows
+
+
+def print_points(points):
+    for entities in sorted(points, key=int):
+        print(f"📊 {entities} entities")
+        for metric in sorted(points[entities], key=lambda m: (m != FRAME_METRIC, m)):
+            mean, ci = mean_ci(points[entities][metric])
+            label = "Frame total" if metric == FRAME_METRIC else metric
+            print(f"   {label:<28} {mean:9.4f} ms ± {ci:.4f}  (n={len(points[entities][metric])})")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ECS baseline and track regressions')
+    parser.add_argument('--entities', default=DEFAULT_ENTITIES,
+                        help=f'Comma-separated entity counts to sweep (default: {DEFAULT_ENTITIES})')
+    parser.add_argument('--frames', type=int, default=120,
+                        help='Measured frames per trial (default: 120)')
+    parser.add_argument('--warmup-frames', type=int, default=30,
+                        help='Unmeasured frames before measuring, per trial (default: 30)')
+    parser.add_argument('--warmup-runs', type=int, default=1,
+                        help='Discarded runs per sweep point (default: 1)')
+    parser.add_argument('--trials', type=int, default=5,
+                        help='Recorded runs per sweep point (default: 5)')
+    parser.add_argument('--baseline', metavar='REV',
+                        help='Revision to compare against (default: latest other recorded revision)')
+    parser.add_argument('--min-effect', type=float, default=0.05,
+                        help='Smallest relative slowdown to flag (default: 0.05)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 if any regression is flagged')
+    parser.add_argument('--no-record', action='store_true',
+                        help='Do not write results to the history file')
+    parser.add_argument('--report', action='store_true',
+                        help='Compare recorded history without running Godot')
+    parser.add_argument('--godot', default=os.environ.get('GODOT_BIN', DEFAULT_GODOT_BIN),
+                        help='Godot executable (default: $GODOT_BIN)')
+    parser.add_argument('--timeout', type=float, default=600,
+                        help='Seconds before a single trial is killed (default: 600)')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    history_path = project_root / CACHE_DIR / HISTORY_FILENAME
+    history = load_history(history_path)
+    current_key = revision_key(project_root)
+
+    print("=== ECS Benchmark ===")
+    print(f"Project root: {project_root}")
+    print(f"Revision: {current_key or 'unknown (not a git checkout)'}")
+    print()
+
+    if args.report:
+        if current_key not in history['revisions']:
+            print(f"❌ No recorded results for {current_key or 'this tree'}")
+            sys.exit(1)
+        current_points = history['revisions'][current_key]['points']
+        settings = run_settings(history['revisions'][current_key])
+    else:
+        if shutil.which(args.godot) is None and not Path(args.godot).exists():
+            print(f"❌ Godot executable not found: {args.godot} (set GODOT_BIN or --godot)")
+            sys.exit(1)
+        try:
+            sweep = [int(value) for value in args.entities.split(',') if value.strip()]
+        except ValueError:
+            parser.error(f"--entities must be integers: {args.entities}")
+
+        current_points = {}
+        home = project_root / CACHE_DIR / "bench_home"
+        home.mkdir(parents=True, exist_ok=True)
+        for entities in sweep:
+            point = current_points.setdefault(str(entities), {})
+            start = time.perf_counter()
+            for trial in range(args.warmup_runs + args.trials):
+                try:
+                    result = run_trial(args.godot, project_root, home, entities, args.frames,
+                                       args.warmup_frames, args.timeout)
+                except RuntimeError as e:
+                    print(f"❌ {entities} entities, run {trial + 1}: {e}")
+                    sys.exit(1)
+                if trial >= args.warmup_runs:
+                    record_samples(point, result)
+            print(f"⏱️  {entities} entities: {args.trials} trials in {time.perf_counter() - start:.1f}s")
+        print()
+
+        settings = (args.frames, args.warmup_frames)
+        if current_key is None and not args.no_record:
+            print("⚠️  Not recording: the revision is unknown, so the samples cannot be keyed")
+            print()
+        elif not args.no_record:
+            entry = history['revisions'].setdefault(current_key, {'points': {}})
+            if entry['points'] and run_settings(entry) != settings:
+                frames, warmup_frames = run_settings(entry)
+                print(f"⚠️  Replacing samples recorded for {current_key} with --frames {frames} "
+                      f"--warmup-frames {warmup_frames}; they are not comparable with this run")
+                print()
+                entry['points'] = {}
+            for entities, metrics in current_points.items():
+                stored = entry['points'].setdefault(entities, {})
+                for metric, samples in metrics.items():
+                    stored.setdefault(metric, []).extend(samples)
+            entry['updated'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            entry['frames'] = args.frames
+            entry['warmup_frames'] = args.warmup_frames
+            save_history(history_path, history)
+
+    print("=== Results (mean ± 95% CI per frame) ===")
+    print()
+    print_points(current_points)
+
+    requested = resolve_revision(project_root, args.baseline) if args.baseline else None
+    baseline_key = pick_baseline(history, current_key, requested, settings)
+    if baseline_key is None:
+        print("No baseline revision recorded yet; results stored for future comparisons")
+        return
+    baseline_settings = run_settings(history['revisions'][baseline_key])
+    if baseline_settings != settings:
+        print(f"❌ {baseline_key} was recorded with --frames {baseline_settings[0]} "
+              f"--warmup-frames {baseline_settings[1]}; this run uses --frames {settings[0]} "
+              f"--warmup-frames {settings[1]}")
+        print()
+        print("💡 Fix: Re-run with the baseline's settings, or record the baseline again with these")
+        sys.exit(1)
+
+    rows = compare(history['revisions'][baseline_key]['points'], current_points, args.min_effect)
+    regressions = [row for row in rows if row[6] == "regression"]
+
+    print(f"=== Comparison against {baseline_key} ===")
+    print()
+    for entities, metric, (base_mean, _), (cur_mean, _), relative, _ci, flag in rows:
+        icon = {"regression": "⚠️ ", "improvement": "🚀"}.get(flag, "  ")
+        label = "Frame total" if metric == FRAME_METRIC else metric
+        print(f"{icon} {entities:>6} {label:<28} {base_mean:9.4f} -> {cur_mean:9.4f} ms ({relative:+.1%})")
+    print()
+
+    if regressions:
+        print(f"Significant regressions: {len(regressions)}")
+        print()
+        print("💡 Fix: Profile the flagged systems; re-run with more --trials if the CI is wide")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("✅ No significant regressions")
+
+
+if __name__ == "__main__":
+    main()
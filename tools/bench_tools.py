@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmarks for the Python tools against synthetic projects.
+
+Generates (or reuses) synthetic projects with gen_synthetic_project.py and
+times the tool entry points on each: find_all_class_names (cold, with a
+cold index, with a warm index, and in parallel), scan_file_for_shadowed_consts
+per file, fix_file in dry-run mode, and the fast_lint_scan warnings pass.
+Every benchmark runs in a fresh interpreter so its peak RSS is its own.
+Throughput is reported in .gd files/s and MB/s of GDScript source.
+
+Usage:
+    python3 tools/bench_tools.py
+    python3 tools/bench_tools.py --sizes 10000,50000,200000
+    python3 tools/bench_tools.py --corpus /tmp/synth --only find_cold,lint
+    python3 tools/bench_tools.py --json bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+from gd_config import SCRIPT_DIRS
+from gd_scanner import default_jobs, iter_gd_files
+
+CORPUS_ROOT = ".tools_cache/synthetic"
+DEFAULT_SIZES = "10000,50000"
+
+# Benchmarks in run order; index_warm needs the index that index_cold writes
+BENCHMARKS = ["find_cold", "index_cold", "index_warm", "find_parallel",
+              "scan_shadowed", "fix_dry_run", "lint"]
+
+
+def peak_rss_bytes():
+    """Return this process's peak RSS (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_benchmark(name, corpus, jobs):
+    """Run one benchmark in this process; return (files processed, seconds)."""
+    from find_shadowed_consts import find_all_class_names, scan_file_for_shadowed_consts
+    from fix_shadowed_consts import fix_file
+    from gd_file_index import FileIndex
+    from gd_scanner import parallel_map, scan_project
+
+    gd_files = [path for path, _rel in iter_gd_files(corpus, SCRIPT_DIRS)]
+
+    if name == "find_cold":
+        start = time.perf_counter()
+        find_all_class_names(corpus)
+        return len(gd_files), time.perf_counter() - start
+
+    if name in ("index_cold", "index_warm"):
+        index_path = corpus / ".tools_cache" / "gd_file_index.json"
+        if name == "index_cold" and index_path.exists():
+            index_path.unlink()
+        start = time.perf_counter()
+        index = FileIndex.load(corpus)
+        find_all_class_names(corpus, index)
+        index.save()
+        return len(gd_files), time.perf_counter() - start
+
+    if name == "find_parallel":
+        start = time.perf_counter()
+        scan_project(corpus, SCRIPT_DIRS, jobs=jobs)
+        return len(gd_files), time.perf_counter() - start
+
+    # Per-file tools need the global class set; building it is not timed
+    global_classes = find_all_class_names(corpus)
+
+    if name == "scan_shadowed":
+        start = time.perf_counter()
+        for gd_file in gd_files:
+            scan_file_for_shadowed_consts(gd_file, global_classes)
+        return len(gd_files), time.perf_counter() - start
+
+    if name == "fix_dry_run":
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for gd_file in gd_files:
+                fix_file(gd_file, global_classes, dry_run=True)
+        return len(gd_files), time.perf_counter() - start
+
+    if name == "lint":
+        from fast_lint_scan import lint_file, resolve_cross_file
+
+        start = time.perf_counter()
+        results = [r for r in parallel_map(partial(lint_file, project_root=corpus), gd_files, jobs)
+                   if r is not None]
+        resolve_cross_file(results, global_classes)
+        return len(gd_files), time.perf_counter() - start
+
+    raise ValueError(f"Unknown benchmark: {name}")
+
+
+def worker(name, corpus, jobs):
+    """Child-process entry point: run one benchmark and print its result as JSON."""
+    files, seconds = run_benchmark(name, Path(corpus), jobs)
+    print(json.dumps({'files': files, 'seconds': seconds, 'peak_rss': peak_rss_bytes()}))
+
+
+def corpus_bytes(corpus):
+    return sum(path.stat().st_size for path, _rel in iter_gd_files(corpus, SCRIPT_DIRS))
+
+
+def ensure_corpus(project_root, size, seed):
+    """Return the path of a generated corpus of the given size, generating it if needed."""
+    from gen_synthetic_project import generate
+
+    corpus = project_root / CORPUS_ROOT / f"{size}_s{seed}"
+    if not (corpus / "project.godot").exists():
+        print(f"🏗️  Generating {size}-file corpus at {corpus}...")
+        start = time.perf_counter()
+        generate(corpus, size, seed=seed)
+        print(f"   done in {time.perf_counter() - start:.1f}s")
+    return corpus
+
+
+def spawn(name, corpus, jobs, timeout):
+    """Run one benchmark in a fresh interpreter; return its result dict or an error."""
+    command = [sys.executable, str(Path(__file__).resolve()), '--worker', name,
+               '--corpus', str(corpus), '--jobs', str(jobs)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {timeout:.0f}s"}
+    if completed.returncode != 0:
+        tail = completed.stderr.strip().splitlines()[-1:] or [f"exit {completed.returncode}"]
+        return {'error': tail[0]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def format_mb(count):
+    return f"{count / (1024 * 1024):.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Python tools on synthetic projects')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'Comma-separated corpus sizes in .gd files (default: {DEFAULT_SIZES})')
+    parser.add_argument('--corpus', help='Benchmark an existing project instead of generated ones')
+    parser.add_argument('--only', help=f'Comma-separated subset of: {",".join(BENCHMARKS)}')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Workers for the parallel benchmarks (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=3600,
+                        help='Seconds before a single benchmark is killed (default: 3600)')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.corpus, args.jobs)
+        return
+
+    project_root = Path(__file__).parent.parent
+    selected = BENCHMARKS
+    if args.only:
+        selected = [name for name in BENCHMARKS if name in args.only.split(',')]
+        unknown = set(args.only.split(',')) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    if args.corpus:
+        corpora = [Path(args.corpus).resolve()]
+    else:
+        corpora = [ensure_corpus(project_root, int(size), args.seed)
+                   for size in args.sizes.split(',') if size.strip()]
+
+    print("=== Tool Benchmarks ===")
+    print(f"Jobs for parallel benchmarks: {args.jobs}")
+    print()
+
+    results = []
+    for corpus in corpora:
+        source_bytes = corpus_bytes(corpus)
+        print(f"📁 {corpus} ({format_mb(source_bytes)} of GDScript)")
+        print(f"   {'benchmark':<15} {'time':>9} {'files/s':>10} {'MB/s':>8} {'peak RSS':>10}")
+        if "index_warm" in selected and "index_cold" not in selected:
+            spawn("index_cold", corpus, args.jobs, args.timeout)
+        for name in selected:
+            result = spawn(name, corpus, args.jobs, args.timeout)
+            result.update({'corpus': str(corpus), 'benchmark': name, 'bytes': source_bytes})
+            results.append(result)
+            if 'error' in result:
+                print(f"   {name:<15} ❌ {result['error']}")
+                continue
+            seconds = max(result['seconds'], 1e-9)
+            result['files_per_s'] = result['files'] / seconds
+            result['mb_per_s'] = source_bytes / (1024 * 1024) / seconds
+            print(f"   {name:<15} {seconds:8.2f}s {result['files_per_s']:10.0f} "
+                  f"{result['mb_per_s']:8.1f} {format_mb(result['peak_rss']):>10}")
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Content-addressed duplicate detection for .tres files and [sub_resource] blocks.
+
+Every .tres and .tscn is read once. Each resource in it (the [resource]
+of a .tres, every [sub_resource] block) is normalized and hashed:
+
+- uid, id, format and load_steps are dropped
+- properties are sorted by name and whitespace outside strings collapsed
+- ExtResource("id") becomes the referenced path, and SubResource("id")
+  the hash of the referenced block, so two copies that differ only in
+  their ids (or in the ids of their own sub_resources) hash the same
+
+Blocks with equal hashes form exact-duplicate groups; a .tres and an
+inline [sub_resource] can be duplicates of each other. Near-duplicates
+(same type and property names, exactly one property value different)
+are found by hashing each resource once per property with that property
+left out, so grouping stays linear in the number of resources instead of
+comparing every pair. Blocks with resource_local_to_scene = true are
+per-instance on purpose and are skipped.
+
+Godot builds one object per copy. The savings reported for a group of n
+copies are the n - 1 extra objects and the source bytes they are parsed
+from; the load time estimate divides those bytes by --parse-mb-per-s.
+
+--diff prints, and --fix applies, a codemod (through gd_codemod) for the
+two cases that are safe to rewrite mechanically:
+- ext_resource lines pointing at a duplicate .tres are pointed at the
+  canonical copy (the most referenced, then the shortest path); the
+  duplicate files themselves are left for review
+- duplicate [sub_resource] blocks within one file are deleted and their
+  SubResource("id") uses pointed at the first copy
+Duplicates across scenes are reported but need extracting to a .tres.
+
+Per-file hashes are cached in .tools_cache/dedup_index.json, validated by
+content hash, so a warm run only reads files that changed.
+
+Usage:
+    python3 tools/dedup_resources.py                      # Report exact and near-duplicates
+    python3 tools/dedup_resources.py --no-near            # Exact duplicates only
+    python3 tools/dedup_resources.py --diff > dedup.patch # Codemod as a patch
+    python3 tools/dedup_resources.py --fix                # Apply the codemod
+    python3 tools/dedup_resources.py --format ndjson
+"""
+
+import argparse
+import posixpath
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from gd_codemod import run_codemod
+from gd_config import load_config
+from gd_file_index import FileIndex, hash_bytes
+from gd_output import EXIT_CLEAN, EXIT_ERROR, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_profile import add_profile_arguments, start_profiler
+from gd_scanner import default_jobs, index_files, walk_tree
+from preload_cost_report import format_bytes
+from res_dep_graph import ATTR_PATTERN, EXCLUDED_DIRS, EXT_RESOURCE_PATTERN, resolve_reference, to_res_path
+
+RESOURCE_SUFFIXES = (".tres", ".tscn")
+
+SECTION_PATTERN = re.compile(
+    r'^\[(gd_scene|gd_resource|ext_resource|sub_resource|node|connection|editable|resource)\b')
+PROPERTY_PATTERN = re.compile(r'^([A-Za-z_][\w/:.]*)\s*=\s*(.*)$')
+REFERENCE_PATTERN = re.compile(r'\b(ExtResource|SubResource)\(\s*"([^"]*)"\s*\)')
+STRING_PATTERN = re.compile(r'("(?:[^"\\]|\\.)*")')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+HEADER_ATTR_PATTERN = re.compile(r'\b(uid|path)="[^"]*"')
+
+RULES = {
+    "duplicate-resource": "resource identical to another after normalization",
+    "near-duplicate-resource": "resource differing from another in one property",
+}
+
+
+def iter_blocks(lines):
+    """
+    Stream (tag, header, first_line, last_line, body) per section.
+
+    body is the section's property lines with continuation lines (values
+    spanning several lines) joined onto their property.
+    """
+    tag = None
+    for number, line in enumerate(lines, 1):
+        if line.startswith('['):
+            match = SECTION_PATTERN.match(line)
+            if match:
+                if tag is not None:
+                    yield tag, header, first, last, body
+                tag, header, first, last, body = match.group(1), line, number, number, []
+                continue
+        if tag is None:
+            continue
+        if not line.strip():
+            continue
+        last = number
+        if PROPERTY_PATTERN.match(line) or not body:
+            body.append(line)
+        else:
+            body[-1] += "\n" + line
+    if tag is not None:
+        yield tag, header, first, last, body
+
+
+def normalize_value(value, ext_targets, sub_hashes):
+    """Collapse whitespace outside strings and replace resource ids by content."""
+    parts = STRING_PATTERN.split(value.strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = WHITESPACE_PATTERN.sub(' ', parts[i])
+    value = "".join(parts)
+
+    def replace(match):
+        if match.group(1) == "ExtResource":
+            return f"Ext({ext_targets.get(match.group(2), match.group(2))})"
+        return f"Sub({sub_hashes.get(match.group(2), match.group(2))})"
+
+    return REFERENCE_PATTERN.sub(replace, value)
+
+
+def hash_resource(kind, properties, skip=None):
+    """Return the content hash of a resource, optionally leaving property index skip out."""
+    parts = [kind]
+    for i, (key, value) in enumerate(properties):
+        parts.append(key if i == skip else f"{key}={value}")
+    return hash_bytes("\n".join(parts).encode('utf-8'))
+
+
+def parse_resource_facts(text, res_path):
+    """
+    Return {'uid', 'refs', 'items'} for one .tres/.tscn.
+
+    refs is the sorted list of res:// paths the file's ext_resources point at.
+
+    Each item is one resource: {'id' (None for a .tres [resource]),
+    'kind', 'hash', 'loo' (one hash per property, that property's value
+    left out, None for script), 'keys', 'bytes', 'line', 'end_line', 'local'}.
+    """
+    facts = {'uid': None, 'refs': [], 'items': []}
+    resource_type = ""
+    ext_targets = {}
+    sub_hashes = {}
+    lines = text.splitlines()
+    for tag, header, first, last, body in iter_blocks(lines):
+        attrs = dict(ATTR_PATTERN.findall(header))
+        if tag in ("gd_resource", "gd_scene"):
+            facts['uid'] = attrs.get('uid')
+            resource_type = attrs.get('type', "")
+            continue
+        if tag == "ext_resource":
+            match = EXT_RESOURCE_PATTERN.match(header)
+            ext_attrs = dict(ATTR_PATTERN.findall(match.group(1))) if match else attrs
+            ref = ext_attrs.get('path') or ext_attrs.get('uid')
+            if 'id' in ext_attrs and ref:
+                ext_targets[ext_attrs['id']] = resolve_reference(ref, res_path)
+            continue
+        if tag not in ("sub_resource", "resource"):
+            continue
+
+        properties = []
+        local = False
+        for line in body:
+            match = PROPERTY_PATTERN.match(line.split("\n", 1)[0])
+            if not match:
+                continue
+            key = match.group(1)
+            value = normalize_value(line[match.start(2):], ext_targets, sub_hashes)
+            if key == "resource_local_to_scene" and value == "true":
+                local = True
+            properties.append((key, value))
+        properties.sort()
+
+        # The header type only; a script_class is implied by the script property
+        item_type = resource_type if tag == "resource" else attrs.get('type', "")
+        item_kind = item_type
+        script = dict(properties).get('script', "")
+        if script.startswith("Ext(") and script.endswith(")"):
+            item_kind = f"{item_type} ({posixpath.basename(script[4:-1])})"
+        digest = hash_resource(item_type, properties)
+        if tag == "sub_resource" and 'id' in attrs:
+            sub_hashes[attrs['id']] = digest
+        facts['items'].append({
+            'id': attrs.get('id') if tag == "sub_resource" else None,
+            'kind': item_kind,
+            'hash': digest,
+            # A different script is a different class, never a near-duplicate
+            'loo': [hash_resource(item_type, properties, skip=i) if key != 'script' else None
+                    for i, (key, _value) in enumerate(properties)],
+            'keys': [key for key, _value in properties],
+            'bytes': sum(len(lines[n - 1]) + 1 for n in range(first, last + 1)),
+            'line': first,
+            'end_line': last,
+            'local': local,
+        })
+    facts['refs'] = sorted(set(ext_targets.values()))
+    return facts
+
+
+class DedupIndex(FileIndex):
+    """FileIndex variant whose entries hold each resource file's block hashes."""
+
+    version = 1
+    filename = "dedup_index.json"
+
+    extract_phase = "hash"
+
+    def extract(self, key, data):
+        return parse_resource_facts(data.decode('utf-8'), to_res_path(key))
+
+
+def item_label(rel_path, item):
+    return rel_path if item['id'] is None else f"{rel_path}::{item['id']}"
+
+
+def group_exact(files):
+    """
+    Return [[(rel_path, item)]] groups of two or more identical resources.
+
+    The first member is the canonical copy: a .tres before inline blocks,
+    then the file most referenced, then the shortest path.
+    """
+    referrers = defaultdict(int)
+    for _rel_path, facts in files:
+        for target in facts['refs']:
+            referrers[target] += 1
+    by_hash = defaultdict(list)
+    for rel_path, facts in files:
+        for item in facts['items']:
+            if not item['local']:
+                by_hash[item['hash']].append((rel_path, item))
+    groups = [members for members in by_hash.values() if len(members) > 1]
+    for members in groups:
+        members.sort(key=lambda m: (m[1]['id'] is not None, -referrers["res://" + m[0]],
+                                    len(m[0]), m[0], m[1]['line']))
+    groups.sort(key=lambda g: (-(len(g) - 1) * g[0][1]['bytes'], item_label(*g[0])))
+    return groups
+
+
+def group_near(files):
+    """Return [(key, [(rel_path, item)])]: distinct resources that differ only in property key."""
+    representatives = {}
+    for rel_path, facts in files:
+        for item in facts['items']:
+            if not item['local'] and item['keys']:
+                representatives.setdefault(item['hash'], (rel_path, item))
+
+    by_loo = defaultdict(list)
+    for rel_path, item in representatives.values():
+        for i, digest in enumerate(item['loo']):
+            if digest is not None:
+                by_loo[digest].append((item['keys'][i], rel_path, item))
+    clusters = []
+    for entries in by_loo.values():
+        if len(entries) > 1:
+            members = sorted(((rel, item) for _key, rel, item in entries),
+                             key=lambda m: (m[0], m[1]['line']))
+            clusters.append((entries[0][0], members))
+    clusters.sort(key=lambda c: (-len(c[1]), item_label(*c[1][0])))
+    return clusters
+
+
+def plan_codemod(groups):
+    """Return the codemod context: {'redirects': {dup res path: canonical}, 'merges': {rel_path: {...}}}."""
+    redirects = {}
+    merges = defaultdict(dict)
+    for members in groups:
+        files = [(rel, item) for rel, item in members if item['id'] is None]
+        if len(files) > 1:
+            canonical = files[0][0]
+            for rel_path, _item in files[1:]:
+                redirects["res://" + rel_path] = "res://" + canonical
+        by_file = defaultdict(list)
+        for rel_path, item in members:
+            if item['id'] is not None:
+                by_file[rel_path].append(item)
+        for rel_path, items in by_file.items():
+            items.sort(key=lambda item: item['line'])
+            for item in items[1:]:
+                merges[rel_path][item['id']] = (items[0]['id'], item['line'], item['end_line'])
+    return {'redirects': redirects, 'merges': dict(merges)}
+
+
+def retarget_ext_resources(source, context):
+    """Codemod rule: point ext_resource lines at the canonical copy of a duplicate .tres."""
+    redirects = context['redirects']
+    if not redirects:
+        return []
+    res_path = to_res_path(source.rel_path)
+    edits = []
+    line_number = 0
+    for line in source.text.splitlines():
+        line_number += 1
+        match = EXT_RESOURCE_PATTERN.match(line)
+        if not match:
+            continue
+        attrs = dict(ATTR_PATTERN.findall(match.group(1)))
+        target = resolve_reference(attrs['path'], res_path) if 'path' in attrs else None
+        if target is None and 'uid' in attrs:
+            target = context['uid_paths'].get(attrs['uid'])
+        canonical = redirects.get(target)
+        if canonical is None:
+            continue
+        canonical_uid = context['canonical_uids'].get(canonical)
+
+        def replace(attr):
+            if attr.group(1) == 'path':
+                return f'path="{canonical}"'
+            return f'uid="{canonical_uid}"' if canonical_uid else attr.group(0)
+
+        new_line = HEADER_ATTR_PATTERN.sub(replace, line)
+        start = source.line_offset(line_number)
+        edits.append(source.edit(start, start + len(line), new_line, "duplicate-resource"))
+    return edits
+
+
+def merge_duplicate_subresources(source, context):
+    """Codemod rule: delete repeated [sub_resource] blocks of one file and reuse the first copy."""
+    merges = context['merges'].get(source.rel_path)
+    if not merges:
+        return []
+    edits = []
+    deleted = []
+    for _dup_id, (_canonical_id, first, last) in merges.items():
+        end = last
+        # Take the blank separator line with the block
+        while source.line_text(end + 1) == "" and source.line_offset(end + 1) < len(source.text):
+            end += 1
+        edits.append(source.delete_lines(first, end, "duplicate-resource"))
+        deleted.append((source.line_offset(first), source.line_offset(end + 1)))
+
+    for match in REFERENCE_PATTERN.finditer(source.text):
+        if match.group(1) != "SubResource" or match.group(2) not in merges:
+            continue
+        if any(start <= match.start() < end for start, end in deleted):
+            continue
+        canonical_id = merges[match.group(2)][0]
+        edits.append(source.edit(match.start(), match.end(), f'SubResource("{canonical_id}")',
+                                 "duplicate-resource"))
+    return edits
+
+
+CODEMOD_RULES = {
+    "merge-duplicate-subresource": merge_duplicate_subresources,
+    "retarget-duplicate-resource": retarget_ext_resources,
+}
+
+
+def print_report(groups, clusters, top):
+    print("=== Exact Duplicates ===")
+    print()
+    if not groups:
+        print("✅ No exact duplicates")
+    for members in groups[:top or None]:
+        canonical = members[0]
+        extra_bytes = (len(members) - 1) * canonical[1]['bytes']
+        print(f"🔁 {len(members)} copies of {canonical[1]['kind']} "
+              f"({format_bytes(canonical[1]['bytes'])} each, {format_bytes(extra_bytes)} duplicated)")
+        for rel_path, item in members:
+            print(f"   {item_label(rel_path, item)} (line {item['line']})")
+    print()
+
+    if clusters is None:
+        return
+    print("=== Near Duplicates (one property differs) ===")
+    print()
+    if not clusters:
+        print("✅ No near duplicates")
+    for key, members in clusters[:top or None]:
+        print(f"≈ {len(members)} × {members[0][1]['kind']} differing only in '{key}'")
+        for rel_path, item in members:
+            print(f"   {item_label(rel_path, item)} (line {item['line']})")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find duplicate .tres files and [sub_resource] blocks')
+    parser.add_argument('--no-near', action='store_true', help='Skip near-duplicate detection')
+    parser.add_argument('--top', type=int, default=20, help='Groups to list, 0 = all (default: 20)')
+    parser.add_argument('--parse-mb-per-s', type=float, default=20.0,
+                        help='Text resource parse throughput for the load time estimate (default: 20)')
+    codemod = parser.add_mutually_exclusive_group()
+    codemod.add_argument('--fix', action='store_true',
+                         help='Point references at canonical copies and merge in-file duplicates')
+    codemod.add_argument('--diff', action='store_true',
+                         help='Print the codemod as one unified diff to stdout instead')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for hashing and the codemod (default: CPU count, 1 = serial)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-read every file')
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+    if args.diff and args.format != 'text':
+        parser.error("--diff cannot be combined with --format")
+    if args.diff:
+        # The patch owns stdout; progress and the summary go to stderr
+        patch_stream = sys.stdout
+        sys.stdout = sys.stderr
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    writer = open_writer(args.format, "dedup_resources", RULES)
+    profiler = start_profiler("dedup_resources", project_root, args)
+
+    print("=== Duplicate Resource Report ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    with profiler.phase("index_load"):
+        index = DedupIndex(project_root) if args.no_cache else DedupIndex.load(project_root)
+    with profiler.phase("walk"):
+        tree = walk_tree(project_root, EXCLUDED_DIRS, config['exclude'])
+    with profiler.phase("hash"):
+        resource_files = [(path, rel_path) for path, rel_path in tree.files
+                          if rel_path.endswith(RESOURCE_SUFFIXES)]
+        all_facts = index_files([path for path, _rel in resource_files], index, args.jobs)
+        files = [(rel_path, facts) for (_path, rel_path), facts in zip(resource_files, all_facts)
+                 if facts is not None]
+    with profiler.phase("index_save"):
+        index.prune()
+        index.save()
+
+    with profiler.phase("group"):
+        groups = group_exact(files)
+        clusters = None if args.no_near else group_near(files)
+    resources = sum(len(facts['items']) for _rel, facts in files)
+    extra_objects = sum(len(members) - 1 for members in groups)
+    extra_bytes = sum((len(members) - 1) * members[0][1]['bytes'] for members in groups)
+
+    failed = False
+    if args.fix or args.diff:
+        context = plan_codemod(groups)
+        context['uid_paths'] = {facts['uid']: "res://" + rel for rel, facts in files if facts['uid']}
+        uid_by_path = {path: uid for uid, path in context['uid_paths'].items()}
+        context['canonical_uids'] = {canonical: uid_by_path.get(canonical)
+                                     for canonical in context['redirects'].values()}
+        targets = sorted({rel for rel, _facts in files} if context['redirects'] else context['merges'])
+        edited = 0
+        with profiler.phase("codemod"):
+            for result in run_codemod(project_root, targets, CODEMOD_RULES, context,
+                                      jobs=args.jobs, write=args.fix, diff=args.diff):
+                if result['error']:
+                    print(result['error'])
+                    failed = True
+                for conflict in result['conflicts']:
+                    print(f"Conflict in {result['path']}:{conflict['line']}: {conflict['rule']} overlaps "
+                          f"{conflict['with_rule']} at line {conflict['with_line']}, skipped")
+                if result['changed']:
+                    edited += 1
+                    print(f"{'✏️ ' if args.fix else '📄'} {result['path']}: {len(result['edits'])} edits")
+                if args.diff and result['diff']:
+                    patch_stream.write(result['diff'])
+        print(f"{'Edited' if args.fix else 'Would edit'} {edited} files")
+        print()
+
+    if writer is not None:
+        for members in groups:
+            canonical = item_label(*members[0])
+            for rel_path, item in members[1:]:
+                writer.emit("duplicate-resource", rel_path, item['line'],
+                            f"{item['kind']} identical to {canonical}", end_line=item['end_line'],
+                            canonical=canonical, copies=len(members), bytes=item['bytes'])
+        for key, members in clusters or []:
+            for rel_path, item in members:
+                others = [item_label(*m) for m in members if m[1] is not item]
+                writer.emit("near-duplicate-resource", rel_path, item['line'],
+                            f"{item['kind']} differs only in '{key}' from {', '.join(others)}",
+                            level='note', end_line=item['end_line'], property=key, others=others)
+        profiler.finish(index)
+        sys.exit(writer.close({'files': len(files), 'resources': resources,
+                               'extra_objects': extra_objects, 'extra_bytes': extra_bytes},
+                              failed=failed))
+
+    with profiler.phase("report"):
+        print_report(groups, clusters, args.top)
+
+    print("=== Summary ===")
+    print(f"Files hashed: {len(files)} ({resources} resources)")
+    print(f"Exact duplicate groups: {len(groups)}")
+    if clusters is not None:
+        print(f"Near-duplicate clusters: {len(clusters)}")
+    print(f"Sharing would save {extra_objects} objects and {format_bytes(extra_bytes)} of parsing "
+          f"(~{extra_bytes / (args.parse_mb_per_s * 1024 * 1024) * 1000:.1f} ms at {args.parse_mb_per_s:g} MB/s)")
+    print(index.summary())
+    profiler.finish(index)
+
+    if failed:
+        sys.exit(EXIT_ERROR)
+    if groups and not args.fix:
+        if not args.diff:
+            print()
+            print("💡 Run with --diff to preview, or --fix to apply, the sharing codemod")
+        sys.exit(EXIT_FINDINGS)
+    sys.exit(EXIT_CLEAN)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Headless Python counterpart of tools/full_lint_scan.gd.
+
+Checks the same rules without booting the Godot editor:
+SHADOWED_GLOBAL_IDENTIFIER, UNUSED_PARAMETER, UNUSED_VARIABLE and
+INT_AS_ENUM_WITHOUT_CAST. Sources go through a real GDScript tokenizer
+(gd_lexer) and a block-scope tracker instead of per-line regexes, and the
+report has the same shape as the EditorScript's.
+
+Warning names come from check_gdscript_warnings.GDSCRIPT_WARNINGS, and
+@warning_ignore / @warning_ignore_start / @warning_ignore_restore are
+honoured.
+
+Usage:
+    python3 tools/fast_lint_scan.py                   # Lint scripts/ and tests/
+    python3 tools/fast_lint_scan.py --jobs 8          # Lint on 8 worker processes (a serial run takes ~4 s)
+    python3 tools/fast_lint_scan.py --fail-on-warnings
+    python3 tools/fast_lint_scan.py --output report.txt
+    python3 tools/fast_lint_scan.py --profile         # Phase timings and slowest files
+"""
+
+import argparse
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+from check_gdscript_warnings import GDSCRIPT_WARNINGS
+from gd_config import load_config
+from gd_file_index import CACHE_DIR, FileIndex
+from gd_lexer import ANNOTATION, DEDENT, INDENT, NAME, NEWLINE, NUMBER, OP, STRING, string_value, tokenize
+from gd_profile import active, add_profile_arguments, start_profiler
+from gd_parser import matching_bracket, split_declaration, split_top_level, statement_end
+from gd_scanner import default_jobs, iter_gd_files, parallel_map, scan_project
+
+# Rules implemented here, in report order (plus the catch-all bucket)
+LINT_RULES = [
+    "shadowed_global_identifier",
+    "unused_parameter",
+    "unused_variable",
+    "int_as_enum_without_cast",
+]
+WARNING_TYPES = [rule.upper() for rule in LINT_RULES] + ["OTHER"]
+
+DEFAULT_OUTPUT = f"{CACHE_DIR}/comprehensive_lint_report.txt"
+
+# Frequently used engine classes; stands in for ClassDB.class_exists()
+NATIVE_CLASSES = {
+    "AnimationPlayer", "AnimationTree", "Area2D", "Area3D", "Array", "AudioServer",
+    "AudioStream", "AudioStreamPlayer", "AudioStreamPlayer2D", "AudioStreamPlayer3D",
+    "Basis", "Button", "Callable", "Camera2D", "Camera3D", "CanvasItem", "CanvasLayer",
+    "CharacterBody2D", "CharacterBody3D", "CheckBox", "CollisionShape2D",
+    "CollisionShape3D", "Color", "ColorRect", "Container", "Control", "Dictionary",
+    "DirAccess", "DisplayServer", "Engine", "Environment", "FileAccess", "Font",
+    "GDScript", "HBoxContainer", "HSlider", "Image", "Input", "InputEvent",
+    "InputEventJoypadButton", "InputEventJoypadMotion", "InputEventKey",
+    "InputEventMouseButton", "InputMap", "JSON", "Label", "Light3D", "LineEdit",
+    "MarginContainer", "Marker3D", "Material", "Mesh", "MeshInstance3D", "Node",
+    "Node2D", "Node3D", "NodePath", "Object", "OptionButton", "OS", "PackedScene",
+    "Panel", "PanelContainer", "Performance", "PhysicsServer3D", "ProgressBar",
+    "ProjectSettings", "Quaternion", "RayCast3D", "Rect2", "RefCounted", "Resource",
+    "ResourceLoader", "ResourceSaver", "RichTextLabel", "RigidBody3D", "SceneTree",
+    "Script", "ScrollContainer", "Shader", "ShaderMaterial", "Signal", "Slider",
+    "SpinBox", "Sprite2D", "Sprite3D", "StaticBody3D", "String", "StringName",
+    "Texture2D", "TextureRect", "Theme", "Time", "Timer", "Transform2D",
+    "Transform3D", "Tween", "VBoxContainer", "Vector2", "Vector2i", "Vector3",
+    "Vector3i", "Vector4", "Viewport", "WorldEnvironment",
+}
+
+# @GlobalScope utility functions and GDScript built-ins
+GLOBAL_FUNCTIONS = {
+    "abs", "absf", "absi", "acos", "asin", "assert", "atan", "atan2", "bytes_to_var",
+    "ceil", "ceilf", "ceili", "char", "clamp", "clampf", "clampi", "convert", "cos",
+    "deg_to_rad", "ease", "error_string", "exp", "floor", "floorf", "floori", "fmod",
+    "get_stack", "hash", "inst_to_dict", "instance_from_id", "inverse_lerp",
+    "is_equal_approx", "is_instance_valid", "is_nan", "is_zero_approx", "len", "lerp",
+    "lerp_angle", "lerpf", "load", "log", "max", "maxf", "maxi", "min", "minf", "mini",
+    "move_toward", "pow", "print", "print_debug", "print_rich", "printerr", "prints",
+    "push_error", "push_warning", "rad_to_deg", "randf", "randf_range", "randi",
+    "randi_range", "range", "remap", "round", "roundf", "roundi", "seed", "sign",
+    "signf", "signi", "sin", "smoothstep", "snapped", "sqrt", "str", "str_to_var",
+    "tan", "tanh", "type_exists", "type_string", "typeof", "var_to_bytes",
+    "var_to_str", "weakref", "wrap", "wrapf", "wrapi",
+}
+
+DECLARATION_LABELS = {
+    "var": "Variable",
+    "const": "Constant",
+    "param": "Parameter",
+    "for": "Loop variable",
+}
+
+
+def _ignore_names(tokens, i):
+    """Return (names, next_index) for the string arguments of an annotation at i."""
+    names = set()
+    j = i + 1
+    if j < len(tokens) and tokens[j].value == '(':
+        j += 1
+        while j < len(tokens) and tokens[j].value != ')':
+            if tokens[j].kind == STRING:
+                names.add(string_value(tokens[j].value))
+            j += 1
+        j += 1
+    return names, j
+
+
+def _is_int_literal(tokens, indices):
+    """Return True if the initializer is a bare (optionally negated) int literal."""
+    values = [tokens[j] for j in indices]
+    if values and values[0].kind == OP and values[0].value == '-':
+        values = values[1:]
+    if len(values) != 1 or values[0].kind != NUMBER:
+        return False
+    literal = values[0].value.lower()
+    return literal.startswith(('0x', '0b')) or not any(c in literal for c in '.e')
+
+
+class FileLinter:
+    """Tokenizes one file and collects warnings plus cross-file facts."""
+
+    def __init__(self, rel_path, source):
+        self.rel_path = rel_path
+        self.tokens = list(tokenize(source))
+        self.warnings = []           # (warning_type, line, message)
+        self.declarations = []       # (kind, name, line) checked against globals later
+        self.enum_candidates = []    # (line, name, type_text)
+        self.enums = set()
+        self.aliases = {}            # const name -> preload path
+        self.class_name = None
+        self._ignore_regions = []    # (rule, start_line, end_line)
+        self._open_regions = {}
+        self._pending_ignores = set()
+
+    def lint(self):
+        tokens = self.tokens
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token.kind == ANNOTATION:
+                i = self._annotation(i)
+                continue
+            if token.kind != NAME:
+                i += 1
+                continue
+
+            if token.value == 'func' and tokens[i + 1].kind == NAME:
+                i = self._function(i, self._pending_ignores)
+                self._pending_ignores = set()
+            elif token.value in ('var', 'const') and tokens[i + 1].kind == NAME:
+                i = self._member(i, self._pending_ignores)
+                self._pending_ignores = set()
+            elif token.value == 'enum' and tokens[i + 1].kind == NAME:
+                self.enums.add(tokens[i + 1].value)
+                i += 2
+            elif token.value == 'class_name' and tokens[i + 1].kind == NAME and self.class_name is None:
+                self.class_name = tokens[i + 1].value
+                i += 2
+            else:
+                i += 1
+
+        last_line = tokens[-1].line
+        for rule, start in self._open_regions.items():
+            self._ignore_regions.append((rule, start, last_line))
+        return self
+
+    def _annotation(self, i):
+        name = self.tokens[i].value
+        names, j = _ignore_names(self.tokens, i)
+        line = self.tokens[i].line
+        if name == '@warning_ignore':
+            self._pending_ignores |= names
+        elif name == '@warning_ignore_start':
+            for rule in names:
+                self._open_regions.setdefault(rule, line)
+        elif name == '@warning_ignore_restore':
+            for rule in names:
+                if rule in self._open_regions:
+                    self._ignore_regions.append((rule, self._open_regions.pop(rule), line))
+        return j
+
+    def _warn(self, rule, line, message, ignores):
+        # @warning_ignore_start regions are applied once the whole file is read
+        if rule not in ignores:
+            self.warnings.append((rule.upper(), line, message))
+
+    def _declare(self, kind, name, line, ignores):
+        if 'shadowed_global_identifier' not in ignores:
+            self.declarations.append((kind, name, line))
+
+    def _member(self, i, ignores):
+        tokens = self.tokens
+        kind = tokens[i].value
+        name_token = tokens[i + 1]
+        end = statement_end(tokens, i + 2)
+        # A trailing ':' opens a set/get block and is not part of the initializer
+        tail_end = end - 1 if tokens[end - 1].value == ':' else end
+        type_text, initializer = split_declaration(tokens, range(i + 2, tail_end))
+        self._declare(kind, name_token.value, name_token.line, ignores)
+
+        if kind == 'const' and len(initializer) >= 3 and tokens[initializer[0]].value == 'preload' \
+                and tokens[initializer[2]].kind == STRING:
+            self.aliases[name_token.value] = string_value(tokens[initializer[2]].value)
+        if type_text and _is_int_literal(tokens, initializer) \
+                and 'int_as_enum_without_cast' not in ignores:
+            self.enum_candidates.append((name_token.line, name_token.value, type_text))
+        return end
+
+    def _function(self, i, ignores):
+        """Lint one named function; return the index after its body."""
+        tokens = self.tokens
+        open_paren = i + 2
+        while tokens[open_paren].value != '(':
+            open_paren += 1
+        close_paren = matching_bracket(tokens, open_paren)
+
+        params = []
+        for part in split_top_level(tokens, open_paren + 1, close_paren):
+            names = [j for j in part if tokens[j].kind == NAME]
+            if not names:
+                continue
+            name_index = names[0]
+            type_text, initializer = split_declaration(
+                tokens, [j for j in part if j > name_index])
+            params.append((tokens[name_index], type_text, initializer))
+
+        # Header ends at the ':' after the optional '-> Type'
+        colon = close_paren + 1
+        while not (tokens[colon].kind == OP and tokens[colon].value == ':'):
+            colon += 1
+
+        body_start = colon + 1
+        if tokens[body_start].kind == NEWLINE and tokens[body_start + 1].kind == INDENT:
+            level = 0
+            body_end = body_start + 1
+            while body_end < len(tokens):
+                kind = tokens[body_end].kind
+                if kind == INDENT:
+                    level += 1
+                elif kind == DEDENT:
+                    level -= 1
+                    if level == 0:
+                        break
+                body_end += 1
+        else:
+            body_end = statement_end(tokens, body_start)
+
+        self._lint_body(params, body_start, body_end, ignores)
+        return body_end + 1
+
+    def _lint_body(self, params, start, end, ignores):
+        tokens = self.tokens
+
+        # Block level of every body token, for scoping local declarations
+        levels = []
+        level = 0
+        for j in range(start, end):
+            kind = tokens[j].kind
+            if kind == INDENT:
+                level += 1
+            elif kind == DEDENT:
+                level -= 1
+            levels.append(level)
+
+        references = {}
+        declarations = []
+        local_ignores = set()
+        j = start
+        while j < end:
+            token = tokens[j]
+            if token.kind == ANNOTATION:
+                names, after = _ignore_names(tokens, j)
+                if token.value == '@warning_ignore':
+                    local_ignores |= names
+                j = after
+                continue
+            if token.kind == NAME:
+                previous = tokens[j - 1]
+                if previous.kind == OP and previous.value == '.':
+                    j += 1
+                    continue
+                if token.value in ('var', 'const') and tokens[j + 1].kind == NAME:
+                    declarations.append((token.value, j + 1, ignores | local_ignores))
+                    local_ignores = set()
+                    j += 2
+                    continue
+                if token.value == 'for' and tokens[j + 1].kind == NAME:
+                    declarations.append(('for', j + 1, ignores))
+                    j += 2
+                    continue
+                references.setdefault(token.value, []).append(j)
+            j += 1
+
+        for param_token, type_text, initializer in params:
+            self._declare('param', param_token.value, param_token.line, ignores)
+            if type_text and _is_int_literal(tokens, initializer) \
+                    and 'int_as_enum_without_cast' not in ignores:
+                self.enum_candidates.append((param_token.line, param_token.value, type_text))
+            if param_token.value.startswith('_') or param_token.value in references:
+                continue
+            self._warn('unused_parameter', param_token.line,
+                       f"Parameter '{param_token.value}' is never used", ignores)
+
+        for kind, name_index, decl_ignores in declarations:
+            name_token = tokens[name_index]
+            self._declare(kind, name_token.value, name_token.line, decl_ignores)
+
+            if kind in ('var', 'const'):
+                tail_end = statement_end(tokens, name_index + 1)
+                type_text, initializer = split_declaration(tokens, range(name_index + 1, min(tail_end, end)))
+                if type_text and _is_int_literal(tokens, initializer) \
+                        and 'int_as_enum_without_cast' not in decl_ignores:
+                    self.enum_candidates.append((name_token.line, name_token.value, type_text))
+
+            if kind != 'var' or name_token.value.startswith('_'):
+                continue
+            decl_level = levels[name_index - start]
+            scope_end = end
+            for k in range(name_index + 1, end):
+                if levels[k - start] < decl_level:
+                    scope_end = k
+                    break
+            used = any(name_index < k < scope_end for k in references.get(name_token.value, ()))
+            if not used:
+                self._warn('unused_variable', name_token.line,
+                           f"Variable '{name_token.value}' appears unused", decl_ignores)
+
+    def result(self):
+        return {
+            'rel_path': self.rel_path,
+            'warnings': self.warnings,
+            'declarations': self.declarations,
+            'enum_candidates': self.enum_candidates,
+            'enums': sorted(self.enums),
+            'aliases': self.aliases,
+            'class_name': self.class_name,
+            'ignore_regions': self._ignore_regions,
+        }
+
+
+def lint_file(gd_file, project_root):
+    """Worker: lint one file and return its result dictionary (or None)."""
+    start = time.perf_counter()
+    rel_path = Path(gd_file).relative_to(project_root).as_posix()
+    try:
+        with open(gd_file, 'rb') as f:
+            data = f.read()
+        source = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {gd_file}: {e}")
+        return None
+    result = FileLinter(rel_path, source).lint().result()
+    result['bytes'] = len(data)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _suppressed(result, rule, line):
+    """Return True if line sits inside a @warning_ignore_start region for rule."""
+    return any(region_rule == rule and start <= line <= end
+               for region_rule, start, end in result['ignore_regions'])
+
+
+def resolve_cross_file(results, global_classes):
+    """Add the warnings that need project-wide facts (global names, enums)."""
+    enums_by_class = {}
+    enums_by_path = {}
+    for result in results:
+        enums = set(result['enums'])
+        enums_by_path["res://" + result['rel_path']] = enums
+        if result['class_name']:
+            enums_by_class[result['class_name']] = enums
+
+    for result in results:
+        for kind, name, line in result['declarations']:
+            what = None
+            if name in global_classes:
+                what = "global class"
+            elif name in NATIVE_CLASSES:
+                what = "native class"
+            elif name in GLOBAL_FUNCTIONS:
+                what = "built-in function"
+            if what:
+                label = DECLARATION_LABELS.get(kind, "Identifier")
+                result['warnings'].append((
+                    "SHADOWED_GLOBAL_IDENTIFIER", line, f"{label} '{name}' shadows {what}"))
+
+        local_enums = set(result['enums'])
+        for line, name, type_text in result['enum_candidates']:
+            owner, _, enum_name = type_text.rpartition('.')
+            if not owner:
+                is_enum = enum_name in local_enums
+            elif owner in result['aliases']:
+                is_enum = enum_name in enums_by_path.get(result['aliases'][owner], ())
+            else:
+                is_enum = enum_name in enums_by_class.get(owner, ())
+            if is_enum:
+                result['warnings'].append((
+                    "INT_AS_ENUM_WITHOUT_CAST", line,
+                    f"Integer assigned to '{name}' of enum type {type_text} without a cast"))
+
+        if result['ignore_regions']:
+            result['warnings'] = [w for w in result['warnings']
+                                  if not _suppressed(result, w[0].lower(), w[1])]
+
+
+def lint_files(project_root, gd_files, global_classes, jobs):
+    """Lint gd_files; return {warning_type: [(res_path, line, message)]} in report order."""
+    profiler = active()
+    with profiler.phase("lint"):
+        results = [r for r in parallel_map(partial(lint_file, project_root=project_root), gd_files, jobs)
+                   if r is not None]
+    for result in results:
+        profiler.file_read(result['bytes'])
+        profiler.file_done(result['rel_path'], result['seconds'])
+    with profiler.phase("resolve"):
+        resolve_cross_file(results, global_classes)
+
+    warnings = {warning_type: [] for warning_type in WARNING_TYPES}
+    for result in results:
+        for warning_type, line, message in sorted(result['warnings'], key=lambda w: (w[1], w[0])):
+            warnings[warning_type].append(("res://" + result['rel_path'], line, message))
+    return warnings
+
+
+def write_report(output_path, files_scanned, warnings):
+    """Write the report in the same shape as full_lint_scan.gd."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("=== COMPREHENSIVE LINT REPORT ===\n")
+        f.write(f"Generated: {time.strftime('%Y-%m-%dT%H:%M:%S')}\n")
+        f.write(f"Files scanned: {files_scanned}\n")
+        f.write("\n")
+
+        total = sum(len(warnings[warning_type]) for warning_type in WARNING_TYPES)
+        for warning_type in WARNING_TYPES:
+            f.write(f"{warning_type}: {len(warnings[warning_type])} warnings\n")
+        f.write(f"\nTotal: {total} warnings\n\n")
+
+        for warning_type in WARNING_TYPES:
+            if warnings[warning_type]:
+                f.write(f"\n=== {warning_type} ===\n")
+                for file_path, line, message in warnings[warning_type]:
+                    f.write(f"{file_path}:{line} - {message}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fast headless GDScript lint scan')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes (default: CPU count, 1 = serial)')
+    parser.add_argument('--output', default=None,
+                        help=f'Report file (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--fail-on-warnings', action='store_true',
+                        help='Exit with status 1 when any warning is reported')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    output_path = Path(args.output) if args.output else project_root / DEFAULT_OUTPUT
+    config = load_config(project_root)
+    start = time.perf_counter()
+
+    unknown = [rule for rule in LINT_RULES if rule not in GDSCRIPT_WARNINGS]
+    if unknown:
+        parser.error(f"Unknown GDScript warning(s) in LINT_RULES: {', '.join(unknown)}")
+
+    print("\n=== COMPREHENSIVE LINT SCAN ===")
+    print("Scanning GDScript files...")
+
+    profiler = start_profiler("fast_lint_scan", project_root, args)
+
+    # Global class set comes from the shared file index (stat-only when warm)
+    with profiler.phase("classes"):
+        index = FileIndex.load(project_root)
+        global_classes = scan_project(project_root, config['scan_roots'], index,
+                                      exclude=config['exclude']).class_names
+        index.save()
+
+    gd_files = [gd_file for gd_file, _rel in iter_gd_files(project_root, config['scan_roots'],
+                                                            config['exclude'])]
+    warnings = lint_files(project_root, gd_files, global_classes, args.jobs)
+
+    with profiler.phase("report"):
+        write_report(output_path, len(gd_files), warnings)
+
+    print("\n=== SUMMARY ===")
+    print(f"Files scanned: {len(gd_files)}")
+    total = 0
+    for warning_type in WARNING_TYPES:
+        count = len(warnings[warning_type])
+        total += count
+        print(f"{warning_type}: {count}")
+    print(f"\nTotal warnings: {total}")
+    print(f"\nFull report: {output_path.resolve()}")
+    print(f"Elapsed: {time.perf_counter() - start:.2f}s")
+    print("\n=== END ===")
+    profiler.finish(index)
+
+    return 1 if args.fail_on_warnings and total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
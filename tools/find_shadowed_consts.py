@@ -3,122 +3,79 @@
 Scans GDScript files for shadowed const preloads.
 
 Usage:
-    python3 tools/find_shadowed_consts.py
+    python3 tools/find_shadowed_consts.py             # Scan using the file index
+    python3 tools/find_shadowed_consts.py --no-cache  # Re-read every file
+    python3 tools/find_shadowed_consts.py --jobs 4    # Parse on 4 worker processes
+    python3 tools/find_shadowed_consts.py --staged    # Only files staged for commit
+    python3 tools/find_shadowed_consts.py --since origin/main
+    python3 tools/find_shadowed_consts.py --files scripts/core/root.gd
+    python3 tools/find_shadowed_consts.py --daemon    # Ask a running gd_index_daemon
+    python3 tools/find_shadowed_consts.py --profile   # Phase timings to .tools_cache/profile/
+    python3 tools/find_shadowed_consts.py --format sarif > shadowed.sarif
 
 Output:
-    Prints all files with shadowed const preloads
+    Prints all files with shadowed const preloads. With --format
+    ndjson/json/sarif, findings stream to stdout (progress goes to stderr)
+    and the exit code is 0 when clean, 1 with findings, 2 on errors.
 """
 
-import os
-import re
+import argparse
+import sys
 from pathlib import Path
 from collections import defaultdict
 
-# Known global classes (classes with class_name declarations)
-KNOWN_GLOBAL_CLASSES = {
-    "C_DamageZoneComponent",
-    "U_InputRebindUtils",
-    "RS_RebindSettings",
-    "RS_InputProfile",
-    "U_InputEventSerialization",
-    "U_InputEventDisplay",
-}
+from gd_changes import add_change_arguments, describe_change_mode, select_files
+from gd_config import load_config
+from gd_output import EXIT_ERROR, add_format_argument, open_writer
+from gd_profile import add_profile_arguments, start_profiler
 
-# Directories to scan
-SCRIPT_DIRS = ["scripts/", "tests/"]
+# gd_scanner and gd_file_index are imported where a local scan needs them,
+# so --daemon answers without loading them
 
-# Regex pattern to match: const ClassName := preload("...")
-CONST_PRELOAD_PATTERN = re.compile(r'^const\s+(\w+)\s*:=\s*preload\(')
+# Rule reported in machine-readable output
+RULE_ID = "shadowed-const-preload"
+RULES = {RULE_ID: "const preload shadows a global class_name"}
 
-# Regex pattern to match: class_name ClassName
-CLASS_NAME_PATTERN = re.compile(r'^\s*class_name\s+(\w+)')
-
-
-def find_all_class_names(project_root):
+def find_all_class_names(project_root, index=None):
     """Scan all .gd files to find classes with class_name declarations."""
-    class_names = set()
-
-    for script_dir in SCRIPT_DIRS:
-        dir_path = project_root / script_dir
-        if not dir_path.exists():
-            continue
-
-        for gd_file in dir_path.rglob("*.gd"):
-            try:
-                with open(gd_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        match = CLASS_NAME_PATTERN.match(line)
-                        if match:
-                            class_names.add(match.group(1))
-                            break  # class_name should be near the top
-            except Exception as e:
-                print(f"Error reading {gd_file}: {e}")
+    from gd_scanner import scan_project
 
-    return class_names
-
-
-def scan_file_for_shadowed_consts(file_path, global_classes):
-    """Scan a single file for shadowed const preloads."""
-    errors = []
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, start=1):
-                match = CONST_PRELOAD_PATTERN.match(line)
-                if match:
-                    const_name = match.group(1)
-                    if const_name in global_classes:
-                        errors.append({
-                            'line': line_num,
-                            'const_name': const_name,
-                            'line_text': line.strip()
-                        })
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-
-    return errors
-
-
-def main():
-    project_root = Path(__file__).parent.parent
-
-    print("=== Shadowed Const Preload Scanner ===")
-    print(f"Project root: {project_root}")
-    print()
+    config = load_config(project_root)
+    return scan_project(project_root, config['scan_roots'], index, exclude=config['exclude']).class_names
 
-    # First, scan for all class_name declarations
-    print("Scanning for global classes (class_name declarations)...")
-    global_classes = find_all_class_names(project_root)
-    print(f"Found {len(global_classes)} global classes")
-    print()
 
-    # Update with known classes
-    global_classes.update(KNOWN_GLOBAL_CLASSES)
+def shadowed_const_errors(facts, global_classes):
+    """Build error records for the shadowed const preloads in one file's facts."""
+    from gd_scanner import find_shadowed_preloads
 
-    # Now scan for shadowed const preloads
-    print("Scanning for shadowed const preloads...")
-    print()
+    return [
+        {
+            'line': preload['line'],
+            'end_line': preload['end_line'],
+            'const_name': preload['const_name'],
+            'preload_path': preload['preload_path'],
+            'line_text': preload['line_text']
+        }
+        for preload in find_shadowed_preloads(facts, global_classes)
+    ]
 
-    all_errors = defaultdict(list)
-    files_scanned = 0
 
-    for script_dir in SCRIPT_DIRS:
-        dir_path = project_root / script_dir
-        if not dir_path.exists():
-            print(f"Warning: Directory not found: {dir_path}")
-            continue
+def scan_file_for_shadowed_consts(file_path, global_classes, index=None):
+    """Scan a single file for shadowed const preloads."""
+    from gd_scanner import read_facts
 
-        for gd_file in dir_path.rglob("*.gd"):
-            files_scanned += 1
-            rel_path = gd_file.relative_to(project_root)
-            errors = scan_file_for_shadowed_consts(gd_file, global_classes)
+    facts = read_facts(Path(file_path), index)
+    if facts is None:
+        return []
+    return shadowed_const_errors(facts, global_classes)
 
-            if errors:
-                all_errors[str(rel_path)] = errors
 
-    # Print results
+def print_report(files_scanned, all_errors, cache_summary=None):
+    """Print the scan summary and every shadowed const, grouped by file."""
     print(f"Files scanned: {files_scanned}")
     print(f"Files with errors: {len(all_errors)}")
+    if cache_summary:
+        print(cache_summary)
     print()
 
     if all_errors:
@@ -145,5 +102,149 @@ def main():
     print()
 
 
+def emit_errors(writer, rel_path, errors):
+    """Stream one file's shadowed consts through a FindingWriter."""
+    for error in errors:
+        writer.emit(
+            RULE_ID, rel_path, error['line'],
+            f"const {error['const_name']} shadows the global class_name {error['const_name']}",
+            end_line=error.get('end_line'),
+            fix=True,
+            const_name=error['const_name'],
+            preload_path=error.get('preload_path'),
+            text=error['line_text'],
+        )
+
+
+def query_daemon(project_root, args, writer=None):
+    """Answer the scan through a running gd_index_daemon; return False if unreachable."""
+    from gd_index_client import query
+
+    request = {
+        'cmd': 'shadowed',
+        'extra_classes': sorted(load_config(project_root)['known_globals']),
+        'since': args.since,
+        'staged': args.staged,
+        'files': [str(Path(path).resolve()) for path in args.files] if args.files else None
+    }
+    response = query(project_root, request)
+    if response is None or not response.get('ok'):
+        if response is not None:
+            print(f"Daemon error: {response.get('error')}")
+        print("Index daemon not reachable, scanning locally...")
+        print()
+        return False
+
+    print("Answered by index daemon")
+    print(f"Found {response['class_count']} global classes")
+    print()
+    if response['selected'] is not None:
+        print(f"Mode: {describe_change_mode(args)} ({response['selected']} files to check)")
+        print()
+
+    if writer is not None:
+        for rel_path in sorted(response['errors']):
+            emit_errors(writer, rel_path, response['errors'][rel_path])
+        sys.exit(writer.close({'files_scanned': response['files_scanned'],
+                               'class_count': response['class_count']}))
+    print_report(response['files_scanned'], response['errors'])
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find shadowed const preloads')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the persistent file index and re-read every file')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for parsing (default: CPU count, 1 = serial)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Query a running gd_index_daemon instead of scanning')
+    add_change_arguments(parser)
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    writer = open_writer(args.format, "find_shadowed_consts", RULES)
+
+    print("=== Shadowed Const Preload Scanner ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    if args.daemon and query_daemon(project_root, args, writer):
+        return
+
+    from gd_file_index import FileIndex
+    from gd_scanner import default_jobs, scan_project
+
+    profiler = start_profiler("find_shadowed_consts", project_root, args)
+    with profiler.phase("index_load"):
+        index = None if args.no_cache else FileIndex.load(project_root)
+
+    # Single pass: read every file once, collecting class_names and preloads
+    print("Scanning for global classes and const preloads (single pass)...")
+    with profiler.phase("scan"):
+        scan = scan_project(project_root, config['scan_roots'], index, jobs=args.jobs or default_jobs(),
+                            exclude=config['exclude'])
+    for dir_path in scan.missing_dirs:
+        print(f"Warning: Directory not found: {dir_path}")
+    print(f"Found {len(scan.class_names)} global classes")
+    print()
+
+    # Resolve shadowing against the collected class set
+    print("Resolving shadowed const preloads...")
+    print()
+
+    # Changed-files-only modes still use the full class set built above
+    # (with --staged, updated to the staged content of the selected files)
+    with profiler.phase("select"):
+        try:
+            selection = select_files(project_root, args, scan, config['scan_roots'])
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+    if selection is not None:
+        print(f"Mode: {describe_change_mode(args)} ({len(selection)} files to check)")
+        print()
+
+    # Update with known classes from gdtools.toml
+    global_classes = scan.class_names | config['known_globals']
+
+    all_errors = defaultdict(list)
+    files_scanned = 0
+
+    with profiler.phase("resolve"):
+        for rel_path, facts in scan.files:
+            if selection is not None and rel_path not in selection:
+                continue
+            files_scanned += 1
+            errors = shadowed_const_errors(facts, global_classes)
+            if not errors:
+                continue
+            if writer is not None:
+                # Streamed as found; nothing is buffered in machine formats
+                emit_errors(writer, rel_path, errors)
+            else:
+                all_errors[rel_path] = errors
+
+    if index is not None:
+        with profiler.phase("index_save"):
+            index.prune()
+            index.save()
+
+    if writer is not None:
+        profiler.finish(index)
+        sys.exit(writer.close({
+            'files_scanned': files_scanned,
+            'class_count': len(scan.class_names),
+            'cache_hits': index.hits if index is not None else None,
+            'cache_misses': index.misses if index is not None else None,
+        }))
+
+    with profiler.phase("report"):
+        print_report(files_scanned, all_errors, index.summary() if index is not None else None)
+    profiler.finish(index)
+
 if __name__ == "__main__":
     main()
@@ -5,6 +5,23 @@ Automatically fixes shadowed const preloads (v2 - excludes .tres files).
 Usage:
     python3 tools/fix_shadowed_consts_v2.py --dry-run    # Preview changes
     python3 tools/fix_shadowed_consts_v2.py              # Apply changes
+    python3 tools/fix_shadowed_consts_v2.py --no-cache   # Re-read every file
+    python3 tools/fix_shadowed_consts_v2.py --jobs 4     # Use 4 worker processes
+    python3 tools/fix_shadowed_consts_v2.py --staged     # Only files staged for commit
+    python3 tools/fix_shadowed_consts_v2.py --since origin/main --dry-run
+    python3 tools/fix_shadowed_consts_v2.py --dry-run --profile  # Phase timings
+    python3 tools/fix_shadowed_consts_v2.py --dry-run --format ndjson  # Stream edits as JSON
+    python3 tools/fix_shadowed_consts_v2.py --diff > fix.patch   # Unified diff, nothing written
+
+Edits go through the gd_codemod engine: each candidate file is read once,
+the const preload statements found by the parser (multi-line ones
+included) are deleted as whole-line spans, and the file is replaced
+atomically only when its content changed.
+
+With --format ndjson/json/sarif every removed line is streamed to stdout
+as a finding (SARIF results carry the deletion as a fix) and progress goes
+to stderr. Exit code: 0 when clean or when live edits were applied, 1 when
+a dry run has pending edits, 2 on errors.
 
 Improvements from v1:
     - Only removes const preloads for .gd script files
@@ -12,140 +29,84 @@ Improvements from v1:
     - More accurate pattern matching
 """
 
-import os
 import re
+import sys
 import argparse
 from pathlib import Path
 
-# Directories to scan
-SCRIPT_DIRS = ["scripts/", "tests/"]
+from gd_codemod import process_file, run_codemod
+from gd_changes import add_change_arguments, describe_change_mode, select_files
+from gd_config import load_config
+from gd_file_index import FileIndex
+from gd_output import EXIT_CLEAN, EXIT_ERROR, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_profile import add_profile_arguments, start_profiler
+from gd_scanner import default_jobs, find_shadowed_preloads, scan_project
 
-# Regex patterns
-CONST_PRELOAD_PATTERN = re.compile(r'^const\s+(\w+)\s*:=\s*preload\("([^"]+)"\)')
-CLASS_NAME_PATTERN = re.compile(r'^\s*class_name\s+(\w+)')
+# Name of the const a removed statement declared
+CONST_NAME_PATTERN = re.compile(r'^\s*const\s+(\w+)')
 
+# Rule reported in machine-readable output
+RULE_ID = "shadowed-const-preload"
+RULES = {RULE_ID: "const preload shadows a global class_name"}
 
-def find_all_class_names(project_root):
-    """Scan all .gd files to find classes with class_name declarations."""
-    class_names = set()
-
-    for script_dir in SCRIPT_DIRS:
-        dir_path = project_root / script_dir
-        if not dir_path.exists():
-            continue
-
-        for gd_file in dir_path.rglob("*.gd"):
-            try:
-                with open(gd_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        match = CLASS_NAME_PATTERN.match(line)
-                        if match:
-                            class_names.add(match.group(1))
-                            break
-            except Exception as e:
-                print(f"Error reading {gd_file}: {e}")
-
-    return class_names
-
-
-def fix_file(file_path, global_classes, dry_run=True):
-    """Remove shadowed const preloads from a single file (only .gd files)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return None
-
-    new_lines = []
-    removed_lines = []
 
-    for line_num, line in enumerate(lines, start=1):
-        match = CONST_PRELOAD_PATTERN.match(line)
-
-        if match:
-            const_name = match.group(1)
-            preload_path = match.group(2)
+def find_all_class_names(project_root, index=None):
+    """Scan all .gd files to find classes with class_name declarations."""
+    config = load_config(project_root)
+    return scan_project(project_root, config['scan_roots'], index, exclude=config['exclude']).class_names
 
-            # IMPORTANT: Only remove if:
-            # 1. const_name matches a global class
-            # 2. preload_path is a .gd file (NOT .tres, .tscn, etc.)
-            if const_name in global_classes and preload_path.endswith('.gd'):
-                # This is a shadowed const for a script - remove it
-                removed_lines.append((line_num, line.rstrip()))
-                continue
 
-        new_lines.append(line)
+def remove_shadowed_preloads(source, context):
+    """Codemod rule: delete every const preload of a .gd script that shadows a global class."""
+    return [source.delete_lines(preload['line'], preload['end_line'], RULE_ID)
+            for preload in find_shadowed_preloads(source.facts, context['global_classes'], scripts_only=True)]
 
-    if not removed_lines:
-        return None
 
-    # Write changes if not dry run
-    if not dry_run:
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-        except Exception as e:
-            print(f"Error writing {file_path}: {e}")
-            return None
+# Rules applied in one pass per file, in priority order
+CODEMOD_RULES = {RULE_ID: remove_shadowed_preloads}
 
-    return {
-        'removed_lines': removed_lines,
-        'lines_removed_count': len(removed_lines)
-    }
 
+def removed_lines(result):
+    """Return [(line_num, text)] for every source line a codemod result removed."""
+    return [(edit['line'] + offset, text.rstrip())
+            for edit in result['edits']
+            for offset, text in enumerate(edit['text'].splitlines())]
 
-def main():
-    parser = argparse.ArgumentParser(description='Fix shadowed const preloads (v2)')
-    parser.add_argument('--dry-run', action='store_true',
-                        help='Show what would be changed without applying')
-    args = parser.parse_args()
 
-    project_root = Path(__file__).parent.parent
+def fix_file(file_path, global_classes, dry_run=True, facts=None):
+    """
+    Remove shadowed const preloads from a single file (only .gd files).
 
-    print("=== Shadowed Const Preload Fixer v2 ===")
-    print(f"Project root: {project_root}")
-    if args.dry_run:
-        print("🔍 DRY RUN MODE - No files will be modified")
-    else:
-        print("⚠️  LIVE MODE - Files will be modified")
-    print()
-    print("✨ v2 improvements: Only removes .gd preloads, preserves .tres resource instances")
-    print()
-
-    # Find all global classes
-    print("Scanning for global classes (class_name declarations)...")
-    global_classes = find_all_class_names(project_root)
-    print(f"Found {len(global_classes)} global classes")
-    print()
-
-    # Process all files
-    print("Processing files...")
-    print()
-
-    files_modified = 0
-    total_lines_removed = 0
-    changes_by_file = {}
+    When facts from a previous scan are passed, files with nothing to
+    remove are skipped without being read again.
+    """
+    if facts is not None and not find_shadowed_preloads(facts, global_classes, scripts_only=True):
+        return None
 
-    for script_dir in SCRIPT_DIRS:
-        dir_path = project_root / script_dir
-        if not dir_path.exists():
-            continue
+    file_path = Path(file_path)
+    result = process_file(file_path.name, file_path.parent, CODEMOD_RULES,
+                          {'global_classes': global_classes}, write=not dry_run)
+    if result['error']:
+        print(result['error'])
+        return None
+    if not result['edits']:
+        return None
 
-        for gd_file in dir_path.rglob("*.gd"):
-            rel_path = gd_file.relative_to(project_root)
-            result = fix_file(gd_file, global_classes, dry_run=args.dry_run)
+    removed = removed_lines(result)
+    return {
+        'removed_lines': removed,
+        'lines_removed_count': len(removed)
+    }
 
-            if result:
-                files_modified += 1
-                total_lines_removed += result['lines_removed_count']
-                changes_by_file[str(rel_path)] = result
 
-    # Print summary
+def print_summary(files_modified, total_lines_removed, changes_by_file, dry_run, cache_summary=None):
+    """Print the totals and the removed lines, grouped by file."""
     print()
     print("=== Summary ===")
     print(f"Files modified: {files_modified}")
     print(f"Total const lines removed: {total_lines_removed}")
+    if cache_summary:
+        print(cache_summary)
     print()
 
     if changes_by_file:
@@ -157,7 +118,7 @@ def main():
         max_show = 20
 
         for file_path in sorted(changes_by_file.keys()):
-            if shown_files >= max_show and args.dry_run:
+            if shown_files >= max_show and dry_run:
                 remaining = len(changes_by_file) - shown_files
                 print(f"... and {remaining} more files")
                 print()
@@ -172,7 +133,7 @@ def main():
             print()
             shown_files += 1
 
-    if args.dry_run:
+    if dry_run:
         print()
         print("💡 To apply these changes, run:")
         print("   python3 tools/fix_shadowed_consts_v2.py")
@@ -188,5 +149,135 @@ def main():
         print("   3. Commit the changes")
 
 
+def main():
+    parser = argparse.ArgumentParser(description='Fix shadowed const preloads (v2)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show what would be changed without applying')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the persistent file index and re-read every file')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for scanning and fixing (default: CPU count, 1 = serial)')
+    add_change_arguments(parser)
+    add_profile_arguments(parser)
+    parser.add_argument('--diff', action='store_true',
+                        help='Print one unified diff to stdout instead of modifying files')
+    add_format_argument(parser)
+    args = parser.parse_args()
+    if args.diff and args.format != 'text':
+        parser.error("--diff cannot be combined with --format")
+    if args.diff:
+        # The patch owns stdout; progress and the summary go to stderr
+        args.dry_run = True
+        patch_stream = sys.stdout
+        sys.stdout = sys.stderr
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    writer = open_writer(args.format, "fix_shadowed_consts", RULES)
+    profiler = start_profiler("fix_shadowed_consts", project_root, args)
+    with profiler.phase("index_load"):
+        index = None if args.no_cache else FileIndex.load(project_root)
+
+    print("=== Shadowed Const Preload Fixer v2 ===")
+    print(f"Project root: {project_root}")
+    if args.dry_run:
+        print("🔍 DRY RUN MODE - No files will be modified")
+    else:
+        print("⚠️  LIVE MODE - Files will be modified")
+    print()
+    print("✨ v2 improvements: Only removes .gd preloads, preserves .tres resource instances")
+    print()
+
+    # Single pass: read every file once, collecting class_names and preloads
+    print("Scanning for global classes and const preloads (single pass)...")
+    with profiler.phase("scan"):
+        scan = scan_project(project_root, config['scan_roots'], index, jobs=args.jobs,
+                            exclude=config['exclude'])
+    global_classes = scan.class_names
+    print(f"Found {len(global_classes)} global classes")
+    print()
+
+    # Process all files
+    print("Processing files...")
+    print()
+
+    files_modified = 0
+    total_lines_removed = 0
+    changes_by_file = {}
+
+    # Changed-files-only modes still use the full class set built above
+    with profiler.phase("select"):
+        try:
+            # Fixes edit the working tree, so they are found in working-tree content
+            selection = select_files(project_root, args, scan, config['scan_roots'],
+                                     staged_content=False)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+    if selection is not None:
+        print(f"Mode: {describe_change_mode(args)} ({len(selection)} files to check)")
+        print()
+
+    # Only files with something to remove are read again, spread over the pool
+    with profiler.phase("resolve"):
+        candidates = [rel_path for rel_path, facts in scan.files
+                      if (selection is None or rel_path in selection)
+                      and find_shadowed_preloads(facts, global_classes, scripts_only=True)]
+    failed = False
+    with profiler.phase("fix"):
+        results = run_codemod(project_root, candidates, CODEMOD_RULES, {'global_classes': global_classes},
+                              jobs=args.jobs, write=not args.dry_run, diff=args.diff)
+        for result in results:
+            rel_path = result['path']
+            if result['error']:
+                print(result['error'])
+                failed = True
+            for conflict in result['conflicts']:
+                print(f"Conflict in {rel_path}:{conflict['line']}: {conflict['rule']} overlaps "
+                      f"{conflict['with_rule']} at line {conflict['with_line']}, skipped")
+            if not result['edits']:
+                continue
+            files_modified += 1
+            removed = removed_lines(result)
+            total_lines_removed += len(removed)
+            if result['diff']:
+                patch_stream.write(result['diff'])
+            if writer is None:
+                changes_by_file[rel_path] = {'removed_lines': removed, 'lines_removed_count': len(removed)}
+                continue
+            for edit in result['edits']:
+                const_name = CONST_NAME_PATTERN.match(edit['text']).group(1)
+                writer.emit(RULE_ID, rel_path, edit['line'],
+                            f"{'Would remove' if args.dry_run else 'Removed'} const {const_name} "
+                            f"shadowing the global class_name {const_name}",
+                            end_line=edit['end_line'], fix=True, const_name=const_name,
+                            applied=not args.dry_run, text=edit['text'].rstrip())
+    profiler.count('files_fixed', len(candidates))
+
+    if index is not None:
+        with profiler.phase("index_save"):
+            index.prune()
+            index.save()
+
+    if writer is not None:
+        profiler.finish(index)
+        exit_code = writer.close({
+            'files_modified': files_modified,
+            'lines_removed': total_lines_removed,
+            'dry_run': args.dry_run,
+        }, failed=failed)
+        # Applied edits are the requested outcome, not outstanding findings
+        if exit_code == EXIT_FINDINGS and not args.dry_run:
+            exit_code = EXIT_CLEAN
+        sys.exit(exit_code)
+
+    with profiler.phase("report"):
+        print_summary(files_modified, total_lines_removed, changes_by_file, args.dry_run,
+                      index.summary() if index is not None else None)
+    profiler.finish(index)
+    if failed:
+        sys.exit(EXIT_ERROR)
+
+
 if __name__ == "__main__":
     main()
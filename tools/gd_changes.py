@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Git-aware changed-file selection for the GDScript tools.
+
+Adds --since <rev>, --staged and --files <paths...> to a tool's argument
+parser and turns them into the set of .gd files whose per-file checks must
+run. The global class_name set is still taken from the whole (indexed)
+tree, and any unchanged file whose consts refer to a class_name that a
+changed file added or removed is pulled back into the selection, so the
+answer matches a full scan.
+
+--since compares the working tree, so files git does not track yet count
+as changed. --staged checks what will be committed: the staged blobs of
+the selected files stand in for their working-tree content.
+
+Usage (from other tools):
+    from gd_changes import add_change_arguments, select_files
+
+    add_change_arguments(parser)
+    args = parser.parse_args()
+    selection = select_files(project_root, args, scan, SCRIPT_DIRS)
+    # selection is None for a full scan, else a set of rel paths to check
+"""
+
+import subprocess
+from pathlib import Path
+
+
+def add_change_arguments(parser):
+    """Register the mutually exclusive changed-files-only options."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--since', metavar='REV',
+                       help='Only check .gd files changed since REV (git diff REV)')
+    group.add_argument('--staged', action='store_true',
+                       help='Only check .gd files staged for commit')
+    group.add_argument('--files', nargs='+', metavar='PATH',
+                       help='Only check the given files')
+
+
+def is_change_mode(args):
+    """Return True when any changed-files-only option was given."""
+    return bool(args.since or args.staged or args.files)
+
+
+def describe_change_mode(args):
+    """Return a short human-readable description of the active mode."""
+    if args.since:
+        return f"changed since {args.since}"
+    if args.staged:
+        return "staged changes"
+    if args.files:
+        return "explicit file list"
+    return "full scan"
+
+
+def _git(project_root, *git_args):
+    result = subprocess.run(
+        ['git', *git_args],
+        capture_output=True,
+        text=True,
+        cwd=project_root
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(git_args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def git_changed_paths(project_root, args, include_untracked=True):
+    """
+    Return (base_rev, [rel_path]) for the active mode.
+
+    With include_untracked (the default), --since also counts files git does
+    not track yet (and does not ignore) as changed, since the working tree
+    is compared.
+    """
+    if args.since:
+        paths = _git(project_root, 'diff', '--name-only', args.since, '--').splitlines()
+        if include_untracked:
+            paths += _git(project_root, 'ls-files', '--others', '--exclude-standard').splitlines()
+        return args.since, paths
+    if args.staged:
+        output = _git(project_root, 'diff', '--name-only', '--cached', '--')
+        return 'HEAD', output.splitlines()
+
+    project_root = Path(project_root).resolve()
+    paths = []
+    for path in args.files:
+        resolved = Path(path).resolve()
+        try:
+            paths.append(resolved.relative_to(project_root).as_posix())
+        except ValueError:
+            paths.append(Path(path).as_posix())
+    return 'HEAD', paths
+
+
+def staged_blobs(project_root, rel_paths):
+    """
+    Return {rel_path: bytes} with the staged content of rel_paths.
+
+    Paths that are not in the index (staged for deletion) are left out.
+    All blobs come from one git cat-file process.
+    """
+    if not rel_paths:
+        return {}
+    result = subprocess.run(
+        ['git', 'cat-file', '--batch'],
+        input="".join(f":{rel_path}\n" for rel_path in rel_paths).encode('utf-8'),
+        capture_output=True,
+        cwd=project_root
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git cat-file --batch failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+    output = result.stdout
+    blobs = {}
+    position = 0
+    for rel_path in rel_paths:
+        end = output.index(b'\n', position)
+        # "<sha> blob <size>", or "<name> missing" for a path not in the index
+        header = output[position:end].split()
+        position = end + 1
+        if len(header) != 3 or header[1] != b'blob':
+            continue
+        size = int(header[2])
+        blobs[rel_path] = output[position:position + size]
+        position += size + 1
+    return blobs
+
+
+def use_staged_content(project_root, scan, rel_paths):
+    """
+    Replace the facts of rel_paths in scan with those of their staged content.
+
+    Files staged for deletion are dropped and scan.class_names is rebuilt,
+    so the checks see the tree that will be committed.
+    """
+    from gd_file_index import parse_gd_facts
+
+    staged_facts = {}
+    for rel_path, data in staged_blobs(project_root, rel_paths).items():
+        try:
+            staged_facts[rel_path] = parse_gd_facts(data.decode('utf-8'))
+        except UnicodeDecodeError as e:
+            print(f"Error reading staged {rel_path}: {e}")
+
+    staged = set(rel_paths)
+    files = [(rel_path, staged_facts.get(rel_path, facts)) for rel_path, facts in scan.files
+             if rel_path not in staged or rel_path in staged_facts]
+    # Staged files already gone from the working tree
+    walked = {rel_path for rel_path, _facts in scan.files}
+    files += [(rel_path, facts) for rel_path, facts in staged_facts.items() if rel_path not in walked]
+    scan.files = files
+    scan.class_names = {facts['class_name'] for _rel_path, facts in files if facts['class_name']}
+
+
+def base_class_name(project_root, base_rev, rel_path):
+    """Return the class_name a file declared at base_rev, or None."""
+    # Imported here so the argument helpers stay light for daemon clients
+    from gd_file_index import parse_gd_facts
+
+    result = subprocess.run(
+        ['git', 'show', f'{base_rev}:{rel_path}'],
+        capture_output=True,
+        cwd=project_root
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        return parse_gd_facts(result.stdout.decode('utf-8'))['class_name']
+    except UnicodeDecodeError:
+        return None
+
+
+def _in_script_dirs(rel_path, script_dirs):
+    return rel_path.endswith('.gd') and any(
+        rel_path.startswith(script_dir.rstrip('/') + '/') for script_dir in script_dirs
+    )
+
+
+def select_files(project_root, args, scan, script_dirs, staged_content=True):
+    """
+    Return the rel paths whose per-file checks must run, or None for all.
+
+    Changed files are checked directly. If a changed (or deleted) file's
+    class_name differs between the base revision and the working tree, every
+    file with a const of either name is checked too, since its shadowing
+    status may have flipped without the file itself changing.
+
+    With --staged and staged_content, scan is updated to the staged content
+    first (see use_staged_content), so take class_names from it afterwards.
+    """
+    if not is_change_mode(args):
+        return None
+
+    base_rev, changed = git_changed_paths(project_root, args)
+    changed = [path for path in changed if _in_script_dirs(path, script_dirs)]
+    if args.staged and staged_content:
+        use_staged_content(project_root, scan, changed)
+
+    facts_by_path = dict(scan.files)
+    selection = {path for path in changed if path in facts_by_path}
+
+    affected_classes = set()
+    for path in changed:
+        current = facts_by_path.get(path)
+        current_class = current['class_name'] if current else None
+        previous_class = base_class_name(project_root, base_rev, path)
+        if current_class != previous_class:
+            affected_classes.update(name for name in (current_class, previous_class) if name)
+
+    if affected_classes:
+        for path, facts in scan.files:
+            if any(preload['const_name'] in affected_classes for preload in facts['const_preloads']):
+                selection.add(path)
+
+    return selection
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Multi-rule codemod engine for GDScript sources.
+
+Each file is read once and handed to every rule. A rule returns text
+edits (spans of the original source plus replacement text). The edits of
+all rules are merged, and an edit that overlaps one already accepted
+is dropped and reported as a conflict; rules earlier in the mapping win.
+The file is written at most once, through a temp file plus os.replace,
+and only if its content changed, so a crash can never leave a truncated
+script. Files are processed on a process pool, and instead of writing,
+the engine can return a unified diff per file that `git apply` accepts.
+
+Running N rules costs one read, one parse (facts are parsed lazily and
+shared) and at most one write per file, however large N is.
+
+Usage (from other tools):
+    from gd_codemod import run_codemod
+
+    def remove_shadowed(source, context):
+        return [source.delete_lines(p['line'], p['end_line'], "shadowed-const-preload")
+                for p in find_shadowed_preloads(source.facts, context['global_classes'])]
+
+    rules = {"shadowed-const-preload": remove_shadowed}
+    for result in run_codemod(project_root, rel_paths, rules, context, jobs=8, write=False, diff=True):
+        print(result['diff'], end="")
+"""
+
+import bisect
+import difflib
+import os
+import shutil
+import tempfile
+from functools import partial
+from pathlib import Path
+
+from gd_file_index import parse_gd_facts
+from gd_scanner import iter_parallel_map
+
+
+class SourceFile:
+    """One file's original text, handed to every rule."""
+
+    def __init__(self, path, rel_path, text):
+        self.path = path
+        self.rel_path = rel_path
+        self.text = text
+        self._facts = None
+        self._line_starts = None
+
+    @property
+    def facts(self):
+        """gd_file_index facts for the text, parsed on first use."""
+        if self._facts is None:
+            self._facts = parse_gd_facts(self.text)
+        return self._facts
+
+    def line_offset(self, line):
+        """Return the offset where 1-based line starts (len(text) past the end)."""
+        if self._line_starts is None:
+            self._line_starts = [0]
+            for i, char in enumerate(self.text):
+                if char == '\n':
+                    self._line_starts.append(i + 1)
+        if line - 1 < len(self._line_starts):
+            return self._line_starts[line - 1]
+        return len(self.text)
+
+    def line_text(self, line):
+        return self.text[self.line_offset(line):self.line_offset(line + 1)].rstrip('\r\n')
+
+    def edit(self, start, end, replacement, rule):
+        """Return an edit replacing text[start:end]."""
+        line = self.text.count('\n', 0, start) + 1
+        return {
+            'rule': rule,
+            'start': start,
+            'end': end,
+            'replacement': replacement,
+            'line': line,
+            'end_line': line + self.text.count('\n', start, max(start, end - 1)),
+        }
+
+    def delete_lines(self, first_line, last_line, rule):
+        """Return an edit deleting whole lines first_line..last_line, newlines included."""
+        return self.edit(self.line_offset(first_line), self.line_offset(last_line + 1), "", rule)
+
+
+def _overlaps(a, b):
+    if a['start'] == b['start'] and (a['start'] == a['end'] or b['start'] == b['end']):
+        # Two inserts (or an insert and a deletion) at one point have no defined order
+        return True
+    for outer, inner in ((a, b), (b, a)):
+        if inner['start'] == inner['end'] and outer['start'] < inner['start'] < outer['end']:
+            # An insert strictly inside a replaced span would be swallowed by it
+            return True
+    return max(a['start'], b['start']) < min(a['end'], b['end'])
+
+
+def _find_clash(accepted, position, edit):
+    """Return the first accepted edit that overlaps edit, or None."""
+    # Accepted edits do not overlap, so their ends rise with their starts:
+    # walk back over those still open at edit's start, then forward over
+    # those starting before its end (a wide edit can span several)
+    k = position - 1
+    while k >= 0 and accepted[k]['end'] > edit['start']:
+        if _overlaps(edit, accepted[k]):
+            return accepted[k]
+        k -= 1
+    k = position
+    while k < len(accepted) and (accepted[k]['start'] < edit['end']
+                                 or accepted[k]['start'] == edit['start']):
+        if _overlaps(edit, accepted[k]):
+            return accepted[k]
+        k += 1
+    return None
+
+
+def merge_edits(edits_by_rule):
+    """
+    Merge the edits of several rules into one non-overlapping list.
+
+    edits_by_rule is [(rule, [edit])] in priority order. Returns
+    (accepted sorted by start, conflicts); an exact duplicate of an
+    accepted edit is dropped silently.
+    """
+    accepted = []
+    starts = []
+    conflicts = []
+    for _rule, edits in edits_by_rule:
+        for edit in sorted(edits, key=lambda e: (e['start'], e['end'])):
+            position = bisect.bisect_left(starts, edit['start'])
+            clash = _find_clash(accepted, position, edit)
+            if clash is None:
+                accepted.insert(position, edit)
+                starts.insert(position, edit['start'])
+            elif (clash['start'], clash['end'], clash['replacement']) != \
+                    (edit['start'], edit['end'], edit['replacement']):
+                conflicts.append({'rule': edit['rule'], 'line': edit['line'],
+                                  'with_rule': clash['rule'], 'with_line': clash['line']})
+    return accepted, conflicts
+
+
+def apply_edits(text, edits):
+    """Apply non-overlapping edits (sorted by start) to text."""
+    parts = []
+    position = 0
+    for edit in edits:
+        parts.append(text[position:edit['start']])
+        parts.append(edit['replacement'])
+        position = edit['end']
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def write_atomic(path, data):
+    """Replace path with data via a temp file in the same directory, keeping its mode."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def unified_diff(rel_path, old_text, new_text):
+    """Return a unified diff of the two texts that `git apply` accepts."""
+    lines = []
+    for line in difflib.unified_diff(
+            old_text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+            fromfile=f"a/{rel_path}", tofile=f"b/{rel_path}"):
+        if not line.endswith('\n'):
+            # Last line of a file without a trailing newline
+            line += "\n\\ No newline at end of file\n"
+        lines.append(line)
+    return "".join(lines)
+
+
+def process_file(rel_path, project_root, rules, context, write=True, diff=False):
+    """
+    Worker: run every rule on one file and write (or diff) the result.
+
+    Returns {'path', 'changed', 'edits', 'conflicts', 'diff', 'error'};
+    each edit is reported as {'rule', 'line', 'end_line', 'text'} where
+    text is the original source it replaced.
+    """
+    result = {'path': rel_path, 'changed': False, 'edits': [], 'conflicts': [],
+              'diff': None, 'error': None}
+    path = Path(project_root) / rel_path
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        text = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        result['error'] = f"Error reading {path}: {e}"
+        return result
+
+    source = SourceFile(path, rel_path, text)
+    edits, result['conflicts'] = merge_edits(
+        [(name, rule(source, context)) for name, rule in rules.items()])
+    if not edits:
+        return result
+
+    new_text = apply_edits(text, edits)
+    result['edits'] = [{'rule': e['rule'], 'line': e['line'], 'end_line': e['end_line'],
+                        'text': text[e['start']:e['end']]} for e in edits]
+    if new_text == text:
+        return result
+    result['changed'] = True
+
+    if diff:
+        result['diff'] = unified_diff(rel_path, text, new_text)
+    if write:
+        try:
+            write_atomic(path, new_text.encode('utf-8'))
+        except OSError as e:
+            result['error'] = f"Error writing {path}: {e}"
+    return result
+
+
+def run_codemod(project_root, rel_paths, rules, context, jobs=1, write=True, diff=False):
+    """Yield process_file results for rel_paths, in order, as the pool completes them."""
+    worker = partial(process_file, project_root=project_root, rules=rules, context=context,
+                     write=write, diff=diff)
+    yield from iter_parallel_map(worker, rel_paths, jobs)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Shared project configuration for the Python tools.
+
+Settings that used to be copied between scripts (the GDScript scan roots,
+paths to skip, classes to treat as global) live in gdtools.toml at the
+project root. Every key is optional; a missing file or key falls back to
+the defaults below, so the tools also work on trees without a config
+(such as the synthetic benchmark corpora). The file is read with tomllib
+(Python 3.11+) or the tomli backport; with neither, it is skipped with a
+warning and the defaults apply.
+
+    [scan]
+    roots = ["scripts/", "tests/"]    # directories holding GDScript
+    exclude = ["tests/fixtures/*"]    # fnmatch patterns, project-relative
+
+    [globals]
+    known = ["C_DamageZoneComponent"] # treated as declared class_names
+
+    [tests]
+    wait_budget = 5.0                 # seconds a test file may wait on real time
+
+Usage (from other tools):
+    from gd_config import load_config
+
+    config = load_config(project_root)
+    scan = scan_project(project_root, config['scan_roots'], index,
+                        exclude=config['exclude'])
+"""
+
+from fnmatch import fnmatch
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11: the tomli backport has the same API; without it the config is skipped
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+CONFIG_FILENAME = "gdtools.toml"
+
+# Defaults when the project has no config (or leaves a key out)
+SCRIPT_DIRS = ["scripts/", "tests/"]
+
+_loaded = {}
+
+
+def load_config(project_root):
+    """Return {'scan_roots', 'exclude', 'known_globals', 'test_wait_budget'} for a project (read once per process)."""
+    project_root = Path(project_root).resolve()
+    if project_root in _loaded:
+        return _loaded[project_root]
+
+    data = {}
+    config_path = project_root / CONFIG_FILENAME
+    if config_path.exists() and tomllib is None:
+        print(f"⚠️  Skipping {config_path}: reading it needs Python 3.11+ or the tomli package; "
+              "using the default settings")
+    elif config_path.exists():
+        try:
+            with open(config_path, 'rb') as f:
+                data = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            print(f"Error reading {config_path}: {e}")
+
+    scan = data.get('scan', {})
+    config = {
+        'scan_roots': [root.rstrip('/') + '/' for root in scan.get('roots', SCRIPT_DIRS)],
+        'exclude': list(scan.get('exclude', [])),
+        'known_globals': set(data.get('globals', {}).get('known', [])),
+        'test_wait_budget': data.get('tests', {}).get('wait_budget'),
+    }
+    _loaded[project_root] = config
+    return config
+
+
+def is_excluded(rel_path, patterns):
+    """Return True if rel_path, or any directory above it, matches an exclude pattern."""
+    if not patterns:
+        return False
+    parts = rel_path.split('/')
+    for end in range(1, len(parts) + 1):
+        candidate = '/'.join(parts[:end])
+        if any(fnmatch(candidate, pattern) for pattern in patterns):
+            return True
+    return False
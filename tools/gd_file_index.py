@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Persistent incremental index of per-file GDScript facts.
+
+Stores each scanned file's class_name declaration and const preload lines in
+an on-disk JSON index keyed by relative path. Entries are validated against
+mtime and size first, then against a content hash, so unchanged files are
+never re-parsed between runs.
+
+Usage (from other tools):
+    from gd_file_index import FileIndex
+
+    index = FileIndex.load(project_root)
+    facts = index.get_facts(project_root / "scripts/core/root.gd")
+    index.save()
+    print(index.hits, index.misses)
+
+Tools indexing other facts subclass FileIndex and override version,
+filename and extract(key, data) (plus read() to hash only part of a file);
+the stat/hash validation stays here.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from gd_profile import active
+
+# Bump whenever the shape of stored facts changes to invalidate old indexes
+INDEX_VERSION = 2
+
+# Index location (relative to project root)
+CACHE_DIR = ".tools_cache"
+INDEX_FILENAME = "gd_file_index.json"
+
+def hash_bytes(data):
+    """Return the content hash used to validate index entries."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def parse_gd_facts(text, tree=None):
+    """
+    Extract the class_name and const preload facts from GDScript source.
+
+    Facts come from the gd_parser syntax tree, so typed consts, plain '='
+    consts, multi-line preloads and class_name after extends are covered.
+    Pass tree when the caller already has it for this text.
+    """
+    if tree is None:
+        from gd_parser import parse_source
+        tree = parse_source(text)
+    lines = text.splitlines()
+    const_preloads = []
+
+    for const in tree['consts']:
+        if not const['value'].startswith('preload('):
+            continue
+        const_preloads.append({
+            'line': const['line'],
+            'end_line': const['end_line'],
+            'const_name': const['name'],
+            'preload_path': const['preload'],
+            'line_text': lines[const['line'] - 1].strip() if const['line'] <= len(lines) else ''
+        })
+
+    return {
+        'class_name': tree['class_name'],
+        'const_preloads': const_preloads
+    }
+
+
+class FileIndex:
+    """On-disk index of GDScript facts with hit/miss accounting."""
+
+    # Subclasses indexing other file kinds override these (and read/extract)
+    version = INDEX_VERSION
+    filename = INDEX_FILENAME
+    # Profiler phase extract() is timed under
+    extract_phase = "parse"
+
+    def __init__(self, project_root, entries=None, path=None):
+        self.project_root = Path(project_root)
+        self.path = path
+        self.entries = entries if entries is not None else {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._resolved = {}
+        self._parse_cache = None
+
+    @classmethod
+    def load(cls, project_root, path=None):
+        """Load the index from disk, starting empty if missing or stale."""
+        project_root = Path(project_root)
+        if path is None:
+            path = project_root / CACHE_DIR / cls.filename
+
+        entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == cls.version:
+                entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+        return cls(project_root, entries=entries, path=path)
+
+    def _key(self, file_path):
+        file_path = Path(file_path)
+        try:
+            return file_path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    def get_facts(self, file_path, data=None):
+        """
+        Return the facts for a file, re-parsing only when it changed.
+
+        When the caller already holds the file bytes they can be passed as
+        data to skip the extra read on a miss. Returns None if the file
+        cannot be read or decoded.
+        """
+        key = self._key(file_path)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        facts = self._resolve(key, file_path, data)
+        self._resolved[key] = facts
+        return facts
+
+    def _resolve(self, key, file_path, data):
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            self.report_error(f"Error reading {file_path}: {e}")
+            return None
+
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            self.hits += 1
+            return entry['facts']
+
+        profiler = active()
+        if data is None:
+            try:
+                with profiler.phase("read"):
+                    data = self.read(file_path)
+            except (OSError, ValueError) as e:
+                self.report_error(f"Error reading {file_path}: {e}")
+                return None
+            profiler.file_read(len(data))
+
+        with profiler.phase("hash"):
+            digest = hash_bytes(data)
+        if entry and entry['hash'] == digest:
+            return self._record(key, stat.st_mtime_ns, stat.st_size, digest, None)
+
+        try:
+            with profiler.phase(self.extract_phase):
+                facts = self.extract(key, data)
+        except UnicodeDecodeError as e:
+            self.report_error(f"Error reading {file_path}: {e}")
+            return None
+        return self._record(key, stat.st_mtime_ns, stat.st_size, digest, facts)
+
+    def read(self, file_path):
+        """
+        Return the bytes a file's facts are extracted from.
+
+        The content hash is taken over the same bytes, so an index that only
+        needs a file's header can override this to read just the header.
+        """
+        with open(file_path, 'rb') as f:
+            return f.read()
+
+    def extract(self, key, data):
+        """Return the facts for the bytes of a new or changed file; subclasses override this."""
+        text = data.decode('utf-8')
+        return parse_gd_facts(text, self.parse_tree(data))
+
+    def parse_tree(self, data, tokens=None):
+        """
+        Return the gd_parser tree for a file's bytes.
+
+        An index backed by a file on disk shares trees with every other tool
+        through ParseCache; one built without (--no-cache) always parses.
+        Pass tokens when the caller already tokenized the source.
+        """
+        # Imported here so tools that index other facts (select_tests) never load the parser
+        from gd_parser import ParseCache, parse_source, parse_tokens
+
+        if self.path is None:
+            return parse_tokens(tokens) if tokens is not None else parse_source(data.decode('utf-8'))
+        if self._parse_cache is None:
+            self._parse_cache = ParseCache(self.project_root, index=self)
+        return self._parse_cache.tree_for(data, tokens)
+
+    def read_and_extract(self, file_path):
+        """
+        Return (stat, data, facts) for a file without consulting the entries.
+
+        Used by worker processes (see gd_scanner.index_files); the results
+        come back to the parent index through record().
+        """
+        stat = os.stat(file_path)
+        data = self.read(file_path)
+        return stat, data, self.extract(self._key(file_path), data)
+
+    def extract_content(self, file_path, data):
+        """
+        Return the facts for data standing in for a file's content, or None.
+
+        Nothing is recorded, so the entries keep describing the file on
+        disk; used to check staged blobs (see gd_changes.staged_blobs).
+        """
+        try:
+            return self.extract(self._key(file_path), data)
+        except UnicodeDecodeError as e:
+            self.report_error(f"Error reading staged {file_path}: {e}")
+            return None
+
+    def report_error(self, message):
+        """Print a read error; tools whose stdout is machine-read send it elsewhere."""
+        print(message)
+
+    def get_hash(self, file_path):
+        """Return the content hash of a file, validating its entry first."""
+        if self.get_facts(file_path) is None:
+            return None
+        entry = self.entries.get(self._key(file_path))
+        return entry['hash'] if entry else None
+
+    def cached_facts(self, file_path):
+        """
+        Return facts for an unchanged file without reading it, or None.
+
+        Used by parallel scans to decide which files must be handed to
+        worker processes; those results come back through record().
+        """
+        key = self._key(file_path)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            return None
+
+        self.hits += 1
+        self._resolved[key] = entry['facts']
+        return entry['facts']
+
+    def record(self, file_path, mtime_ns, size, digest, facts):
+        """Store facts parsed outside the index (e.g. by a worker process)."""
+        key = self._key(file_path)
+        facts = self._record(key, mtime_ns, size, digest, facts)
+        self._resolved[key] = facts
+        return facts
+
+    def _record(self, key, mtime_ns, size, digest, facts):
+        entry = self.entries.get(key)
+        self._dirty = True
+        if entry and entry['hash'] == digest:
+            # Touched but unchanged: refresh the stat key, keep the facts
+            entry['mtime_ns'] = mtime_ns
+            entry['size'] = size
+            self.hits += 1
+            return entry['facts']
+
+        self.entries[key] = {
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'hash': digest,
+            'facts': facts
+        }
+        self.misses += 1
+        return facts
+
+    def forget(self, file_path):
+        """Drop the per-run memo for a file so the next lookup re-validates it."""
+        self._resolved.pop(self._key(file_path), None)
+
+    def prune(self):
+        """Drop entries for files not requested during this run."""
+        stale = [key for key in self.entries if key not in self._resolved]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def save(self):
+        """Atomically write the index back to disk if anything changed."""
+        if not self._dirty or self.path is None:
+            return
+
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'entries': self.entries}, f,
+                          separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing {path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        self._dirty = False
+
+    def summary(self):
+        """Return a one-line cache hit/miss summary."""
+        return f"Index cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Client side of the resident index daemon.
+
+Talks to gd_index_daemon over its Unix socket. It deliberately imports only
+the standard library: a status check or an editor-save hook query should
+not pay for loading the scanner, the file index and the parser that the
+daemon itself keeps resident.
+
+Usage:
+    python3 tools/gd_index_client.py status          # Print daemon stats
+    python3 tools/gd_index_client.py stop            # Ask the daemon to exit
+    python3 tools/gd_index_client.py start [--poll]  # Run the daemon in the foreground
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+
+# Cache directory (relative to project root), as in gd_file_index
+CACHE_DIR = ".tools_cache"
+
+# Socket location inside the cache directory
+SOCKET_FILENAME = "gd_index.sock"
+
+
+def socket_path(project_root):
+    """Return the Unix socket path for a project."""
+    return Path(project_root) / CACHE_DIR / SOCKET_FILENAME
+
+
+def query(project_root, request, timeout=2.0):
+    """Send one request to the daemon; return the response or None if unreachable."""
+    sock_path = socket_path(project_root)
+    if not sock_path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(sock_path))
+            client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            line = client.makefile('rb').readline()
+        return json.loads(line)
+    except (OSError, ValueError):
+        return None
+
+
+def control(project_root, command):
+    """Run the "status" or "stop" command against the daemon; return the exit code."""
+    response = query(project_root, {'cmd': 'stats' if command == 'status' else 'shutdown'})
+    if response is None:
+        print("Daemon is not running")
+        return 1
+    if command == 'status':
+        for key, value in response.items():
+            if key != 'ok':
+                print(f"{key}: {value}")
+    else:
+        print("Daemon stopping")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident GDScript index daemon')
+    parser.add_argument('command', choices=['start', 'status', 'stop'])
+    parser.add_argument('--poll', action='store_true',
+                        help='Use the stat-polling watcher even when inotify is available')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+
+    if args.command == 'start':
+        from gd_index_daemon import IndexDaemon
+        return IndexDaemon(project_root, force_poll=args.poll).serve()
+    return control(project_root, args.command)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Resident index daemon for the GDScript tooling.
+
+Keeps the class_name and const preload index for the gdtools.toml scan roots in
+memory, updates it incrementally when files are saved (inotify on Linux,
+stat polling elsewhere) and answers queries over a local Unix socket, so
+editor-save hooks and repeated CI steps skip interpreter-side re-scans.
+
+Usage:
+    python3 tools/gd_index_daemon.py start           # Run in the foreground
+    python3 tools/gd_index_daemon.py start --poll    # Force the polling watcher
+    python3 tools/gd_index_daemon.py status          # Print daemon stats
+    python3 tools/gd_index_daemon.py stop            # Ask the daemon to exit
+
+Clients (see gd_index_client.py, which loads none of the scanner modules):
+    python3 tools/gd_index_client.py status          # Same as status above, faster
+    python3 tools/find_shadowed_consts.py --daemon   # Query instead of scanning
+
+Protocol:
+    One JSON request per connection, terminated by a newline, answered by
+    one JSON line. Commands: "stats", "class_names", "facts" (with "path"),
+    "shadowed" (with optional "extra_classes", "since", "staged", "files"),
+    "shutdown".
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import time
+from pathlib import Path
+
+from gd_changes import select_files
+from gd_config import is_excluded, load_config
+from gd_file_index import FileIndex
+from gd_index_client import control, query, socket_path
+from gd_scanner import ScanResult, find_shadowed_preloads, iter_gd_files, scan_project
+
+# Seconds between stat sweeps when inotify is unavailable
+POLL_INTERVAL = 1.0
+
+# Seconds of quiet before the in-memory index is flushed to disk
+SAVE_DELAY = 5.0
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Recursive directory watcher on top of the raw inotify syscalls."""
+
+    def __init__(self, dirs):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify is only available on Linux")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._dirs_by_wd = {}
+        for dir_path in dirs:
+            self._watch_tree(Path(dir_path))
+
+    def _watch_tree(self, dir_path):
+        for root, _dirs, _files in os.walk(dir_path):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd >= 0:
+                self._dirs_by_wd[wd] = Path(root)
+
+    def read_changes(self):
+        """
+        Drain pending events.
+
+        Returns (changed_paths, overflowed). On overflow the caller must
+        fall back to a full rescan since events were dropped.
+        """
+        changed = set()
+        overflowed = False
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, name_len = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + name_len].rstrip(b'\0')
+                offset += name_len
+
+                if mask & IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                dir_path = self._dirs_by_wd.get(wd)
+                if dir_path is None:
+                    continue
+                if mask & IN_DELETE_SELF:
+                    del self._dirs_by_wd[wd]
+                    continue
+
+                path = dir_path / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # New subtree: watch it and treat its files as changed
+                        self._watch_tree(path)
+                        changed.update(p for p, _rel in iter_gd_files(path, ['']))
+                    else:
+                        overflowed = True
+                elif path.suffix == '.gd':
+                    changed.add(path)
+        return changed, overflowed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable watcher that diffs (mtime, size) snapshots of the tree."""
+
+    fd = None
+
+    def __init__(self, project_root, dirs, exclude=()):
+        self._project_root = Path(project_root)
+        self._dirs = dirs
+        self._exclude = exclude
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for gd_file, _rel in iter_gd_files(self._project_root, self._dirs, self._exclude):
+            try:
+                stat = gd_file.stat()
+            except OSError:
+                continue
+            snapshot[gd_file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read_changes(self):
+        snapshot = self._take_snapshot()
+        changed = {path for path, key in snapshot.items() if self._snapshot.get(path) != key}
+        changed.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changed, False
+
+    def close(self):
+        pass
+
+
+class IndexDaemon:
+    """In-memory index plus the socket server that answers queries."""
+
+    def __init__(self, project_root, force_poll=False):
+        self.project_root = Path(project_root).resolve()
+        self.config = load_config(self.project_root)
+        self.index = FileIndex.load(self.project_root)
+        self.facts_by_path = {}
+        self.started_at = time.time()
+        self.updates = 0
+        self.queries = 0
+        self._running = False
+        self._save_due = None
+        self._rescan()
+
+        script_dirs = self.config['scan_roots']
+        dirs = [self.project_root / d for d in script_dirs if (self.project_root / d).exists()]
+        self.watcher = None
+        if not force_poll:
+            try:
+                self.watcher = InotifyWatcher(dirs)
+            except OSError as e:
+                print(f"inotify unavailable ({e}), falling back to polling")
+        if self.watcher is None:
+            self.watcher = PollingWatcher(self.project_root, script_dirs, self.config['exclude'])
+
+    def _rescan(self):
+        scan = scan_project(self.project_root, self.config['scan_roots'], self.index,
+                            exclude=self.config['exclude'])
+        self.facts_by_path = dict(scan.files)
+        self.index.prune()
+        self.index.save()
+
+    def _scan_result(self):
+        scan = ScanResult()
+        scan.files = sorted(self.facts_by_path.items())
+        scan.class_names = {facts['class_name'] for facts in self.facts_by_path.values()
+                            if facts['class_name']}
+        return scan
+
+    def apply_changes(self, changed, overflowed):
+        """Fold watcher events into the in-memory index."""
+        if overflowed:
+            self.index = FileIndex.load(self.project_root)
+            self._rescan()
+        for path in changed:
+            rel_path = path.relative_to(self.project_root).as_posix()
+            if is_excluded(rel_path, self.config['exclude']):
+                continue
+            self.index.forget(path)
+            if path.exists():
+                facts = self.index.get_facts(path)
+                if facts is not None:
+                    self.facts_by_path[rel_path] = facts
+                    continue
+            self.facts_by_path.pop(rel_path, None)
+        if changed or overflowed:
+            self.updates += 1
+            self._save_due = time.monotonic() + SAVE_DELAY
+
+    def handle_request(self, request):
+        """Answer one decoded request dictionary."""
+        self.queries += 1
+        cmd = request.get('cmd')
+
+        if cmd == 'stats':
+            return {
+                'ok': True,
+                'files': len(self.facts_by_path),
+                'watcher': type(self.watcher).__name__,
+                'updates': self.updates,
+                'queries': self.queries,
+                'uptime_s': round(time.time() - self.started_at, 1)
+            }
+        if cmd == 'class_names':
+            return {'ok': True, 'class_names': sorted(self._scan_result().class_names)}
+        if cmd == 'facts':
+            facts = self.facts_by_path.get(request.get('path'))
+            return {'ok': facts is not None, 'facts': facts}
+        if cmd == 'shadowed':
+            return self._shadowed(request)
+        if cmd == 'shutdown':
+            self._running = False
+            return {'ok': True}
+        return {'ok': False, 'error': f"unknown command: {cmd}"}
+
+    def _shadowed(self, request):
+        scan = self._scan_result()
+        args = argparse.Namespace(
+            since=request.get('since'),
+            staged=request.get('staged', False),
+            files=request.get('files')
+        )
+        try:
+            selection = select_files(self.project_root, args, scan, self.config['scan_roots'])
+        except RuntimeError as e:
+            return {'ok': False, 'error': str(e)}
+        # After select_files, which swaps in staged content for --staged
+        global_classes = scan.class_names | set(request.get('extra_classes', []))
+
+        errors = {}
+        files_scanned = 0
+        for rel_path, facts in scan.files:
+            if selection is not None and rel_path not in selection:
+                continue
+            files_scanned += 1
+            shadowed = find_shadowed_preloads(facts, global_classes)
+            if shadowed:
+                errors[rel_path] = [
+                    {'line': p['line'], 'end_line': p['end_line'], 'const_name': p['const_name'],
+                     'preload_path': p['preload_path'], 'line_text': p['line_text']}
+                    for p in shadowed
+                ]
+
+        return {
+            'ok': True,
+            'class_count': len(scan.class_names),
+            'files_scanned': files_scanned,
+            'selected': None if selection is None else len(selection),
+            'errors': errors
+        }
+
+    def _serve_client(self, conn):
+        with conn:
+            conn.settimeout(2.0)
+            try:
+                line = conn.makefile('rb').readline()
+                response = self.handle_request(json.loads(line))
+            except (OSError, ValueError) as e:
+                response = {'ok': False, 'error': str(e)}
+            try:
+                conn.sendall(json.dumps(response).encode('utf-8') + b'\n')
+            except OSError:
+                pass
+
+    def serve(self):
+        """Run the event loop until a shutdown request or signal."""
+        sock_path = socket_path(self.project_root)
+        sock_path.parent.mkdir(parents=True, exist_ok=True)
+        if sock_path.exists():
+            if query(self.project_root, {'cmd': 'stats'}) is not None:
+                print(f"Daemon already running on {sock_path}")
+                return 1
+            sock_path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(sock_path))
+        server.listen()
+        server.setblocking(False)
+
+        selector = selectors.DefaultSelector()
+        selector.register(server, selectors.EVENT_READ, 'client')
+        if self.watcher.fd is not None:
+            selector.register(self.watcher.fd, selectors.EVENT_READ, 'watch')
+
+        print(f"Watching {len(self.facts_by_path)} files with {type(self.watcher).__name__}")
+        print(f"Listening on {sock_path}")
+
+        self._running = True
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, '_running', False))
+        next_poll = time.monotonic() + POLL_INTERVAL
+        try:
+            while self._running:
+                for key, _mask in selector.select(timeout=POLL_INTERVAL):
+                    if key.data == 'client':
+                        conn, _addr = server.accept()
+                        conn.setblocking(True)
+                        self._serve_client(conn)
+                    else:
+                        self.apply_changes(*self.watcher.read_changes())
+
+                now = time.monotonic()
+                if self.watcher.fd is None and now >= next_poll:
+                    self.apply_changes(*self.watcher.read_changes())
+                    next_poll = now + POLL_INTERVAL
+                if self._save_due is not None and now >= self._save_due:
+                    self.index.save()
+                    self._save_due = None
+        except KeyboardInterrupt:
+            pass
+        finally:
+            selector.close()
+            server.close()
+            self.watcher.close()
+            self.index.save()
+            try:
+                sock_path.unlink()
+            except OSError:
+                pass
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident GDScript index daemon')
+    parser.add_argument('command', choices=['start', 'status', 'stop'])
+    parser.add_argument('--poll', action='store_true',
+                        help='Use the stat-polling watcher even when inotify is available')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+
+    if args.command == 'start':
+        return IndexDaemon(project_root, force_poll=args.poll).serve()
+    return control(project_root, args.command)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
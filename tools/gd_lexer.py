@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+GDScript tokenizer.
+
+Turns GDScript source into a flat token stream with Python-style NEWLINE,
+INDENT and DEDENT tokens. Newlines inside (), [] and {} and after a
+backslash continuation are not emitted, so multi-line calls, preloads and
+dictionary literals read as one logical line. Comments are dropped.
+
+The scanner is a single compiled regex driven by re.finditer with one match
+per token, so the per-token cost stays in C as much as possible.
+
+Usage (from other tools):
+    from gd_lexer import tokenize, NAME
+
+    for token in tokenize(source):
+        if token.kind == NAME and token.value == "preload":
+            print(token.line)
+"""
+
+import re
+from collections import namedtuple
+
+Token = namedtuple('Token', ['kind', 'value', 'line'])
+
+# Building Tokens through tuple.__new__ skips the namedtuple __new__ wrapper,
+# which is a measurable share of tokenize time on a full-repo run
+_new_tuple = tuple.__new__
+
+# Token kinds
+NAME = 'NAME'
+NUMBER = 'NUMBER'
+STRING = 'STRING'
+OP = 'OP'
+ANNOTATION = 'ANNOTATION'
+NODE_PATH = 'NODE_PATH'
+NEWLINE = 'NEWLINE'
+INDENT = 'INDENT'
+DEDENT = 'DEDENT'
+EOF = 'EOF'
+
+KEYWORDS = {
+    "and", "as", "assert", "await", "break", "breakpoint", "class", "class_name",
+    "const", "continue", "elif", "else", "enum", "extends", "for", "func", "if",
+    "in", "is", "match", "not", "or", "pass", "preload", "return", "self",
+    "signal", "static", "super", "var", "void", "when", "while", "yield",
+    "true", "false", "null", "PI", "TAU", "INF", "NAN",
+}
+
+TAB_WIDTH = 4
+
+# Leading spaces/tabs are captured with every token so the scanner makes one
+# match per token; the captured width drives INDENT/DEDENT at line starts.
+_TOKEN_PATTERN = re.compile(r'''
+    (?P<ws>[ \t]*)
+    (?:
+        (?P<comment>\#[^\n]*)
+      | (?P<cont>\\\r?\n)
+      | (?P<newline>\r?\n)
+      | (?P<string>[r&^]?(?:"""(?:\\.|[^\\])*?"""|\'\'\'(?:\\.|[^\\])*?\'\'\'
+                           |"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'))
+      | (?P<number>0[xX][0-9a-fA-F_]+|0[bB][01_]+
+                   |(?:\d[\d_]*)?\.\d[\d_]*(?:[eE][-+]?\d+)?
+                   |\d[\d_]*(?:\.(?!\.)[\d_]*)?(?:[eE][-+]?\d+)?)
+      | (?P<annotation>@[^\W\d]\w*)
+      | (?P<node_path>\$(?:"[^"\n]*"|[\w/]+))
+      | (?P<name>[^\W\d]\w*)
+      | (?P<op>\*\*=|<<=|>>=|->|\.\.|:=|==|!=|<=|>=|\+=|-=|\*=|/=|%=|&=|\|=|\^=
+               |&&|\|\||<<|>>|\*\*|[-+*/%&|^~<>=!.,:;()\[\]{}?])
+      | (?P<other>.)
+    )
+''', re.VERBOSE | re.DOTALL)
+
+_GROUP_INDEX = _TOKEN_PATTERN.groupindex
+_COMMENT = _GROUP_INDEX['comment']
+_CONT = _GROUP_INDEX['cont']
+_NEWLINE = _GROUP_INDEX['newline']
+_KIND_BY_GROUP = {
+    _GROUP_INDEX['string']: STRING,
+    _GROUP_INDEX['number']: NUMBER,
+    _GROUP_INDEX['annotation']: ANNOTATION,
+    _GROUP_INDEX['node_path']: NODE_PATH,
+    _GROUP_INDEX['name']: NAME,
+    _GROUP_INDEX['op']: OP,
+    _GROUP_INDEX['other']: OP,
+}
+
+_OPENERS = {'(', '[', '{'}
+_CLOSERS = {')', ']', '}'}
+
+
+def _indent_width(whitespace):
+    return len(whitespace.expandtabs(TAB_WIDTH)) if '\t' in whitespace else len(whitespace)
+
+
+def tokenize(source):
+    """Yield Tokens for GDScript source, ending with DEDENTs and EOF."""
+    indents = [0]
+    depth = 0
+    line = 1
+    at_line_start = True
+    emitted_on_line = False
+
+    for match in _TOKEN_PATTERN.finditer(source):
+        group = match.lastindex
+        if group == _COMMENT:
+            continue
+        if group == _CONT:
+            line += 1
+            continue
+        if group == _NEWLINE:
+            if depth == 0:
+                if emitted_on_line:
+                    yield _new_tuple(Token, (NEWLINE, '\n', line))
+                    emitted_on_line = False
+                at_line_start = True
+            line += 1
+            continue
+
+        if at_line_start:
+            at_line_start = False
+            width = _indent_width(match.group(1))
+            if width > indents[-1]:
+                indents.append(width)
+                yield _new_tuple(Token, (INDENT, '', line))
+            else:
+                while width < indents[-1]:
+                    indents.pop()
+                    yield _new_tuple(Token, (DEDENT, '', line))
+
+        emitted_on_line = True
+        kind = _KIND_BY_GROUP[group]
+        value = match.group(group)
+        if kind == OP:
+            if value in _OPENERS:
+                depth += 1
+            elif value in _CLOSERS and depth > 0:
+                depth -= 1
+        elif kind == STRING:
+            yield _new_tuple(Token, (STRING, value, line))
+            line += value.count('\n')
+            continue
+        yield _new_tuple(Token, (kind, value, line))
+
+    if emitted_on_line:
+        yield _new_tuple(Token, (NEWLINE, '\n', line))
+    while len(indents) > 1:
+        indents.pop()
+        yield _new_tuple(Token, (DEDENT, '', line))
+    yield _new_tuple(Token, (EOF, '', line))
+
+
+def string_value(token_value):
+    """Return the contents of a STRING token without prefix and quotes."""
+    value = token_value.lstrip('r&^')
+    quote = 3 if value[:3] in ('"""', "'''") else 1
+    return value[quote:-quote]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Streaming machine-readable output for the tools.
+
+Adds --format text|ndjson|json|sarif to a tool. In the machine formats
+each finding is written to stdout the moment it is produced, so memory
+stays constant and a consumer sees results before the scan ends; the
+human-oriented progress lines (every other print) go to stderr instead.
+
+- ndjson: one {"type": "finding", ...} object per line, then one
+  {"type": "summary", ...} line
+- json:   {"tool": ..., "findings": [...], "summary": {...}}, written
+  incrementally
+- sarif:  a SARIF 2.1.0 log with one run, results streamed into it
+
+Every finding has the same stable fields: rule, level, path (project
+relative, POSIX), line, end_line, message, plus tool-specific extras.
+
+Exit codes for machine formats: 0 = clean, 1 = findings, 2 = error.
+
+Usage (from other tools):
+    from gd_output import add_format_argument, open_writer
+
+    add_format_argument(parser)
+    writer = open_writer(args.format, "find_shadowed_consts", RULES)
+    writer.emit("shadowed-const-preload", "scripts/x.gd", 12, "const Foo shadows ...")
+    sys.exit(writer.close({'files_scanned': 100}))
+"""
+
+import json
+import sys
+
+FORMATS = ["text", "ndjson", "json", "sarif"]
+
+EXIT_CLEAN = 0
+EXIT_FINDINGS = 1
+EXIT_ERROR = 2
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+_COMPACT = (',', ':')
+
+
+def add_format_argument(parser):
+    """Register --format."""
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='Output format; machine formats stream findings to stdout (default: text)')
+
+
+class FindingWriter:
+    """Streams findings in one machine format and tracks the exit code."""
+
+    def __init__(self, output_format, tool, rules, stream=None):
+        self.format = output_format
+        self.tool = tool
+        self.rules = rules
+        self.stream = stream if stream is not None else sys.stdout
+        self.count = 0
+        self._write_header()
+
+    def _write(self, text):
+        self.stream.write(text)
+
+    def _write_header(self):
+        if self.format == 'json':
+            self._write('{"tool":' + json.dumps(self.tool) + ',"findings":[')
+        elif self.format == 'sarif':
+            driver = {
+                'name': self.tool,
+                'rules': [{'id': rule_id, 'shortDescription': {'text': description}}
+                          for rule_id, description in self.rules.items()],
+            }
+            self._write('{"$schema":' + json.dumps(SARIF_SCHEMA) + ',"version":"2.1.0","runs":[{'
+                        '"tool":{"driver":' + json.dumps(driver, separators=_COMPACT) + '},'
+                        '"columnKind":"utf16CodeUnits","results":[')
+
+    def emit(self, rule, path, line, message, level='warning', end_line=None, fix=False, **extra):
+        """
+        Write one finding.
+
+        With fix=True the SARIF result carries a fix deleting lines
+        line..end_line, which is how the shadowed-const tools express
+        their edits.
+        """
+        end_line = end_line or line
+        if self.format == 'sarif':
+            result = {
+                'ruleId': rule,
+                'level': level,
+                'message': {'text': message},
+                'locations': [{'physicalLocation': {
+                    'artifactLocation': {'uri': path, 'uriBaseId': '%SRCROOT%'},
+                    'region': {'startLine': line, 'endLine': end_line},
+                }}],
+            }
+            if fix:
+                result['fixes'] = [{
+                    'description': {'text': 'Delete lines'},
+                    'artifactChanges': [{
+                        'artifactLocation': {'uri': path, 'uriBaseId': '%SRCROOT%'},
+                        'replacements': [{'deletedRegion': {'startLine': line, 'endLine': end_line + 1,
+                                                            'startColumn': 1, 'endColumn': 1}}],
+                    }],
+                }]
+            if extra:
+                result['properties'] = extra
+            text = json.dumps(result, separators=_COMPACT)
+        else:
+            finding = {'rule': rule, 'level': level, 'path': path, 'line': line,
+                       'end_line': end_line, 'message': message, **extra}
+            if self.format == 'ndjson':
+                finding = {'type': 'finding', **finding}
+            text = json.dumps(finding, separators=_COMPACT)
+
+        if self.format == 'ndjson':
+            self._write(text + "\n")
+        else:
+            self._write(("," if self.count else "") + text)
+        self.count += 1
+        self.stream.flush()
+
+    def close(self, summary=None, failed=False):
+        """Write the trailer and return the exit code (2 if failed, 1 if any finding)."""
+        summary = dict(summary or {}, findings=self.count)
+        if self.format == 'ndjson':
+            self._write(json.dumps({'type': 'summary', **summary}, separators=_COMPACT) + "\n")
+        elif self.format == 'json':
+            self._write('],"summary":' + json.dumps(summary, separators=_COMPACT) + "}\n")
+        elif self.format == 'sarif':
+            invocation = {'executionSuccessful': not failed, 'properties': summary}
+            self._write('],"invocations":[' + json.dumps(invocation, separators=_COMPACT) + ']}]}\n')
+        self.stream.flush()
+
+        if failed:
+            return EXIT_ERROR
+        return EXIT_FINDINGS if self.count else EXIT_CLEAN
+
+
+def open_writer(output_format, tool, rules):
+    """
+    Return a FindingWriter on stdout for a machine format (None for text).
+
+    From then on sys.stdout points at stderr, so the tool's progress lines
+    and any library error messages cannot corrupt the stream.
+    """
+    if output_format == 'text':
+        return None
+    writer = FindingWriter(output_format, tool, rules, sys.stdout)
+    sys.stdout = sys.stderr
+    return writer
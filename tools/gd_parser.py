@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Lightweight GDScript parser and on-disk syntax-tree cache.
+
+Parses the gd_lexer token stream into a compact per-file tree of
+declarations: class_name, extends, annotations, signals, enums, consts
+(with their preload path), member vars, functions (parameters, return
+type, line span and the calls made in the body) and inner classes.
+Function bodies are otherwise skipped, so a tree is a few KB at most.
+
+Unlike the line regexes used elsewhere in tools/, this handles typed
+consts (const X: Script = preload(...)), preloads split over several
+lines and class_name declared after extends or on the same line.
+
+Trees are cached as JSON under .tools_cache/, one file per content hash,
+and loaded lazily: the shared FileIndex answers "which hash is this file"
+from stat data, so a warm lookup never reads the source. The file indexes
+of the other tools go through the same cache when they extract a new or
+changed file (FileIndex.parse_tree), so a file parsed by one tool is only
+loaded, not parsed, by the next.
+
+Usage (from other tools):
+    from gd_parser import ParseCache
+
+    cache = ParseCache(project_root)
+    tree = cache.get_tree(project_root / "scripts/core/root.gd")
+    for func in tree['functions']:
+        print(func['name'], func['line'])
+    cache.save()
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from gd_lexer import (ANNOTATION, DEDENT, EOF, INDENT, NAME, NEWLINE, NUMBER, OP, STRING,
+                      string_value, tokenize)
+
+# Bump whenever the tree shape changes; old trees are simply never looked up
+TREE_VERSION = 1
+TREE_CACHE_DIR = f"gd_parse_v{TREE_VERSION}"
+
+
+def matching_bracket(tokens, i):
+    """Return the index of the bracket closing the one at i."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        token = tokens[j]
+        if token.kind != OP:
+            continue
+        if token.value in '([{':
+            depth += 1
+        elif token.value in ')]}':
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+
+def split_top_level(tokens, start, end):
+    """Split tokens[start:end] into index lists on commas not nested in brackets."""
+    parts = []
+    depth = 0
+    current = []
+    for j in range(start, end):
+        token = tokens[j]
+        if token.kind == OP and token.value in '([{':
+            depth += 1
+        elif token.kind == OP and token.value in ')]}':
+            depth -= 1
+        if depth == 0 and token.kind == OP and token.value == ',':
+            parts.append(current)
+            current = []
+        else:
+            current.append(j)
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_declaration(tokens, indices):
+    """
+    Split a declaration tail into (type_text, initializer_indices).
+
+    indices start right after the declared name: [':' type] [('=' | ':=') expr].
+    """
+    type_tokens = []
+    initializer = []
+    mode = None
+    depth = 0
+    for j in indices:
+        token = tokens[j]
+        if token.kind == OP and token.value in '([{':
+            depth += 1
+        elif token.kind == OP and token.value in ')]}':
+            depth -= 1
+        if mode is None and token.kind == OP and token.value == ':':
+            mode = 'type'
+            continue
+        if depth == 0 and mode != 'init' and token.kind == OP and token.value in ('=', ':='):
+            mode = 'init'
+            continue
+        if mode == 'type':
+            type_tokens.append(token.value)
+        elif mode == 'init':
+            initializer.append(j)
+    return ''.join(type_tokens), initializer
+
+
+def statement_end(tokens, i):
+    """Return the index of the NEWLINE (or EOF) ending the statement at i."""
+    while tokens[i].kind not in (NEWLINE, EOF):
+        i += 1
+    return i
+
+
+def block_end(tokens, i):
+    """Given i at an INDENT, return the index of its matching DEDENT."""
+    level = 0
+    for j in range(i, len(tokens)):
+        kind = tokens[j].kind
+        if kind == INDENT:
+            level += 1
+        elif kind == DEDENT:
+            level -= 1
+            if level == 0:
+                return j
+    return len(tokens) - 1
+
+
+def call_chain(tokens, j):
+    """Return the dotted callee text for the NAME at j (e.g. 'store.dispatch')."""
+    parts = [tokens[j].value]
+    k = j - 1
+    while k >= 1 and tokens[k].kind == OP and tokens[k].value == '.' and tokens[k - 1].kind == NAME:
+        parts.append(tokens[k - 1].value)
+        k -= 2
+    return '.'.join(reversed(parts))
+
+
+def _expression_text(tokens, indices):
+    text = []
+    for j in indices:
+        token = tokens[j]
+        if text and (token.kind in (NAME, NUMBER, STRING) and tokens[j - 1].kind in (NAME, NUMBER, STRING)):
+            text.append(' ')
+        text.append(token.value)
+    return ''.join(text)
+
+
+def _preload_path(tokens, initializer):
+    """Return the preload path if the initializer is exactly preload("...")."""
+    if (len(initializer) == 4 and tokens[initializer[0]].value == 'preload'
+            and tokens[initializer[2]].kind == STRING):
+        return string_value(tokens[initializer[2]].value)
+    return None
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def parse_block(self, i, end):
+        """Parse class-level statements in tokens[i:end] into a tree dict."""
+        tokens = self.tokens
+        tree = {
+            'class_name': None,
+            'extends': None,
+            'tool': False,
+            'icon': None,
+            'signals': [],
+            'enums': [],
+            'consts': [],
+            'vars': [],
+            'functions': [],
+            'classes': [],
+        }
+        annotations = []
+        is_static = False
+
+        while i < end:
+            token = tokens[i]
+            if token.kind in (NEWLINE, INDENT, DEDENT):
+                i += 1
+                continue
+            if token.kind == ANNOTATION:
+                i = self._annotation(i, tree, annotations)
+                continue
+            if token.kind != NAME:
+                i = statement_end(tokens, i) + 1
+                continue
+
+            keyword = token.value
+            if keyword == 'static':
+                is_static = True
+                i += 1
+                continue
+
+            if keyword == 'func' and tokens[i + 1].kind == NAME:
+                func, i = self._function(i, annotations, is_static)
+                if func is not None:
+                    tree['functions'].append(func)
+            elif keyword == 'class' and tokens[i + 1].kind == NAME:
+                inner, i = self._inner_class(i)
+                tree['classes'].append(inner)
+            else:
+                stop = statement_end(tokens, i)
+                if keyword == 'class_name':
+                    self._class_name(i, stop, tree)
+                elif keyword == 'extends':
+                    tree['extends'] = self._extends_target(i + 1, stop)
+                elif keyword == 'signal' and tokens[i + 1].kind == NAME:
+                    tree['signals'].append(self._signal(i, stop))
+                elif keyword == 'enum':
+                    tree['enums'].append(self._enum(i, stop))
+                elif keyword == 'const' and tokens[i + 1].kind == NAME:
+                    tree['consts'].append(self._const(i, stop))
+                elif keyword == 'var' and tokens[i + 1].kind == NAME:
+                    tree['vars'].append(self._var(i, stop, annotations, is_static))
+                i = stop + 1
+                # Skip property set/get blocks attached to the statement
+                if i < end and tokens[i].kind == INDENT:
+                    i = block_end(tokens, i) + 1
+
+            annotations = []
+            is_static = False
+
+        return tree
+
+    def _annotation(self, i, tree, annotations):
+        tokens = self.tokens
+        name = tokens[i].value
+        args = []
+        j = i + 1
+        if tokens[j].kind == OP and tokens[j].value == '(':
+            close = matching_bracket(tokens, j)
+            args = [_expression_text(tokens, part) for part in split_top_level(tokens, j + 1, close)]
+            j = close + 1
+
+        if name == '@tool':
+            tree['tool'] = True
+        elif name == '@icon' and args:
+            tree['icon'] = args[0].strip('"')
+        else:
+            annotations.append({'name': name, 'args': args})
+        return j
+
+    def _class_name(self, i, stop, tree):
+        tokens = self.tokens
+        if tokens[i + 1].kind == NAME:
+            tree['class_name'] = tokens[i + 1].value
+        for j in range(i + 2, stop):
+            if tokens[j].kind == NAME and tokens[j].value == 'extends':
+                tree['extends'] = self._extends_target(j + 1, stop)
+                break
+
+    def _extends_target(self, i, stop):
+        tokens = self.tokens
+        if i < stop and tokens[i].kind == STRING:
+            return string_value(tokens[i].value)
+        parts = []
+        for j in range(i, stop):
+            if tokens[j].kind == NAME and tokens[j].value == 'class_name':
+                break
+            parts.append(tokens[j].value)
+        return ''.join(parts) or None
+
+    def _signal(self, i, stop):
+        tokens = self.tokens
+        params = []
+        if i + 2 < stop and tokens[i + 2].value == '(':
+            close = matching_bracket(tokens, i + 2)
+            params = [tokens[part[0]].value for part in split_top_level(tokens, i + 3, close)
+                      if tokens[part[0]].kind == NAME]
+        return {'name': tokens[i + 1].value, 'line': tokens[i].line, 'params': params}
+
+    def _enum(self, i, stop):
+        tokens = self.tokens
+        name = tokens[i + 1].value if tokens[i + 1].kind == NAME else None
+        values = []
+        j = i + 1
+        while j < stop and tokens[j].value != '{':
+            j += 1
+        if j < stop:
+            close = matching_bracket(tokens, j)
+            values = [tokens[part[0]].value for part in split_top_level(tokens, j + 1, close)
+                      if part and tokens[part[0]].kind == NAME]
+        return {'name': name, 'line': tokens[i].line, 'values': values}
+
+    def _const(self, i, stop):
+        tokens = self.tokens
+        type_text, initializer = split_declaration(tokens, range(i + 2, stop))
+        return {
+            'name': tokens[i + 1].value,
+            'line': tokens[i].line,
+            'end_line': tokens[stop].line,
+            'type': type_text or None,
+            'preload': _preload_path(tokens, initializer),
+            'value': _expression_text(tokens, initializer),
+        }
+
+    def _var(self, i, stop, annotations, is_static):
+        tokens = self.tokens
+        tail_end = stop - 1 if tokens[stop - 1].value == ':' else stop
+        type_text, initializer = split_declaration(tokens, range(i + 2, tail_end))
+        return {
+            'name': tokens[i + 1].value,
+            'line': tokens[i].line,
+            'type': type_text or None,
+            'static': is_static,
+            'annotations': [a['name'] for a in annotations],
+            'preload': _preload_path(tokens, initializer),
+        }
+
+    def _function(self, i, annotations, is_static):
+        """Return (function, next i); function is None for a malformed or truncated header."""
+        tokens = self.tokens
+        # An unclosed '(' suppresses NEWLINEs, so the header can never run past stop
+        stop = statement_end(tokens, i)
+        open_paren = i + 2
+        while open_paren < stop and tokens[open_paren].value != '(':
+            open_paren += 1
+        close_paren = matching_bracket(tokens, open_paren) if open_paren < stop else stop
+        colon = close_paren + 1
+        while colon < stop and not (tokens[colon].kind == OP and tokens[colon].value == ':'):
+            colon += 1
+        if colon >= stop:
+            next_i = stop + 1
+            if next_i < len(tokens) and tokens[next_i].kind == INDENT:
+                next_i = block_end(tokens, next_i) + 1
+            return None, next_i
+
+        params = []
+        for part in split_top_level(tokens, open_paren + 1, close_paren):
+            names = [j for j in part if tokens[j].kind == NAME]
+            if not names:
+                continue
+            type_text, initializer = split_declaration(tokens, [j for j in part if j > names[0]])
+            params.append({
+                'name': tokens[names[0]].value,
+                'type': type_text or None,
+                'default': _expression_text(tokens, initializer) if initializer else None,
+            })
+
+        return_tokens = [t.value for t in tokens[close_paren + 1:colon] if t.value != '->']
+
+        body_start = colon + 1
+        if tokens[body_start].kind == NEWLINE and tokens[body_start + 1].kind == INDENT:
+            body_end = block_end(tokens, body_start + 1)
+        else:
+            body_end = statement_end(tokens, body_start)
+
+        calls = []
+        for j in range(body_start, body_end):
+            if (tokens[j].kind == NAME and tokens[j + 1].kind == OP and tokens[j + 1].value == '('
+                    and tokens[j].value not in ('func', 'if', 'elif', 'while', 'for', 'match', 'return', 'not')):
+                calls.append([call_chain(tokens, j), tokens[j].line])
+
+        func = {
+            'name': tokens[i + 1].value,
+            'line': tokens[i].line,
+            'end_line': tokens[max(body_end - 1, body_start)].line,
+            'static': is_static,
+            'annotations': [a['name'] for a in annotations],
+            'params': params,
+            'return_type': ''.join(return_tokens) or None,
+            'calls': calls,
+        }
+        return func, body_end + 1
+
+    def _inner_class(self, i):
+        tokens = self.tokens
+        stop = statement_end(tokens, i)
+        extends = None
+        for j in range(i + 2, stop):
+            if tokens[j].kind == NAME and tokens[j].value == 'extends':
+                extends = self._extends_target(j + 1, stop - 1 if tokens[stop - 1].value == ':' else stop)
+                break
+
+        if stop + 1 < len(tokens) and tokens[stop + 1].kind == INDENT:
+            end = block_end(tokens, stop + 1)
+            inner = self.parse_block(stop + 2, end)
+            next_i = end + 1
+        else:
+            inner = self.parse_block(stop, stop)
+            next_i = stop + 1
+
+        inner['class_name'] = tokens[i + 1].value
+        inner['extends'] = inner['extends'] or extends
+        inner['line'] = tokens[i].line
+        return inner, next_i
+
+
+def parse_source(source):
+    """Parse GDScript source into a compact declaration tree."""
+    return parse_tokens(list(tokenize(source)))
+
+
+def parse_tokens(tokens):
+    """Parse an already tokenized source, for callers that also walk the tokens."""
+    return _Parser(tokens).parse_block(0, len(tokens))
+
+
+def iter_functions(tree):
+    """Yield (owner_class_or_None, function) for a tree and its inner classes."""
+    for func in tree['functions']:
+        yield None, func
+    for inner in tree['classes']:
+        for _owner, func in iter_functions(inner):
+            yield inner['class_name'], func
+
+
+class ParseCache:
+    """Content-hash keyed, lazily loaded cache of parsed trees."""
+
+    def __init__(self, project_root, index=None):
+        # Imported here so gd_file_index can import this module lazily in turn
+        from gd_file_index import CACHE_DIR, hash_bytes
+
+        self.project_root = Path(project_root)
+        self._index = index
+        self.cache_dir = self.project_root / CACHE_DIR / TREE_CACHE_DIR
+        self._hash_bytes = hash_bytes
+        self._trees = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def index(self):
+        """The FileIndex mapping paths to content hashes, loaded on first use."""
+        if self._index is None:
+            from gd_file_index import FileIndex
+            self._index = FileIndex.load(self.project_root)
+        return self._index
+
+    def _tree_path(self, digest):
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def _load(self, digest):
+        try:
+            with open(self._tree_path(digest), 'r', encoding='utf-8') as f:
+                tree = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.hits += 1
+        return tree
+
+    def get_tree(self, file_path):
+        """Return the parsed tree for a file, or None if it cannot be read."""
+        file_path = Path(file_path)
+        digest = self.index.get_hash(file_path)
+        if digest is None:
+            return None
+        if digest in self._trees:
+            return self._trees[digest]
+
+        tree = self._load(digest)
+        if tree is None:
+            tree = self._parse_and_store(file_path)
+        self._trees[digest] = tree
+        return tree
+
+    def tree_for(self, data, tokens=None):
+        """
+        Return the tree for a file's bytes, parsing only if none is stored.
+
+        Used by FileIndex.extract() and the tools' own extract() overrides,
+        so a file one tool parsed is a tree load for every other tool.
+        tokens, when the caller already tokenized the source, are parsed
+        instead of re-tokenizing data.
+        """
+        digest = self._hash_bytes(data)
+        tree = self._load(digest)
+        if tree is None:
+            tree = parse_tokens(tokens) if tokens is not None else parse_source(data.decode('utf-8'))
+            self.misses += 1
+            self._store(digest, tree)
+        return tree
+
+    def _parse_and_store(self, file_path):
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            tree = parse_source(data.decode('utf-8'))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {file_path}: {e}")
+            return None
+        self.misses += 1
+
+        # The file may have changed since the index hashed it; store under the real hash
+        self._store(self._hash_bytes(data), tree)
+        return tree
+
+    def _store(self, digest, tree):
+        tree_path = self._tree_path(digest)
+        tree_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tree_path.parent, suffix='.tmp')
+        try:
+            # dumps() runs the C encoder; dump() to a file streams through the Python one
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(tree, separators=(',', ':')))
+            os.replace(tmp_path, tree_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def save(self):
+        """Persist the underlying file index (trees are written as they are parsed)."""
+        if self._index is not None:
+            self._index.save()
+
+    def summary(self):
+        return f"Parse cache: {self.hits} hits, {self.misses} misses"
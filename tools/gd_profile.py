@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Shared profiling and phase-timing instrumentation for the tools.
+
+A tool registers --profile on its parser and starts a profiler; library
+code (the scanner, the file index) reports into whichever profiler is
+active, so phases nest naturally: a tool's "scan" phase contains the
+index's "read" and "parse" phases. When --profile is not given, the
+active profiler is a no-op whose phase() returns a shared null context.
+
+With --profile, the run writes a JSON metrics file with per-phase wall
+and CPU time, files and bytes read, cache hits and misses and the slowest
+files, a collapsed-stack .folded file of the phases (flamegraph.pl /
+speedscope input), and appends one line per run to
+.tools_cache/profile/history.ndjson for trend tracking.
+--profile-cprofile additionally dumps a cProfile .prof file.
+
+Usage (from other tools):
+    from gd_profile import add_profile_arguments, start_profiler
+
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = start_profiler("find_shadowed_consts", project_root, args)
+    with profiler.phase("scan"):
+        ...
+    profiler.finish(index)
+
+Usage (command line):
+    python3 tools/find_shadowed_consts.py --profile
+    python3 tools/fix_shadowed_consts.py --dry-run --profile metrics.json --profile-top 20
+    python3 tools/fast_lint_scan.py --profile --profile-cprofile lint.prof
+"""
+
+import contextlib
+import heapq
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROFILE_DIR = ".tools_cache/profile"
+HISTORY_FILENAME = "history.ndjson"
+DEFAULT_TOP = 10
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class NullProfiler:
+    """Profiler used when --profile is off; every hook is a no-op."""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_CONTEXT
+
+    def count(self, name, amount=1):
+        pass
+
+    def file_read(self, nbytes):
+        pass
+
+    def file_done(self, path, seconds):
+        pass
+
+    def finish(self, index=None):
+        pass
+
+
+class Profiler:
+    """Collects nested phase timings, counters and the slowest files of one run."""
+
+    enabled = True
+
+    def __init__(self, tool, project_root, output_path, top=DEFAULT_TOP, cprofile_path=None):
+        self.tool = tool
+        self.project_root = Path(project_root)
+        self.output_path = Path(output_path)
+        self.top = top
+        self.cprofile_path = cprofile_path
+        self.phases = {}         # "outer/inner" -> [wall, cpu, calls]
+        self.counters = {'files_read': 0, 'bytes_read': 0}
+        self._stack = []
+        self._slowest = []       # min-heap of (seconds, path)
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._cprofile = None
+        if cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a block; nested phases are keyed by their full path."""
+        self._stack.append(name)
+        entry = self.phases.setdefault("/".join(self._stack), [0.0, 0.0, 0])
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            entry[0] += time.perf_counter() - wall
+            entry[1] += time.process_time() - cpu
+            entry[2] += 1
+            self._stack.pop()
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def file_read(self, nbytes):
+        """Record one file actually read from disk (cache hits read nothing)."""
+        self.counters['files_read'] += 1
+        self.counters['bytes_read'] += nbytes
+
+    def file_done(self, path, seconds):
+        """Record the time spent on one file for the slowest-files list."""
+        item = (seconds, str(path))
+        if len(self._slowest) < self.top:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def _relative(self, path):
+        try:
+            return Path(path).relative_to(self.project_root).as_posix()
+        except ValueError:
+            return path
+
+    def metrics(self, index=None):
+        """Return the metrics document for this run."""
+        if index is not None:
+            self.counters['cache_hits'] = index.hits
+            self.counters['cache_misses'] = index.misses
+        return {
+            'tool': self.tool,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': _git_revision(self.project_root),
+            'argv': sys.argv[1:],
+            'python': sys.version.split()[0],
+            'wall_s': time.perf_counter() - self._start_wall,
+            'cpu_s': time.process_time() - self._start_cpu,
+            'phases': {key: {'wall_s': wall, 'cpu_s': cpu, 'calls': calls}
+                       for key, (wall, cpu, calls) in self.phases.items()},
+            'counters': dict(self.counters),
+            'slowest_files': [{'path': self._relative(path), 'seconds': seconds}
+                              for seconds, path in sorted(self._slowest, reverse=True)],
+        }
+
+    def finish(self, index=None):
+        """Write the metrics, folded stacks, history line and cProfile dump; print a summary."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        metrics = self.metrics(index)
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self.output_path, 'w', encoding='utf-8') as f:
+                json.dump(metrics, f, indent=1)
+            with open(self.output_path.with_suffix('.folded'), 'w', encoding='utf-8') as f:
+                for key, (wall, _cpu, _calls) in sorted(self.phases.items()):
+                    # Collapsed stacks carry self time, so subtract direct children
+                    children = sum(v[0] for k, v in self.phases.items()
+                                   if k.startswith(key + "/") and "/" not in k[len(key) + 1:])
+                    f.write(f"{self.tool};{key.replace('/', ';')} {max(0, int((wall - children) * 1e6))}\n")
+            history_path = self.project_root / PROFILE_DIR / HISTORY_FILENAME
+            history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(history_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(metrics, separators=(',', ':')) + "\n")
+            if self._cprofile is not None:
+                Path(self.cprofile_path).parent.mkdir(parents=True, exist_ok=True)
+                self._cprofile.dump_stats(self.cprofile_path)
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            return
+
+        print_summary(metrics)
+        print(f"Profile written to {self.output_path}")
+        if self._cprofile is not None:
+            print(f"cProfile dump written to {self.cprofile_path}")
+
+
+_active = NullProfiler()
+
+
+def active():
+    """Return the profiler library code should report into."""
+    return _active
+
+
+def deactivate():
+    """Disable profiling in this process (used by pool workers after fork)."""
+    global _active
+    _active = NullProfiler()
+    sys.setprofile(None)
+
+
+def add_profile_arguments(parser):
+    """Register --profile, --profile-top and --profile-cprofile."""
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='PATH',
+                        help=f'Write phase timings and counters as JSON (default: {PROFILE_DIR}/<tool>.json)')
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP, metavar='N',
+                        help=f'Slowest files to record with --profile (default: {DEFAULT_TOP})')
+    parser.add_argument('--profile-cprofile', metavar='PATH',
+                        help='Also dump cProfile stats (pstats format) to PATH')
+
+
+def start_profiler(tool, project_root, args):
+    """Activate and return a Profiler if --profile was given, else the no-op profiler."""
+    global _active
+    if args.profile is None and not args.profile_cprofile:
+        _active = NullProfiler()
+        return _active
+    output_path = args.profile or Path(project_root) / PROFILE_DIR / f"{tool}.json"
+    _active = Profiler(tool, project_root, output_path, top=args.profile_top,
+                       cprofile_path=args.profile_cprofile)
+    return _active
+
+
+def print_summary(metrics):
+    print()
+    print("=== Profile ===")
+    print(f"Wall: {metrics['wall_s']:.3f}s  CPU: {metrics['cpu_s']:.3f}s")
+    for key, phase in metrics['phases'].items():
+        indent = "  " * key.count("/")
+        name = key.rsplit("/", 1)[-1]
+        print(f"  {indent}{name:<{24 - len(indent)}} {phase['wall_s']:8.3f}s wall "
+              f"{phase['cpu_s']:8.3f}s cpu  ({phase['calls']} calls)")
+    counters = metrics['counters']
+    print(f"Files read: {counters['files_read']} ({counters['bytes_read'] / 1024:.0f} KB)")
+    if 'cache_hits' in counters:
+        print(f"Cache: {counters['cache_hits']} hits, {counters['cache_misses']} misses")
+    extra = {k: v for k, v in counters.items()
+             if k not in ('files_read', 'bytes_read', 'cache_hits', 'cache_misses')}
+    for name, value in sorted(extra.items()):
+        print(f"{name}: {value}")
+    if metrics['slowest_files']:
+        print("Slowest files:")
+        for entry in metrics['slowest_files']:
+            print(f"  {entry['seconds'] * 1000:8.2f} ms  {entry['path']}")
+
+
+def _git_revision(project_root):
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=project_root, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
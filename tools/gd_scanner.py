@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Single-pass GDScript project scanner.
+
+Walks the script directories once, reads each .gd file once as bytes and
+extracts both its class_name declaration and its const preloads. Decisions
+that depend on the global class set (such as shadowing) are resolved
+afterwards against the collected facts, so no file is read twice.
+
+Usage (from other tools):
+    from gd_scanner import scan_project, find_shadowed_preloads
+
+    scan = scan_project(project_root, ["scripts/", "tests/"], index=index, jobs=8)
+    for rel_path, facts in scan.files:
+        errors = find_shadowed_preloads(facts, scan.class_names)
+
+With jobs > 1 the per-file parsing is spread over a process pool in chunks.
+Results are merged back in walk order, so output is identical to a serial run.
+index_files() does the same for any FileIndex subclass, through its
+extract() hook.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from gd_config import is_excluded
+from gd_file_index import hash_bytes, parse_gd_facts
+from gd_profile import active, deactivate
+
+# Below this many files a process pool costs more than it saves
+MIN_FILES_FOR_POOL = 64
+
+# Chunks handed to each worker per round; more chunks balance uneven files
+CHUNKS_PER_JOB = 4
+
+
+class ScanResult:
+    """Facts gathered by a single walk over the script directories."""
+
+    def __init__(self):
+        self.files = []          # [(rel_path, facts)] in walk order
+        self.class_names = set()
+        self.missing_dirs = []
+
+
+class ProjectTree:
+    """Every file found by one walk over the whole project, shared by several checks."""
+
+    def __init__(self, project_root):
+        self.project_root = Path(project_root)
+        self.files = []          # [(path, rel_path)] in walk order
+
+    def gd_files(self, script_dirs):
+        """Return [(gd_file, rel_path)] under script_dirs, in iter_gd_files order."""
+        prefixes = [script_dir.rstrip('/') + '/' for script_dir in script_dirs]
+        return [(path, rel_path) for prefix in prefixes
+                for path, rel_path in self.files
+                if rel_path.endswith('.gd') and rel_path.startswith(prefix)]
+
+
+def walk_tree(project_root, excluded_dirs, exclude=()):
+    """Walk the project once, skipping excluded_dirs names and exclude patterns."""
+    tree = ProjectTree(project_root)
+    for root, dirs, files in os.walk(project_root):
+        rel_root = Path(root).relative_to(project_root).as_posix()
+        prefix = "" if rel_root == "." else rel_root + "/"
+        dirs[:] = sorted(d for d in dirs
+                         if d not in excluded_dirs and not is_excluded(prefix + d, exclude))
+        for name in sorted(files):
+            if not is_excluded(prefix + name, exclude):
+                tree.files.append((Path(root) / name, prefix + name))
+    return tree
+
+
+def iter_gd_files(project_root, script_dirs, exclude=()):
+    """Yield (gd_file, rel_path) for every .gd under script_dirs, sorted per directory."""
+    project_root = Path(project_root)
+    for script_dir in script_dirs:
+        dir_path = project_root / script_dir
+        for root, dirs, files in os.walk(dir_path):
+            if exclude:
+                prefix = Path(root).relative_to(project_root).as_posix() + "/"
+                dirs[:] = [d for d in dirs if not is_excluded(prefix + d, exclude)]
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.gd'):
+                    gd_file = Path(root) / name
+                    rel_path = gd_file.relative_to(project_root).as_posix()
+                    if not is_excluded(rel_path, exclude):
+                        yield gd_file, rel_path
+
+
+def read_facts(gd_file, index=None):
+    """Return the facts for one file, going through the index when given."""
+    if index is not None:
+        return index.get_facts(gd_file)
+
+    profiler = active()
+    try:
+        with profiler.phase("read"):
+            with open(gd_file, 'rb') as f:
+                data = f.read()
+        profiler.file_read(len(data))
+        with profiler.phase("parse"):
+            return parse_gd_facts(data.decode('utf-8'))
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {gd_file}: {e}")
+        return None
+
+
+def default_jobs():
+    """Default worker count for --jobs: one per CPU."""
+    return os.cpu_count() or 1
+
+
+def iter_parallel_map(func, items, jobs):
+    """
+    Map func over items with a process pool, yielding results in input order.
+
+    Results are yielded as they complete (in order), so callers can stream
+    output before the whole batch is done. Falls back to a plain serial
+    map when jobs <= 1 or the input is too small to amortise worker startup.
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) < MIN_FILES_FOR_POOL:
+        for item in items:
+            yield func(item)
+        return
+
+    chunksize = max(1, len(items) // (jobs * CHUNKS_PER_JOB))
+    # Workers forked from a profiled run must not profile themselves
+    with ProcessPoolExecutor(max_workers=jobs, initializer=deactivate) as executor:
+        yield from executor.map(func, items, chunksize=chunksize)
+
+
+def parallel_map(func, items, jobs):
+    """Map func over items with a process pool, preserving input order."""
+    return list(iter_parallel_map(func, items, jobs))
+
+
+def parse_file(gd_file):
+    """
+    Worker: read and parse one file.
+
+    Returns (mtime_ns, size, digest, facts, error, seconds); error is a
+    message string when the file could not be read, and the other fields
+    are None. seconds is the worker time spent on the file.
+    """
+    start = time.perf_counter()
+    try:
+        stat = os.stat(gd_file)
+        with open(gd_file, 'rb') as f:
+            data = f.read()
+        facts = parse_gd_facts(data.decode('utf-8'))
+    except (OSError, UnicodeDecodeError) as e:
+        return None, None, None, None, f"Error reading {gd_file}: {e}", None
+    return stat.st_mtime_ns, stat.st_size, hash_bytes(data), facts, None, time.perf_counter() - start
+
+
+def _parse_in_pool(gd_files, index, jobs):
+    """Parse gd_files across a pool; return facts in input order."""
+    profiler = active()
+    facts_by_position = []
+    for gd_file, parsed in zip(gd_files, parallel_map(parse_file, gd_files, jobs)):
+        mtime_ns, size, digest, facts, error, seconds = parsed
+        if error:
+            print(error)
+            facts_by_position.append(None)
+            continue
+        profiler.file_read(size)
+        profiler.file_done(gd_file, seconds)
+        if index is not None:
+            facts_by_position.append(index.record(gd_file, mtime_ns, size, digest, facts))
+        else:
+            facts_by_position.append(facts)
+    return facts_by_position
+
+
+def extract_file(job):
+    """
+    Worker: read one file and extract its facts through an index class.
+
+    job is (index_class, project_root, index_path, file_path); index_path
+    only tells the worker whether the index is disk-backed (and so shares
+    parsed trees), the entries are not loaded. Returns the same tuple as
+    parse_file(), with facts from index_class.extract().
+    """
+    index_class, project_root, index_path, file_path = job
+    start = time.perf_counter()
+    try:
+        stat, data, facts = index_class(project_root, path=index_path).read_and_extract(file_path)
+    except (OSError, ValueError) as e:
+        return None, None, None, None, f"Error reading {file_path}: {e}", None
+    return stat.st_mtime_ns, stat.st_size, hash_bytes(data), facts, None, time.perf_counter() - start
+
+
+def index_files(files, index, jobs):
+    """
+    Return index facts for files in input order.
+
+    Hits are answered in-process; misses go through index.get_facts(), or
+    with jobs > 1 through index.extract() across a pool, and are recorded
+    back into the index. None marks a file that could not be read.
+    """
+    all_facts = [index.cached_facts(file_path) for file_path in files]
+    pending = [i for i, facts in enumerate(all_facts) if facts is None]
+    if jobs <= 1:
+        for i in pending:
+            all_facts[i] = index.get_facts(files[i])
+        return all_facts
+
+    profiler = active()
+    work = [(type(index), index.project_root, index.path, files[i]) for i in pending]
+    for i, parsed in zip(pending, parallel_map(extract_file, work, jobs)):
+        mtime_ns, size, digest, facts, error, seconds = parsed
+        if error:
+            index.report_error(error)
+            continue
+        profiler.file_read(size)
+        profiler.file_done(files[i], seconds)
+        all_facts[i] = index.record(files[i], mtime_ns, size, digest, facts)
+    return all_facts
+
+
+def scan_project(project_root, script_dirs, index=None, jobs=1, exclude=(), tree=None):
+    """
+    Walk script_dirs once and collect per-file facts plus the class_name set.
+
+    With a ProjectTree from walk_tree() the walk is skipped and its file
+    list is used instead, so several checks can share one walk.
+    """
+    project_root = Path(project_root)
+    result = ScanResult()
+
+    for script_dir in script_dirs:
+        if not (project_root / script_dir).exists():
+            result.missing_dirs.append(project_root / script_dir)
+
+    profiler = active()
+    with profiler.phase("walk"):
+        if tree is not None:
+            walked = tree.gd_files(script_dirs)
+        else:
+            walked = list(iter_gd_files(project_root, script_dirs, exclude))
+
+    if jobs > 1:
+        # Only index misses are shipped to workers; hits are answered in-process
+        all_facts = [index.cached_facts(gd_file) if index is not None else None
+                     for gd_file, _ in walked]
+        pending = [i for i, facts in enumerate(all_facts) if facts is None]
+        with profiler.phase("pool"):
+            parsed = _parse_in_pool([walked[i][0] for i in pending], index, jobs)
+        for i, facts in zip(pending, parsed):
+            all_facts[i] = facts
+    elif profiler.enabled:
+        all_facts = []
+        for gd_file, _ in walked:
+            start = time.perf_counter()
+            all_facts.append(read_facts(gd_file, index))
+            profiler.file_done(gd_file, time.perf_counter() - start)
+    else:
+        all_facts = [read_facts(gd_file, index) for gd_file, _ in walked]
+
+    for (gd_file, rel_path), facts in zip(walked, all_facts):
+        if facts is None:
+            continue
+        result.files.append((rel_path, facts))
+        if facts['class_name']:
+            result.class_names.add(facts['class_name'])
+
+    return result
+
+
+def find_shadowed_preloads(facts, global_classes, scripts_only=False):
+    """
+    Return the const preloads in facts whose name shadows a global class.
+
+    With scripts_only, only preloads of .gd scripts are reported, which
+    keeps .tres/.tscn resource instances that happen to share a name.
+    """
+    shadowed = []
+    for preload in facts['const_preloads']:
+        if preload['const_name'] not in global_classes:
+            continue
+        if scripts_only and not (preload['preload_path'] or '').endswith('.gd'):
+            continue
+        shadowed.append(preload)
+    return shadowed
+
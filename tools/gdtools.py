@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the Python tools.
+
+Each subcommand maps to the module that implements it, and that module is
+only imported when its subcommand runs, so `gdtools select-tests` loads
+the lexer but not the lint rules behind `gdtools lint`, and the parser
+only when a changed script's previous class_name must be looked up.
+Subcommand options are the tool's own (`gdtools lint --help`).
+
+`gdtools check` runs the shadowed-const, lint and resource-reference
+checks in one process over one walk of the project, sharing the file
+index and the class_name set, so a pre-commit hook pays interpreter
+startup and the tree walk once instead of once per tool.
+
+Shared settings (scan roots, excludes, known globals) are read from
+gdtools.toml at the project root; see gd_config.py.
+
+Usage:
+    python3 tools/gdtools.py --help
+    python3 tools/gdtools.py check                      # All checks, exit 1 on findings
+    python3 tools/gdtools.py check --only shadowed,resource-refs
+    python3 tools/gdtools.py check --format sarif > checks.sarif
+    python3 tools/gdtools.py find-shadowed --staged
+    python3 tools/gdtools.py lint --fail-on-warnings
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+# Subcommand -> (module, description); "check" is implemented here
+COMMANDS = {
+    "check": (None, "Run shadowed, lint and resource-refs over one shared walk"),
+    "find-shadowed": ("find_shadowed_consts", "Find const preloads that shadow a global class_name"),
+    "fix-shadowed": ("fix_shadowed_consts", "Remove shadowed const preloads"),
+    "lint": ("fast_lint_scan", "Headless GDScript lint scan"),
+    "hot-path": ("hot_path_lint", "Find expensive patterns in per-frame code"),
+    "resource-refs": ("validate_resource_refs", "Validate .tres/.tscn ext_resource paths and UIDs"),
+    "deps": ("res_dep_graph", "Query the res:// dependency graph"),
+    "preload-cost": ("preload_cost_report", "Rank eager preload chains by load-time cost"),
+    "scene-cost": ("scene_profile", "Predict .tscn instantiation cost, diff it between revisions"),
+    "state-dispatch": ("state_dispatch_report", "Map store actions to reducers and readers, find per-frame dispatches"),
+    "assets": ("asset_budget", "Audit asset metadata and import settings against budgets"),
+    "dedup": ("dedup_resources", "Find duplicate .tres files and [sub_resource] blocks"),
+    "restore-preloads": ("restore_tres_preloads", "Restore const preloads of .tres resources"),
+    "select-tests": ("select_tests", "Select the GUT tests affected by a change"),
+    "slow-tests": ("slow_test_report", "Rank GUT tests by the real time they wait on"),
+    "test": ("run_gut_sharded", "Run the GUT suite in parallel shards"),
+    "daemon": ("gd_index_client", "Resident class_name index daemon"),
+    "warnings": ("check_gdscript_warnings", "Check GDScript warning settings"),
+    "bench-tools": ("bench_tools", "Benchmark the tools on synthetic projects"),
+    "bench-ecs": ("bench_ecs", "Benchmark the ECS and track regressions"),
+    "gen-synthetic": ("gen_synthetic_project", "Generate a synthetic project"),
+}
+
+CHECKS = ["shadowed", "lint", "resource-refs"]
+
+
+def print_usage():
+    print("Usage: gdtools <command> [options]")
+    print()
+    print("Commands:")
+    for name, (_module, description) in COMMANDS.items():
+        print(f"  {name:<17} {description}")
+    print()
+    print("Run 'gdtools <command> --help' for a command's options.")
+
+
+def run_tool(command, argv):
+    """Import the command's module and run its main() with argv."""
+    module = importlib.import_module(COMMANDS[command][0])
+    sys.argv = [f"gdtools {command}", *argv]
+    return module.main()
+
+
+def run_check(argv):
+    """Run the selected checks over one walk; return the exit code."""
+    from gd_output import add_format_argument
+    from gd_profile import add_profile_arguments
+
+    parser = argparse.ArgumentParser(prog="gdtools check",
+                                     description='Run several checks over one shared walk')
+    parser.add_argument('--only', help=f'Comma-separated subset of: {",".join(CHECKS)}')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for parsing and linting (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the persistent indexes and re-read every file')
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args(argv)
+
+    selected = CHECKS
+    if args.only:
+        unknown = set(args.only.split(',')) - set(CHECKS)
+        if unknown:
+            parser.error(f"unknown checks: {', '.join(sorted(unknown))}")
+        selected = [name for name in CHECKS if name in args.only.split(',')]
+
+    from gd_config import load_config
+    from gd_output import EXIT_CLEAN, EXIT_FINDINGS, open_writer
+    from gd_profile import start_profiler
+    from gd_scanner import default_jobs, walk_tree
+    from res_dep_graph import EXCLUDED_DIRS
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    jobs = args.jobs or default_jobs()
+    writer = open_writer(args.format, "gdtools check", {
+        "shadowed-const-preload": "const preload shadows a global class_name",
+        "resource-ref": "broken or mismatched ext_resource reference",
+        "resource-ref-consistency": "referrers disagree on a path or UID",
+    })
+    profiler = start_profiler("gdtools_check", project_root, args)
+
+    print("=== gdtools check ===")
+    print(f"Checks: {', '.join(selected)}")
+    print()
+
+    with profiler.phase("walk"):
+        tree = walk_tree(project_root, EXCLUDED_DIRS, config['exclude'])
+    print(f"Walked {len(tree.files)} files")
+
+    counts = {}
+
+    def report(check, rule, path, line, message, level='warning', **extra):
+        counts[check] += 1
+        if writer is not None:
+            writer.emit(rule, path, line, message, level=level, **extra)
+        else:
+            print(f"   {path}:{line} - {message}")
+
+    scan = None
+    index = None
+    if "shadowed" in selected or "lint" in selected:
+        from gd_file_index import FileIndex
+        from gd_scanner import scan_project
+
+        with profiler.phase("index_load"):
+            index = None if args.no_cache else FileIndex.load(project_root)
+        with profiler.phase("scan"):
+            scan = scan_project(project_root, config['scan_roots'], index, jobs=jobs, tree=tree)
+        if index is not None:
+            with profiler.phase("index_save"):
+                index.prune()
+                index.save()
+        print(f"Found {len(scan.class_names)} global classes in {len(scan.files)} scripts")
+    print()
+
+    if "shadowed" in selected:
+        from find_shadowed_consts import shadowed_const_errors
+
+        print("🔍 shadowed")
+        counts["shadowed"] = 0
+        global_classes = scan.class_names | config['known_globals']
+        with profiler.phase("shadowed"):
+            for rel_path, facts in scan.files:
+                for error in shadowed_const_errors(facts, global_classes):
+                    report("shadowed", "shadowed-const-preload", rel_path, error['line'],
+                           f"const {error['const_name']} shadows the global class_name {error['const_name']}",
+                           end_line=error['end_line'], fix=True, const_name=error['const_name'],
+                           preload_path=error['preload_path'], text=error['line_text'])
+
+    if "lint" in selected:
+        from fast_lint_scan import lint_files
+
+        print("🔍 lint")
+        counts["lint"] = 0
+        gd_files = [path for path, _rel in tree.gd_files(config['scan_roots'])]
+        warnings = lint_files(project_root, gd_files, scan.class_names, jobs)
+        for warning_type, entries in warnings.items():
+            for res_path, line, message in entries:
+                report("lint", warning_type.lower(), res_path[len("res://"):], line, message)
+
+    if "resource-refs" in selected:
+        from validate_resource_refs import ResourceRefIndex, check_resources
+
+        print("🔍 resource-refs")
+        counts["resource-refs"] = 0
+        with profiler.phase("resource_index_load"):
+            ref_index = (ResourceRefIndex(project_root) if args.no_cache
+                         else ResourceRefIndex.load(project_root))
+        with profiler.phase("resource_refs"):
+            errors, warnings, _unverified, _facts = check_resources(project_root, ref_index, tree)
+        with profiler.phase("resource_index_save"):
+            ref_index.prune()
+            ref_index.save()
+        for findings, rule, level in ((errors, "resource-ref", 'error'),
+                                      (warnings, "resource-ref-consistency", 'warning')):
+            for res_path in sorted(findings):
+                for finding in sorted(findings[res_path], key=lambda f: f['line']):
+                    report("resource-refs", rule, res_path[len("res://"):], finding['line'],
+                           finding['message'], level=level)
+
+    print()
+    print("=== Summary ===")
+    for check in selected:
+        icon = "✅" if not counts[check] else "❌"
+        print(f"{icon} {check}: {counts[check]} findings")
+    profiler.finish(index)
+
+    if writer is not None:
+        return writer.close({'files_walked': len(tree.files), **counts})
+    return EXIT_FINDINGS if any(counts.values()) else EXIT_CLEAN
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0 if argv else 2
+
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"Error: unknown command '{command}'")
+        print()
+        print_usage()
+        return 2
+    if command == "check":
+        return run_check(argv[1:])
+    return run_tool(command, argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic Godot project for benchmarking the Python tools.
+
+Produces a tree shaped like this project: scripts/core/<area>/ with
+s_/c_/m_/rs_/u_ prefixed scripts, tests/unit/<area>/test_*.gd, .tres
+resources and .tscn scenes with [ext_resource] headers, and a minimal
+project.godot. Scripts carry class_name declarations, const preloads
+(a configurable share of which shadow a global class), exported vars,
+signals, enums and functions with typed params and locals, some unused,
+so every scanner has realistic work to do.
+
+The output is deterministic for a given --seed.
+
+Usage:
+    python3 tools/gen_synthetic_project.py /tmp/synth --files 10000
+    python3 tools/gen_synthetic_project.py /tmp/synth --files 200000 --class-name-density 0.5
+    python3 tools/gen_synthetic_project.py /tmp/synth --files 20000 --preload-fanout 4 --tres-ratio 0.3
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Areas and prefixes modeled on scripts/core
+AREAS = ["ecs/systems", "ecs/components", "managers", "resources", "state", "utils", "ui",
+         "gameplay", "input", "scene_management", "events", "qb"]
+PREFIX_BY_AREA = {
+    "ecs/systems": ("s_", "S_", "BaseECSSystem"),
+    "ecs/components": ("c_", "C_", "BaseECSComponent"),
+    "managers": ("m_", "M_", "Node"),
+    "resources": ("rs_", "RS_", "Resource"),
+    "state": ("u_", "U_", "RefCounted"),
+    "utils": ("u_", "U_", "RefCounted"),
+    "ui": ("ui_", "UI_", "Control"),
+    "gameplay": ("inter_", "Inter_", "Node3D"),
+    "input": ("u_", "U_", "RefCounted"),
+    "scene_management": ("m_", "M_", "Node"),
+    "events": ("evn_", "Evn_", "RefCounted"),
+    "qb": ("qb_", "QB_", "Resource"),
+}
+WORDS = ["movement", "jump", "gravity", "floating", "camera", "spawn", "health", "damage",
+         "audio", "input", "rebind", "vcam", "scene", "transition", "save", "load", "state",
+         "store", "action", "reducer", "selector", "entity", "query", "event", "hud", "menu",
+         "pause", "settings", "locale", "display", "rule", "condition", "effect", "landing",
+         "surface", "align", "rotate", "particle", "footstep", "checkpoint", "door", "trigger"]
+TYPES = ["int", "float", "bool", "String", "StringName", "Vector3", "Vector2", "Dictionary", "Array"]
+DEFAULTS = {"int": "0", "float": "0.0", "bool": "false", "String": '""', "StringName": '&""',
+            "Vector3": "Vector3.ZERO", "Vector2": "Vector2.ZERO", "Dictionary": "{}", "Array": "[]"}
+SYSTEM_NAMES = ["BaseECSSystem", "BaseECSComponent", "Node", "Resource", "RefCounted"]
+
+
+def make_name(rng, index):
+    return f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{index}"
+
+
+def plan_scripts(rng, file_count, test_ratio, class_name_density):
+    """Return script descriptors: rel path, class_name (or None), base class."""
+    scripts = []
+    test_count = int(file_count * test_ratio)
+    for index in range(file_count - test_count):
+        area = AREAS[index % len(AREAS)]
+        file_prefix, class_prefix, base = PREFIX_BY_AREA[area]
+        stem = make_name(rng, index)
+        class_name = None
+        if rng.random() < class_name_density:
+            class_name = class_prefix + "".join(part.capitalize() for part in stem.split("_"))
+        scripts.append({
+            'path': f"scripts/core/{area}/{file_prefix}{stem}.gd",
+            'class_name': class_name,
+            'base': base,
+        })
+    for index in range(test_count):
+        area = AREAS[index % len(AREAS)].split("/")[-1]
+        scripts.append({
+            'path': f"tests/unit/{area}/test_{make_name(rng, index)}.gd",
+            'class_name': None,
+            'base': "BaseTest",
+        })
+    return scripts
+
+
+def render_script(rng, script, targets, fanout, shadow_rate):
+    """Return GDScript source for one descriptor."""
+    lines = []
+    if script['base'] in SYSTEM_NAMES and rng.random() < 0.3:
+        lines.append('@icon("res://assets/core/editor_icons/icn_system.svg")')
+    lines.append(f"extends {script['base']}")
+    if script['class_name']:
+        lines.append(f"class_name {script['class_name']}")
+    lines.append("")
+    lines.append(f"## Synthetic {script['path'].rsplit('/', 1)[-1][:-3]} for tool benchmarks")
+    lines.append("")
+
+    preload_count = min(len(targets), max(0, int(rng.expovariate(1.0 / fanout)) if fanout else 0))
+    for target in rng.sample(targets, preload_count):
+        if target['class_name'] and rng.random() < shadow_rate:
+            const_name = target['class_name']
+        else:
+            const_name = target['path'].rsplit('/', 1)[-1][:-3].upper()
+        if rng.random() < 0.1:
+            lines.append(f"const {const_name} = preload(")
+            lines.append(f"\t\"res://{target['path']}\"")
+            lines.append(")")
+        else:
+            lines.append(f"const {const_name} := preload(\"res://{target['path']}\")")
+    lines.append(f"const TYPE_NAME := StringName(\"{script['path'].rsplit('/', 1)[-1][:-3]}\")")
+    lines.append("")
+
+    if rng.random() < 0.4:
+        lines.append(f"signal {rng.choice(WORDS)}_changed(value: int)")
+    if rng.random() < 0.3:
+        lines.append("enum Mode { IDLE, ACTIVE, DISABLED }")
+    for _ in range(rng.randint(1, 5)):
+        var_type = rng.choice(TYPES)
+        lines.append(f"@export var {rng.choice(WORDS)}_{rng.choice(WORDS)}: {var_type} = {DEFAULTS[var_type]}")
+    lines.append("var _cache: Dictionary = {}")
+    lines.append("")
+
+    for func_index in range(rng.randint(3, 12)):
+        params = [(f"{rng.choice(WORDS)}_{p}", rng.choice(TYPES)) for p in range(rng.randint(0, 3))]
+        signature = ", ".join(f"{name}: {var_type}" for name, var_type in params)
+        lines.append("")
+        lines.append(f"func {rng.choice(WORDS)}_{func_index}({signature}) -> void:")
+        used = params[:max(0, len(params) - (1 if rng.random() < 0.2 else 0))]
+        for name, var_type in used:
+            lines.append(f"\t_cache[\"{name}\"] = {name}")
+        for local in range(rng.randint(1, 6)):
+            var_type = rng.choice(TYPES)
+            lines.append(f"\tvar local_{local}: {var_type} = {DEFAULTS[var_type]}")
+            if rng.random() < 0.9:
+                lines.append(f"\tif _cache.has(\"local_{local}\"):")
+                lines.append(f"\t\t_cache[\"local_{local}\"] = local_{local}")
+        if rng.random() < 0.3:
+            lines.append("\tfor i in range(10):")
+            lines.append("\t\t_cache[i] = i * 2")
+        if not used and rng.random() < 0.5:
+            lines.append("\tpass")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_resource(rng, index, scripts_with_class):
+    target = rng.choice(scripts_with_class)
+    return (
+        f"[gd_resource type=\"Resource\" script_class=\"{target['class_name']}\" format=3 "
+        f"uid=\"uid://synthres{index:08d}\"]\n\n"
+        f"[ext_resource type=\"Script\" path=\"res://{target['path']}\" id=\"1_script\"]\n\n"
+        "[resource]\n"
+        "script = ExtResource(\"1_script\")\n"
+        f"value = {rng.randint(0, 1000)}\n"
+    )
+
+
+def render_scene(rng, index, scripts, resources):
+    lines = [f"[gd_scene load_steps=4 format=3 uid=\"uid://synthscn{index:08d}\"]", ""]
+    refs = rng.sample(scripts, min(len(scripts), rng.randint(1, 6)))
+    for ref_index, script in enumerate(refs, 1):
+        lines.append(f"[ext_resource type=\"Script\" path=\"res://{script['path']}\" id=\"{ref_index}_s\"]")
+    if resources:
+        res_index = rng.randrange(len(resources))
+        lines.append(f"[ext_resource type=\"Resource\" uid=\"uid://synthres{res_index:08d}\" "
+                     f"path=\"res://{resources[res_index]}\" id=\"r_1\"]")
+    lines.append("")
+    lines.append("[node name=\"Root\" type=\"Node3D\"]")
+    for ref_index in range(1, len(refs) + 1):
+        lines.append("")
+        lines.append(f"[node name=\"Child{ref_index}\" type=\"Node\" parent=\".\"]")
+        lines.append(f"script = ExtResource(\"{ref_index}_s\")")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def generate(output, file_count, seed=0, class_name_density=0.5, preload_fanout=2.4,
+             shadow_rate=0.02, test_ratio=0.4, tres_ratio=0.2, tscn_ratio=0.07):
+    """Write a synthetic project to output; return (gd files, total bytes)."""
+    rng = random.Random(seed)
+    output = Path(output)
+    scripts = plan_scripts(rng, file_count, test_ratio, class_name_density)
+    non_tests = [s for s in scripts if s['path'].startswith("scripts/")]
+    with_class = [s for s in non_tests if s['class_name']] or non_tests
+
+    created_dirs = set()
+
+    def write(rel_path, text):
+        path = output / rel_path
+        if path.parent not in created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(path.parent)
+        data = text.encode('utf-8')
+        path.write_bytes(data)
+        return len(data)
+
+    total_bytes = write("project.godot",
+                        "config_version=5\n\n[application]\n\nconfig/name=\"Synthetic\"\n")
+    for script in scripts:
+        total_bytes += write(script['path'], render_script(rng, script, non_tests, preload_fanout, shadow_rate))
+
+    resources = []
+    for index in range(int(file_count * tres_ratio)):
+        rel_path = f"resources/core/{AREAS[index % len(AREAS)].split('/')[-1]}/cfg_{make_name(rng, index)}.tres"
+        total_bytes += write(rel_path, render_resource(rng, index, with_class))
+        resources.append(rel_path)
+    for index in range(int(file_count * tscn_ratio)):
+        rel_path = f"scenes/core/{AREAS[index % len(AREAS)].split('/')[-1]}/{make_name(rng, index)}.tscn"
+        total_bytes += write(rel_path, render_scene(rng, index, non_tests, resources))
+
+    return len(scripts), total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Godot project for tool benchmarks')
+    parser.add_argument('output', help='Output directory (replaced if it exists)')
+    parser.add_argument('--files', type=int, default=10000,
+                        help='Number of .gd files (default: 10000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--class-name-density', type=float, default=0.5,
+                        help='Share of non-test scripts with class_name (default: 0.5)')
+    parser.add_argument('--preload-fanout', type=float, default=2.4,
+                        help='Mean const preloads per script (default: 2.4)')
+    parser.add_argument('--shadow-rate', type=float, default=0.02,
+                        help='Share of preloads whose const shadows a class_name (default: 0.02)')
+    parser.add_argument('--test-ratio', type=float, default=0.4,
+                        help='Share of .gd files under tests/ (default: 0.4)')
+    parser.add_argument('--tres-ratio', type=float, default=0.2,
+                        help='.tres files per .gd file (default: 0.2)')
+    parser.add_argument('--tscn-ratio', type=float, default=0.07,
+                        help='.tscn files per .gd file (default: 0.07)')
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    if output.exists():
+        if not (output / "project.godot").exists():
+            print(f"❌ {output} exists and is not a generated project; refusing to replace it")
+            sys.exit(1)
+        shutil.rmtree(output)
+
+    start = time.perf_counter()
+    gd_files, total_bytes = generate(
+        output, args.files, seed=args.seed, class_name_density=args.class_name_density,
+        preload_fanout=args.preload_fanout, shadow_rate=args.shadow_rate,
+        test_ratio=args.test_ratio, tres_ratio=args.tres_ratio, tscn_ratio=args.tscn_ratio,
+    )
+    print(f"✅ Generated {gd_files} scripts ({total_bytes / (1024 * 1024):.1f} MB) in "
+          f"{time.perf_counter() - start:.1f}s at {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Static hot-path performance linter for per-frame GDScript code.
+
+_process, _physics_process and process_tick (the ECS system tick) run every
+frame. Starting from those roots, and following calls to helpers defined in
+the same file (and same inner class), this reports patterns that cost time
+on every frame:
+
+- load() / ResourceLoader.load()
+- find_child() / find_children()
+- get_node()/get_node_or_null()/has_node() with a string path, and $Path
+- duplicate(true) / duplicate_deep()
+- Dictionary and Array literals (a fresh allocation per call)
+- String formatting ("%" on a string, .format(), string concatenation)
+- The same get_component(X) lookup on the same receiver repeated in one
+  function (u_entity_query.gd resolves it through a Dictionary each time)
+
+Each finding gets a severity score: the rule's weight times (1 + loop
+depth), where the loop depth counts the for/while loops around the
+pattern plus those around the helper calls that lead to it. Scores of 8
+and up are errors, 4 and up warnings, the rest notes.
+
+This is a tool-side rule family next to the engine warnings catalogued in
+check_gdscript_warnings.py; HOT_PATH_RULES below has the same shape.
+Per-file results are cached in .tools_cache/hot_path_index.json, and only
+files that mention a frame root are tokenized at all.
+
+Usage:
+    python3 tools/hot_path_lint.py                    # Whole project
+    python3 tools/hot_path_lint.py --staged           # Only files staged for commit
+    python3 tools/hot_path_lint.py --since origin/main --fail-at 8
+    python3 tools/hot_path_lint.py --min-score 4      # Hide low-score findings
+    python3 tools/hot_path_lint.py --format sarif > hot_path.sarif
+"""
+
+import argparse
+import sys
+from collections import Counter, deque
+from pathlib import Path
+
+from gd_changes import (add_change_arguments, describe_change_mode, git_changed_paths, is_change_mode,
+                        staged_blobs)
+from gd_config import load_config
+from gd_file_index import FileIndex
+from gd_lexer import DEDENT, INDENT, NAME, NEWLINE, NODE_PATH, OP, STRING, tokenize
+from gd_output import EXIT_CLEAN, EXIT_ERROR, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_parser import block_end, call_chain, iter_functions, matching_bracket, parse_tokens, statement_end
+from gd_profile import add_profile_arguments, start_profiler
+from gd_scanner import default_jobs, index_files, iter_gd_files
+
+# Functions the engine (or the ECS manager) calls once per frame
+FRAME_ROOTS = ("_process", "_physics_process", "process_tick")
+
+# Rule catalogue, shaped like check_gdscript_warnings.GDSCRIPT_WARNINGS
+HOT_PATH_RULES = {
+    "hot_path_load": {
+        "description": "load() resolves a resource path on every frame",
+        "weight": 8,
+        "default": True,
+        "category": "Performance"
+    },
+    "hot_path_find_child": {
+        "description": "find_child()/find_children() walk the subtree on every frame",
+        "weight": 8,
+        "default": True,
+        "category": "Performance"
+    },
+    "hot_path_deep_duplicate": {
+        "description": "duplicate(true) deep-copies a container on every frame",
+        "weight": 6,
+        "default": True,
+        "category": "Performance"
+    },
+    "hot_path_get_node": {
+        "description": "get_node()/$Path resolves a string path on every frame",
+        "weight": 3,
+        "default": True,
+        "category": "Performance"
+    },
+    "hot_path_repeated_component": {
+        "description": "The same get_component() lookup repeated in one function",
+        "weight": 3,
+        "default": True,
+        "category": "Performance"
+    },
+    "hot_path_collection_alloc": {
+        "description": "Dictionary or Array literal allocated on every call",
+        "weight": 2,
+        "default": True,
+        "category": "Performance"
+    },
+    "hot_path_string_format": {
+        "description": "String formatting or concatenation on every frame",
+        "weight": 2,
+        "default": True,
+        "category": "Performance"
+    },
+}
+
+SCORE_ERROR = 8
+SCORE_WARNING = 4
+
+NODE_LOOKUPS = {"get_node", "get_node_or_null", "has_node"}
+LOOP_KEYWORDS = {"for", "while"}
+
+# A '[' or '{' after one of these starts a literal rather than a subscript
+LITERAL_AFTER_NAMES = {"return", "in", "and", "or", "not", "await"}
+
+
+def find_functions(tokens, tree):
+    """Return {(owner, name): {'line', 'start', 'end'}} with the body token range of each function."""
+    owner_by_line = {func['line']: owner for owner, func in iter_functions(tree)}
+    functions = {}
+    for i, token in enumerate(tokens):
+        if token.kind != NAME or token.value != 'func' or token.line not in owner_by_line:
+            continue
+        if tokens[i + 1].kind != NAME or tokens[i + 2].value != '(':
+            continue
+        colon = matching_bracket(tokens, i + 2) + 1
+        while colon < len(tokens) - 1 and not (tokens[colon].kind == OP and tokens[colon].value == ':'):
+            colon += 1
+        if tokens[colon + 1].kind == NEWLINE and tokens[colon + 2].kind == INDENT:
+            start, end = colon + 3, block_end(tokens, colon + 2)
+        else:
+            start, end = colon + 1, statement_end(tokens, colon + 1)
+        functions.setdefault((owner_by_line[token.line], tokens[i + 1].value),
+                             {'line': token.line, 'start': start, 'end': end})
+    return functions
+
+
+def _is_literal_start(tokens, i):
+    prev = tokens[i - 1]
+    if prev.kind == OP:
+        return prev.value not in (')', ']', '}')
+    if prev.kind in (NEWLINE, INDENT, DEDENT):
+        return True
+    return prev.kind == NAME and prev.value in LITERAL_AFTER_NAMES
+
+
+def scan_body(tokens, start, end):
+    """
+    Return (findings, calls) for one function body.
+
+    findings are (rule, line, loop_depth, message); calls are
+    (callee, line, loop_depth) for bare and self. calls.
+    """
+    findings = []
+    calls = []
+    seen = set()
+    components = set()
+    loops = []               # one bool per open block: is it a loop body?
+    statement_is_loop = False
+    statement_is_const = False
+    literal_end = -1
+
+    def report(rule, line, message):
+        if (rule, line) not in seen:
+            seen.add((rule, line))
+            findings.append((rule, line, sum(loops), message))
+
+    for i in range(start, end):
+        token = tokens[i]
+        kind, value = token.kind, token.value
+
+        if kind == INDENT:
+            loops.append(statement_is_loop)
+            continue
+        if kind == DEDENT:
+            if loops:
+                loops.pop()
+            continue
+        if kind == NEWLINE:
+            continue
+        if tokens[i - 1].kind in (NEWLINE, INDENT, DEDENT) or i == start:
+            statement_is_loop = kind == NAME and value in LOOP_KEYWORDS
+            statement_is_const = kind == NAME and value == 'const'
+
+        if kind == NODE_PATH:
+            report("hot_path_get_node", token.line, f"{value} node lookup on every call; cache it in an @onready var")
+        elif kind == STRING:
+            following = tokens[i + 1]
+            if following.kind == OP and following.value == '%':
+                report("hot_path_string_format", token.line, "String formatted with % on every call")
+            elif (following.kind == OP and following.value == '+') or (
+                    tokens[i - 1].kind == OP and tokens[i - 1].value == '+'):
+                report("hot_path_string_format", token.line, "String concatenation on every call")
+        elif kind == OP and value in ('[', '{') and i > literal_end and not statement_is_const:
+            if _is_literal_start(tokens, i):
+                literal_end = matching_bracket(tokens, i)
+                # The arguments of "..." % [...] belong to its hot_path_string_format finding
+                is_format_args = (tokens[i - 1].kind == OP and tokens[i - 1].value == '%'
+                                  and tokens[i - 2].kind == STRING)
+                if not is_format_args:
+                    what = "Dictionary" if value == '{' else "Array"
+                    report("hot_path_collection_alloc", token.line, f"{what} literal allocated on every call")
+        elif kind == NAME and tokens[i + 1].kind == OP and tokens[i + 1].value == '(':
+            is_method = tokens[i - 1].kind == OP and tokens[i - 1].value == '.'
+            receiver = tokens[i - 2].value if is_method else None
+            first_arg = tokens[i + 2]
+            if value == 'load' and (not is_method or receiver == 'ResourceLoader'):
+                report("hot_path_load", token.line, "load() on every call; preload it or cache the resource")
+            elif value in ('find_child', 'find_children'):
+                report("hot_path_find_child", token.line, f"{value}() walks the subtree on every call")
+            elif value in NODE_LOOKUPS and first_arg.kind == STRING:
+                report("hot_path_get_node", token.line,
+                       f"{value}({first_arg.value}) resolves a string path on every call")
+            elif (value == 'duplicate' and first_arg.value == 'true') or value == 'duplicate_deep':
+                report("hot_path_deep_duplicate", token.line,
+                       f"{value}({first_arg.value if value == 'duplicate' else ''}) deep-copies on every call")
+            elif value == 'format' and is_method:
+                report("hot_path_string_format", token.line, "String.format() on every call")
+            elif value == 'get_component' and is_method:
+                close = matching_bracket(tokens, i + 1)
+                key = (call_chain(tokens, i), "".join(tokens[j].value for j in range(i + 2, close)))
+                if key in components:
+                    report("hot_path_repeated_component", token.line,
+                           f"{key[0]}({key[1]}) already looked up in this function; reuse the result")
+                components.add(key)
+            if not is_method or receiver == 'self':
+                calls.append((value, token.line, sum(loops)))
+
+    return findings, calls
+
+
+def analyze_source(text, parse=parse_tokens):
+    """
+    Return {'roots': [...], 'findings': [...]} for one file's per-frame code.
+
+    parse turns the token list into a gd_parser tree; HotPathIndex passes
+    one that goes through the shared ParseCache.
+    """
+    if not any(root in text for root in FRAME_ROOTS):
+        return {'roots': [], 'findings': []}
+
+    tokens = list(tokenize(text))
+    functions = find_functions(tokens, parse(tokens))
+
+    def label(key):
+        return f"{key[0]}.{key[1]}" if key[0] else key[1]
+
+    # Breadth-first from the roots: shortest helper chain, loops along it summed
+    reached = {}
+    queue = deque()
+    for key in functions:
+        if key[1] in FRAME_ROOTS:
+            reached[key] = ([label(key)], 0)
+            queue.append(key)
+    roots = [label(key) for key in reached]
+
+    local = {}
+    while queue:
+        key = queue.popleft()
+        via, depth = reached[key]
+        local[key] = scan_body(tokens, functions[key]['start'], functions[key]['end'])
+        for callee, _line, call_depth in local[key][1]:
+            target = (key[0], callee)
+            if target in functions and target not in reached:
+                reached[target] = (via + [label(target)], depth + call_depth)
+                queue.append(target)
+
+    findings = []
+    for key, (via, depth) in reached.items():
+        for rule, line, loop_depth, message in local[key][0]:
+            total_depth = depth + loop_depth
+            findings.append({
+                'rule': rule,
+                'line': line,
+                'function': label(key),
+                'via': via,
+                'loop_depth': total_depth,
+                'score': HOT_PATH_RULES[rule]['weight'] * (1 + total_depth),
+                'message': message,
+            })
+    findings.sort(key=lambda f: (f['line'], f['rule']))
+    return {'roots': roots, 'findings': findings}
+
+
+class HotPathIndex(FileIndex):
+    """FileIndex variant whose entries hold each file's hot-path analysis."""
+
+    version = 2
+    filename = "hot_path_index.json"
+    extract_phase = "analyze"
+
+    def extract(self, key, data):
+        return analyze_source(data.decode('utf-8'), lambda tokens: self.parse_tree(data, tokens))
+
+
+def severity(score):
+    if score >= SCORE_ERROR:
+        return 'error'
+    if score >= SCORE_WARNING:
+        return 'warning'
+    return 'note'
+
+
+def print_report(findings_by_file, root_count, files_scanned, cache_summary):
+    total_score = sum(f['score'] for findings in findings_by_file.values() for f in findings)
+    by_rule = Counter(f['rule'] for findings in findings_by_file.values() for f in findings)
+
+    ranked = sorted(findings_by_file.items(), key=lambda item: (-sum(f['score'] for f in item[1]), item[0]))
+    if ranked:
+        print("=== Hot Path Findings ===")
+        print()
+    for rel_path, findings in ranked:
+        print(f"📄 {rel_path} (score {sum(f['score'] for f in findings)})")
+        for finding in findings:
+            print(f"   [{finding['score']:3d}] Line {finding['line']:4d}: {finding['message']}")
+            print(f"               {finding['rule']} in {' → '.join(finding['via'])}")
+        print()
+
+    print("=== Summary ===")
+    print(f"Files scanned: {files_scanned}")
+    print(f"Per-frame roots: {root_count}")
+    for rule in HOT_PATH_RULES:
+        if by_rule[rule]:
+            print(f"{rule}: {by_rule[rule]}")
+    print(f"Total findings: {sum(by_rule.values())} (score {total_score})")
+    print(cache_summary)
+    print()
+    if not by_rule:
+        print("✅ No hot-path patterns found!")
+    else:
+        print("💡 Fix: hoist lookups into @onready vars or members, preload resources, reuse containers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find expensive patterns in per-frame GDScript code')
+    parser.add_argument('--min-score', type=int, default=1,
+                        help='Only report findings scoring at least this much (default: 1)')
+    parser.add_argument('--fail-at', type=int, metavar='SCORE',
+                        help='Exit with status 1 if any finding scores at least SCORE')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-analyze every file')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for cold files (default: CPU count, 1 = serial)')
+    add_change_arguments(parser)
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    writer = open_writer(args.format, "hot_path_lint",
+                         {rule: info['description'] for rule, info in HOT_PATH_RULES.items()})
+    profiler = start_profiler("hot_path_lint", project_root, args)
+
+    print("=== Hot Path Performance Lint ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    with profiler.phase("index_load"):
+        index = HotPathIndex(project_root) if args.no_cache else HotPathIndex.load(project_root)
+    with profiler.phase("walk"):
+        walked = list(iter_gd_files(project_root, config['scan_roots'], config['exclude']))
+
+    if is_change_mode(args):
+        try:
+            _base_rev, changed = git_changed_paths(project_root, args)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+        changed = set(changed)
+        walked = [(gd_file, rel_path) for gd_file, rel_path in walked if rel_path in changed]
+        print(f"Mode: {describe_change_mode(args)} ({len(walked)} files to check)")
+        print()
+
+    with profiler.phase("analyze"):
+        if args.staged:
+            # Check what will be committed, not the working tree
+            try:
+                blobs = staged_blobs(project_root, [rel_path for _gd_file, rel_path in walked])
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+            all_facts = [index.extract_content(gd_file, blobs[rel_path]) if rel_path in blobs else None
+                         for gd_file, rel_path in walked]
+        else:
+            all_facts = index_files([gd_file for gd_file, _rel in walked], index, args.jobs)
+    with profiler.phase("index_save"):
+        # A partial walk must not drop the entries of files it skipped
+        if not is_change_mode(args):
+            index.prune()
+        index.save()
+
+    findings_by_file = {}
+    root_count = 0
+    worst = 0
+    for (_gd_file, rel_path), facts in zip(walked, all_facts):
+        if facts is None:
+            continue
+        root_count += len(facts['roots'])
+        findings = [f for f in facts['findings'] if f['score'] >= args.min_score]
+        if not findings:
+            continue
+        worst = max(worst, max(f['score'] for f in findings))
+        if writer is None:
+            findings_by_file[rel_path] = findings
+            continue
+        for finding in findings:
+            writer.emit(finding['rule'], rel_path, finding['line'], finding['message'],
+                        level=severity(finding['score']), score=finding['score'],
+                        function=finding['function'], via=finding['via'],
+                        loop_depth=finding['loop_depth'])
+
+    failed = args.fail_at is not None and worst >= args.fail_at
+    if writer is not None:
+        profiler.finish(index)
+        exit_code = writer.close({'files_scanned': len(walked), 'roots': root_count})
+        # Findings alone do not fail the run in any format; only --fail-at does
+        if exit_code == EXIT_FINDINGS and not failed:
+            exit_code = EXIT_CLEAN
+        sys.exit(exit_code)
+
+    with profiler.phase("report"):
+        print_report(findings_by_file, root_count, len(walked), index.summary())
+    profiler.finish(index)
+
+    if failed:
+        sys.exit(EXIT_FINDINGS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Load-time cost report for eager preload chains.
+
+Godot resolves const preloads, extends and [ext_resource] references as
+soon as a script, scene or resource loads. Starting from the main scene in
+project.godot, scripts/core/root.gd and every scripts/core/managers/m_*.gd,
+this report walks the eager part of the res:// dependency graph, sums the
+on-disk bytes of everything reached (using the imported artifact for
+assets when it exists) and ranks the edges whose conversion to a lazy
+load() would save the most bytes.
+
+An edge u -> v only saves bytes if v is not reachable any other way, so
+the saving is computed from the dominator tree of each root's closure:
+the bytes dominated by v, if every other predecessor of v is itself
+dominated by v, else zero.
+
+Usage:
+    python3 tools/preload_cost_report.py
+    python3 tools/preload_cost_report.py --top 40
+    python3 tools/preload_cost_report.py --root scripts/core/ui/ui_main_menu.gd
+    python3 tools/preload_cost_report.py --profile
+"""
+
+import argparse
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from gd_profile import add_profile_arguments, start_profiler
+from res_dep_graph import EAGER_EDGE_KINDS, EDGE_KIND_NAMES, PROJECT_FILE, GraphBuilder, to_res_path
+
+DEFAULT_ROOT_SCRIPT = "res://scripts/core/root.gd"
+MANAGER_GLOB = "scripts/core/managers/m_*.gd"
+
+# Imported artifact recorded in an .import sidecar
+IMPORT_PATH_PATTERN = re.compile(r'^path(?:\.\w+)?="(res://\.godot/imported/[^"]+)"')
+
+CATEGORY_BY_SUFFIX = {
+    ".gd": "scripts",
+    ".tres": "resources",
+    ".res": "resources",
+    ".tscn": "scenes",
+}
+
+
+def category_of(res_path):
+    """Return the report category for a res:// path."""
+    return CATEGORY_BY_SUFFIX.get(Path(res_path).suffix, "assets")
+
+
+def load_bytes(project_root, res_path, source_size):
+    """Return the bytes Godot reads for a node, preferring the imported artifact."""
+    if category_of(res_path) != "assets":
+        return source_size
+    sidecar = project_root / (res_path[len("res://"):] + ".import")
+    try:
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = IMPORT_PATH_PATTERN.match(line)
+                if match:
+                    imported = project_root / match.group(1)[len("res://"):]
+                    if imported.exists():
+                        return imported.stat().st_size
+                    break
+    except OSError:
+        pass
+    return source_size
+
+
+def eager_subgraph(graph, root):
+    """Return (order, preds) for the eager closure of root in reverse postorder."""
+    order = []
+    visited = {root}
+    stack = [(root, iter([t for t, _k in graph.edges(root, EAGER_EDGE_KINDS)]))]
+    while stack:
+        node, targets = stack[-1]
+        for target in targets:
+            if target not in visited:
+                visited.add(target)
+                stack.append((target, iter([t for t, _k in graph.edges(target, EAGER_EDGE_KINDS)])))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    order.reverse()
+
+    preds = defaultdict(list)
+    for node in order:
+        for target, _kind in graph.edges(node, EAGER_EDGE_KINDS):
+            preds[target].append(node)
+    return order, preds
+
+
+def dominators(order, preds):
+    """Cooper-Harvey-Kennedy iterative immediate dominators over a reverse postorder."""
+    position = {node: i for i, node in enumerate(order)}
+    root = order[0]
+    idom = {root: root}
+
+    def intersect(a, b):
+        while a != b:
+            while position[a] > position[b]:
+                a = idom[a]
+            while position[b] > position[a]:
+                b = idom[b]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for node in order[1:]:
+            new_idom = None
+            for pred in preds[node]:
+                if pred in idom:
+                    new_idom = pred if new_idom is None else intersect(pred, new_idom)
+            if idom.get(node) != new_idom:
+                idom[node] = new_idom
+                changed = True
+    return idom
+
+
+def dominates(idom, a, b):
+    """Return True if a dominates b."""
+    while True:
+        if b == a:
+            return True
+        parent = idom[b]
+        if parent == b:
+            return False
+        b = parent
+
+
+def analyze_root(graph, root, node_bytes):
+    """Return (closure order, {(u, v, kind): saved_bytes}) for one root."""
+    order, preds = eager_subgraph(graph, root)
+    idom = dominators(order, preds)
+
+    # Dominator subtree sizes, accumulated children-first
+    subtree = {node: node_bytes[node] for node in order}
+    for node in reversed(order[1:]):
+        subtree[idom[node]] += subtree[node]
+
+    savings = {}
+    for node in order:
+        for target, kind in graph.edges(node, EAGER_EDGE_KINDS):
+            if target == root or target == node:
+                continue
+            other_preds = [p for p in preds[target] if p != node]
+            if all(dominates(idom, target, p) for p in other_preds):
+                savings[(node, target, kind)] = subtree[target]
+            else:
+                savings[(node, target, kind)] = 0
+    return order, savings
+
+
+def find_roots(project_root, graph, extra_roots):
+    """Return root node IDs: main scene, root.gd, managers, then any extras."""
+    roots = []
+    project_node = graph.ids.get(to_res_path(PROJECT_FILE))
+    if project_node is not None:
+        roots.extend(t for t, _k in graph.edges(project_node) if graph.paths[t].endswith(".tscn"))
+
+    candidates = [DEFAULT_ROOT_SCRIPT]
+    candidates += [to_res_path(p.relative_to(project_root)) for p in sorted(project_root.glob(MANAGER_GLOB))]
+    candidates += [to_res_path(p, project_root) for p in extra_roots]
+    for res_path in candidates:
+        node = graph.ids.get(res_path)
+        if node is None:
+            print(f"Warning: root not in graph: {res_path}")
+        elif node not in roots:
+            roots.append(node)
+    return roots
+
+
+def format_bytes(count):
+    if count >= 1024 * 1024:
+        return f"{count / (1024 * 1024):.1f} MB"
+    if count >= 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count} B"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report eager preload load-time cost')
+    parser.add_argument('--top', type=int, default=20,
+                        help='Number of heaviest edges to list (default: 20)')
+    parser.add_argument('--root', action='append', default=[],
+                        help='Additional root file (repeatable)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    profiler = start_profiler("preload_cost_report", project_root, args)
+
+    print("=== Preload Load-Time Cost Report ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    builder = GraphBuilder(project_root)
+    with profiler.phase("build"):
+        graph = builder.build()
+    profiler.count('files_read', builder.files_read)
+    profiler.count('bytes_read', builder.bytes_read)
+    with profiler.phase("sizes"):
+        node_bytes = [load_bytes(project_root, path, graph.sizes[node]) if graph.exists[node] else 0
+                      for node, path in enumerate(graph.paths)]
+
+    roots = find_roots(project_root, graph, args.root)
+    best_edges = {}
+
+    print("=== Eager Closure per Root ===")
+    print()
+    for root in roots:
+        with profiler.phase("analyze"):
+            order, savings = analyze_root(graph, root, node_bytes)
+        totals = defaultdict(int)
+        counts = defaultdict(int)
+        for node in order:
+            category = category_of(graph.paths[node])
+            totals[category] += node_bytes[node]
+            counts[category] += 1
+
+        print(f"📦 {graph.paths[root]}")
+        print(f"   {len(order)} files, {format_bytes(sum(totals.values()))} total")
+        for category in ("scripts", "resources", "scenes", "assets"):
+            if counts[category]:
+                print(f"   {category:>9}: {counts[category]:4d} files, {format_bytes(totals[category])}")
+        print()
+
+        for edge, saved in savings.items():
+            if saved and saved > best_edges.get(edge, (0, None))[0]:
+                best_edges[edge] = (saved, root)
+
+    ranked = sorted(best_edges.items(), key=lambda item: (-item[1][0], graph.paths[item[0][0]]))
+    print(f"=== Heaviest Eager Edges (top {args.top}) ===")
+    print()
+    if not ranked:
+        print("✅ No single eager edge carries exclusive bytes")
+    for (source, target, kind), (saved, root) in ranked[:args.top]:
+        print(f"{format_bytes(saved):>10}  {graph.paths[source]}")
+        print(f"            -{EDGE_KIND_NAMES[kind]}-> {graph.paths[target]}")
+        print(f"            (via root {graph.paths[root]})")
+    print()
+    print("💡 Fix: Replace the heaviest preloads with lazy load() calls at first use")
+    profiler.finish()
+
+
+if __name__ == "__main__":
+    main()
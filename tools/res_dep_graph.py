@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Project-wide res:// dependency graph.
+
+Builds the load-time dependency graph of the project in one streaming pass
+over .gd, .tres, .tscn and project.godot files: preload()/load() calls and
+extends "res://..." in scripts, [ext_resource] headers in resources and
+scenes, and the main scene, icon and autoloads in project.godot. Nodes get
+integer IDs and edges are stored as compact per-node arrays, so closure,
+reverse-dependency and cycle queries run in milliseconds.
+
+Usage:
+    python3 tools/res_dep_graph.py stats
+    python3 tools/res_dep_graph.py deps scripts/core/state/m_state_store.gd
+    python3 tools/res_dep_graph.py rdeps res://scripts/core/state/m_state_store.gd
+    python3 tools/res_dep_graph.py cycles
+    python3 tools/res_dep_graph.py missing
+    python3 tools/res_dep_graph.py stats --profile
+"""
+
+import argparse
+import os
+import posixpath
+import re
+import sys
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+
+from gd_profile import add_profile_arguments, start_profiler
+
+# Directories never scanned (editor caches, VCS, tool caches)
+EXCLUDED_DIRS = {".git", ".godot", ".godot_user", ".tools_cache", "__pycache__"}
+
+# Edge kinds
+EDGE_PRELOAD = 0
+EDGE_LOAD = 1
+EDGE_EXTENDS = 2
+EDGE_EXT_RESOURCE = 3
+EDGE_PROJECT = 4
+EDGE_KIND_NAMES = ["preload", "load", "extends", "ext_resource", "project"]
+
+# Edge kinds Godot resolves while loading the source (load() runs later, at call time)
+EAGER_EDGE_KINDS = {EDGE_PRELOAD, EDGE_EXTENDS, EDGE_EXT_RESOURCE, EDGE_PROJECT}
+
+PROJECT_FILE = "project.godot"
+
+# Regex patterns for GDScript references
+GD_PRELOAD_PATTERN = re.compile(r'\bpreload\(\s*"([^"]+)"\s*\)')
+GD_LOAD_PATTERN = re.compile(r'(?<![\w.])(?:load|ResourceLoader\.load)\(\s*"([^"]+)"')
+GD_EXTENDS_PATTERN = re.compile(r'^extends\s+"([^"]+)"')
+
+# Regex patterns for resource/scene headers
+HEADER_UID_PATTERN = re.compile(r'^\[gd_(?:resource|scene)\b[^\]]*\buid="(uid://[^"]+)"')
+EXT_RESOURCE_PATTERN = re.compile(r'^\[ext_resource\b([^\]]*)\]')
+ATTR_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+BODY_SECTION_PREFIXES = ("[sub_resource", "[node", "[resource]", "[connection", "[editable")
+
+# Regex patterns for .import sidecars and project.godot
+IMPORT_UID_PATTERN = re.compile(r'^uid="(uid://[^"]+)"')
+PROJECT_REF_PATTERN = re.compile(r'"\*?((?:res|uid)://[^"]+)"')
+PROJECT_REF_KEYS = ("run/main_scene", "config/icon", "boot_splash/image")
+
+
+def to_res_path(path, project_root=None):
+    """Normalise a filesystem path, project-relative path or res:// path to res://."""
+    path = str(path)
+    if path.startswith("res://") or path.startswith("uid://"):
+        return path
+    if project_root is not None and os.path.isabs(path):
+        path = os.path.relpath(path, project_root)
+    return "res://" + Path(path).as_posix().removeprefix("./")
+
+
+def resolve_reference(ref, source_res_path):
+    """Resolve a relative reference against the referencing file's directory."""
+    if ref.startswith("res://") or ref.startswith("uid://"):
+        return ref
+    base = posixpath.dirname(source_res_path[len("res://"):])
+    return "res://" + posixpath.normpath(posixpath.join(base, ref))
+
+
+def iter_project_files(project_root, suffixes):
+    """Yield project files with one of the given suffixes, skipping cache dirs."""
+    for root, dirs, files in os.walk(project_root):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        for name in sorted(files):
+            if name.endswith(suffixes):
+                yield Path(root) / name
+
+
+class DependencyGraph:
+    """res:// dependency graph with integer node IDs and array adjacency."""
+
+    def __init__(self):
+        self.paths = []          # node id -> res:// path
+        self.ids = {}            # res:// path -> node id
+        self.exists = array('b')
+        self.sizes = array('q')
+        self.forward = []        # node id -> array('I') of target ids
+        self.kinds = []          # node id -> array('B') of edge kinds
+        self._reverse = None
+
+    def node_id(self, res_path):
+        """Return the ID for a res:// path, allocating a node if needed."""
+        node = self.ids.get(res_path)
+        if node is None:
+            node = len(self.paths)
+            self.ids[res_path] = node
+            self.paths.append(res_path)
+            self.exists.append(0)
+            self.sizes.append(0)
+            self.forward.append(array('I'))
+            self.kinds.append(array('B'))
+        return node
+
+    def add_edge(self, source, target, kind):
+        self.forward[source].append(target)
+        self.kinds[source].append(kind)
+        self._reverse = None
+
+    @property
+    def edge_count(self):
+        return sum(len(targets) for targets in self.forward)
+
+    def reverse(self):
+        """Return (and cache) the reverse adjacency."""
+        if self._reverse is None:
+            reverse = [array('I') for _ in self.paths]
+            for source, targets in enumerate(self.forward):
+                for target in targets:
+                    reverse[target].append(source)
+            self._reverse = reverse
+        return self._reverse
+
+    def edges(self, node, kinds=None):
+        """Yield (target, kind) for a node's outgoing edges."""
+        for target, kind in zip(self.forward[node], self.kinds[node]):
+            if kinds is None or kind in kinds:
+                yield target, kind
+
+    def closure(self, roots, kinds=None):
+        """Return the set of node IDs transitively reachable from roots (inclusive)."""
+        seen = set(roots)
+        queue = deque(roots)
+        while queue:
+            node = queue.popleft()
+            for target, _kind in self.edges(node, kinds):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def dependents(self, roots):
+        """Return the set of node IDs that transitively depend on roots (inclusive)."""
+        reverse = self.reverse()
+        seen = set(roots)
+        queue = deque(roots)
+        while queue:
+            node = queue.popleft()
+            for source in reverse[node]:
+                if source not in seen:
+                    seen.add(source)
+                    queue.append(source)
+        return seen
+
+    def cycles(self, kinds=None):
+        """Return strongly connected components that form cycles (iterative Tarjan)."""
+        index_of = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for start in range(len(self.paths)):
+            if start in index_of:
+                continue
+            work = [(start, iter(self.edges(start, kinds)))]
+            index_of[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for target, _kind in edges:
+                    if target not in index_of:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.edges(target, kinds))))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    # A lone node is a cycle only through a self-edge of a requested kind
+                    if len(component) > 1 or any(target == node
+                                                 for target, _kind in self.edges(node, kinds)):
+                        components.append(sorted(component))
+
+        return components
+
+
+class GraphBuilder:
+    """Streams project files once and collects raw references for the graph."""
+
+    def __init__(self, project_root):
+        self.project_root = Path(project_root)
+        self.graph = DependencyGraph()
+        self.uid_to_path = {}
+        self._pending = []       # (source id, reference, kind); references may be uid://
+        self.files_read = 0
+        self.bytes_read = 0
+
+    def _register_file(self, file_path):
+        res_path = to_res_path(file_path.relative_to(self.project_root))
+        node = self.graph.node_id(res_path)
+        self.graph.exists[node] = 1
+        try:
+            self.graph.sizes[node] = file_path.stat().st_size
+        except OSError:
+            pass
+        return node, res_path
+
+    def _read_lines(self, file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                self.files_read += 1
+                for line in f:
+                    self.bytes_read += len(line)
+                    yield line
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+
+    def scan_script(self, file_path):
+        node, res_path = self._register_file(file_path)
+        for line in self._read_lines(file_path):
+            if '"' not in line:
+                continue
+            match = GD_EXTENDS_PATTERN.match(line)
+            if match:
+                self._pending.append((node, resolve_reference(match.group(1), res_path), EDGE_EXTENDS))
+            for ref in GD_PRELOAD_PATTERN.findall(line):
+                self._pending.append((node, resolve_reference(ref, res_path), EDGE_PRELOAD))
+            for ref in GD_LOAD_PATTERN.findall(line):
+                self._pending.append((node, resolve_reference(ref, res_path), EDGE_LOAD))
+
+    def scan_resource(self, file_path):
+        """Scan only the header section of a .tres/.tscn (stops at the first body section)."""
+        node, res_path = self._register_file(file_path)
+        for line in self._read_lines(file_path):
+            if line.startswith(BODY_SECTION_PREFIXES):
+                break
+            match = HEADER_UID_PATTERN.match(line)
+            if match:
+                self.uid_to_path[match.group(1)] = res_path
+                continue
+            match = EXT_RESOURCE_PATTERN.match(line)
+            if match:
+                attrs = dict(ATTR_PATTERN.findall(match.group(1)))
+                ref = attrs.get('path') or attrs.get('uid')
+                if ref:
+                    self._pending.append((node, resolve_reference(ref, res_path), EDGE_EXT_RESOURCE))
+                if attrs.get('path') and attrs.get('uid'):
+                    # Fallback mapping; the target's own header wins below
+                    self.uid_to_path.setdefault(attrs['uid'], resolve_reference(attrs['path'], res_path))
+
+    def scan_import(self, file_path):
+        """Map the uid recorded in an .import sidecar to its source asset."""
+        source = to_res_path(file_path.relative_to(self.project_root))[:-len(".import")]
+        for line in self._read_lines(file_path):
+            match = IMPORT_UID_PATTERN.match(line)
+            if match:
+                self.uid_to_path[match.group(1)] = source
+                break
+
+    def scan_uid_file(self, file_path):
+        """Map a Godot 4.4+ .uid sidecar to its script."""
+        source = to_res_path(file_path.relative_to(self.project_root))[:-len(".uid")]
+        for line in self._read_lines(file_path):
+            if line.startswith("uid://"):
+                self.uid_to_path[line.strip()] = source
+                break
+
+    def scan_project_file(self, file_path):
+        node, _res_path = self._register_file(file_path)
+        section = ""
+        for line in self._read_lines(file_path):
+            stripped = line.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                section = stripped[1:-1]
+                continue
+            if section == "autoload" or stripped.startswith(PROJECT_REF_KEYS):
+                for ref in PROJECT_REF_PATTERN.findall(stripped):
+                    self._pending.append((node, ref, EDGE_PROJECT))
+
+    def build(self):
+        """Run the streaming pass and resolve uid:// references; return the graph."""
+        handlers = {
+            '.gd': self.scan_script,
+            '.tres': self.scan_resource,
+            '.tscn': self.scan_resource,
+            '.import': self.scan_import,
+            '.uid': self.scan_uid_file,
+        }
+        for file_path in iter_project_files(self.project_root, tuple(handlers)):
+            handlers[file_path.suffix](file_path)
+
+        project_file = self.project_root / PROJECT_FILE
+        if project_file.exists():
+            self.scan_project_file(project_file)
+
+        for source, ref, kind in self._pending:
+            if ref.startswith("uid://"):
+                ref = self.uid_to_path.get(ref, ref)
+            target = self.graph.node_id(ref)
+            self.graph.add_edge(source, target, kind)
+        self._pending = []
+
+        # Record sizes for referenced files the walk did not visit (assets, etc.)
+        for node, res_path in enumerate(self.graph.paths):
+            if self.graph.exists[node] or not res_path.startswith("res://"):
+                continue
+            try:
+                self.graph.sizes[node] = (self.project_root / res_path[len("res://"):]).stat().st_size
+                self.graph.exists[node] = 1
+            except OSError:
+                pass
+
+        return self.graph
+
+
+def build_graph(project_root):
+    """Build the dependency graph for a project in one streaming pass."""
+    return GraphBuilder(project_root).build()
+
+
+def _lookup(graph, project_root, path):
+    res_path = to_res_path(path, project_root)
+    node = graph.ids.get(res_path)
+    if node is None:
+        print(f"Not in graph: {res_path}")
+        sys.exit(1)
+    return node
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the project res:// dependency graph')
+    parser.add_argument('command', choices=['stats', 'deps', 'rdeps', 'cycles', 'missing'])
+    parser.add_argument('path', nargs='?', help='File for deps/rdeps (res://, relative or absolute)')
+    parser.add_argument('--direct', action='store_true',
+                        help='Only list direct edges instead of the transitive closure')
+    parser.add_argument('--eager', action='store_true',
+                        help='Ignore load() edges (only what is resolved at load time)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    profiler = start_profiler("res_dep_graph", project_root, args)
+    start = time.perf_counter()
+    builder = GraphBuilder(project_root)
+    with profiler.phase("build"):
+        graph = builder.build()
+    profiler.count('files_read', builder.files_read)
+    profiler.count('bytes_read', builder.bytes_read)
+    build_ms = (time.perf_counter() - start) * 1000
+    kinds = EAGER_EDGE_KINDS if args.eager else None
+
+    if args.command in ('deps', 'rdeps') and not args.path:
+        parser.error(f"{args.command} requires a path")
+
+    start = time.perf_counter()
+    if args.command == 'stats':
+        print("=== res:// Dependency Graph ===")
+        print(f"Project root: {project_root}")
+        print(f"Files read: {builder.files_read} ({builder.bytes_read / 1024:.0f} KB)")
+        print(f"Nodes: {len(graph.paths)}")
+        print(f"Edges: {graph.edge_count}")
+        counts = [0] * len(EDGE_KIND_NAMES)
+        for kind_list in graph.kinds:
+            for kind in kind_list:
+                counts[kind] += 1
+        for kind, name in enumerate(EDGE_KIND_NAMES):
+            print(f"  {name}: {counts[kind]}")
+    elif args.command == 'deps':
+        node = _lookup(graph, project_root, args.path)
+        if args.direct:
+            result = {target for target, _kind in graph.edges(node, kinds)}
+        else:
+            result = graph.closure([node], kinds) - {node}
+        for target in sorted(result, key=lambda n: graph.paths[n]):
+            print(graph.paths[target])
+        print(f"\n{len(result)} dependencies")
+    elif args.command == 'rdeps':
+        node = _lookup(graph, project_root, args.path)
+        if args.direct:
+            result = set(graph.reverse()[node])
+        else:
+            result = graph.dependents([node]) - {node}
+        for source in sorted(result, key=lambda n: graph.paths[n]):
+            print(graph.paths[source])
+        print(f"\n{len(result)} dependents")
+    elif args.command == 'cycles':
+        components = graph.cycles(kinds)
+        for component in components:
+            print(f"🔁 Cycle ({len(component)} files)")
+            for node in component:
+                print(f"   {graph.paths[node]}")
+            print()
+        print(f"{len(components)} cycles")
+    elif args.command == 'missing':
+        missing = [node for node in range(len(graph.paths)) if not graph.exists[node]]
+        reverse = graph.reverse()
+        for node in sorted(missing, key=lambda n: graph.paths[n]):
+            print(f"❌ {graph.paths[node]}")
+            for source in reverse[node]:
+                print(f"   referenced by {graph.paths[source]}")
+        print(f"\n{len(missing)} missing targets")
+    query_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Build: {build_ms:.0f} ms, query: {query_ms:.1f} ms")
+    profiler.finish()
+
+
+if __name__ == "__main__":
+    main()
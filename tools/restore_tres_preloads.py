@@ -5,68 +5,261 @@ Restores const preloads for .tres resource files that were incorrectly removed.
 Our fix script removed ALL const preloads matching global class names, but some
 were actually loading .tres resource instances, not .gd scripts. This script
 restores those.
+
+The diff of a revision range is streamed from `git diff` through a pipe,
+restricted to *.gd paths and parsed one line at a time, so a bulk refactor
+touching hundreds of files is processed in constant memory. Every removed
+`const X := preload("....tres")` (or .tscn/.res) line that was not re-added
+elsewhere in the same file is put back where it was: right after the
+surviving line it used to follow. If that line has moved since, it is
+searched for in the working tree; lines that are already present are left
+alone, so re-running is safe.
+
+Usage:
+    python3 tools/restore_tres_preloads.py                  # Undo removals made by HEAD
+    python3 tools/restore_tres_preloads.py --dry-run        # Show the restoring diff only
+    python3 tools/restore_tres_preloads.py abc123           # Removals made by one commit
+    python3 tools/restore_tres_preloads.py origin/main..HEAD --dry-run > restore.patch
+    python3 tools/restore_tres_preloads.py HEAD~20..HEAD --dry-run --profile > /dev/null
 """
 
+import argparse
+import re
 import subprocess
+import sys
+from collections import defaultdict
 from pathlib import Path
 
+from gd_codemod import SourceFile, apply_edits, unified_diff, write_atomic
+from gd_profile import add_profile_arguments, start_profiler
+
+# Removed lines worth restoring: const preloads of resource instances
+RESOURCE_PRELOAD_PATTERN = re.compile(
+    r'^\s*const\s+(\w+)\s*(?::\s*\w+\s*)?:?=\s*preload\("([^"]+\.(?:tres|tscn|res))"\)')
+
+HUNK_PATTERN = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+RULE_ID = "restore-resource-preload"
+
+
+def diff_command(revisions):
+    """Return the git diff command for a range (A..B, A...B) or a single commit."""
+    spec = revisions if '..' in revisions else f"{revisions}^!"
+    return ['git', 'diff', '--no-color', '--no-ext-diff', spec, '--', '*.gd']
+
+
+def iter_removed_preloads(lines):
+    """
+    Parse a streamed unified diff; yield (path, removal) per file.
+
+    removal is {'after_line', 'anchor', 'lines'}: removed resource preload
+    lines that sat after new-side line after_line, whose text is anchor
+    (None at the top of a hunk). Removed lines re-added elsewhere in the
+    same file (moved, not deleted) are not yielded.
+    """
+    path = None
+    removals = []
+    added = set()
+    new_line = 0
+    anchor = None
+
+    def flush():
+        if path is None:
+            return
+        for removal in removals:
+            removal['lines'] = [text for text in removal['lines'] if text.strip() not in added]
+            if removal['lines']:
+                yield path, removal
+
+    for line in lines:
+        line = line.rstrip('\n')
+        if line.startswith('diff --git '):
+            yield from flush()
+            path, removals, added = None, [], set()
+        elif line.startswith('+++ '):
+            target = line[4:]
+            path = target[2:] if target.startswith('b/') else None
+        elif line.startswith('--- '):
+            continue
+        elif line.startswith('@@'):
+            match = HUNK_PATTERN.match(line)
+            if match:
+                start, count = int(match.group(1)), match.group(2)
+                # A zero-length new side names the line before the hunk
+                new_line = start + 1 if count == '0' else start
+                anchor = None
+        elif path is None:
+            continue
+        elif line.startswith('+'):
+            added.add(line[1:].strip())
+            anchor = line[1:]
+            new_line += 1
+        elif line.startswith(' '):
+            anchor = line[1:]
+            new_line += 1
+        elif line.startswith('-') and RESOURCE_PRELOAD_PATTERN.match(line[1:]):
+            if removals and removals[-1]['after_line'] == new_line - 1:
+                removals[-1]['lines'].append(line[1:])
+            else:
+                removals.append({'after_line': new_line - 1, 'anchor': anchor, 'lines': [line[1:]]})
+
+    yield from flush()
+
+
+def locate(lines, removal):
+    """Return how many lines of the current file precede the insertion point, or None."""
+    after_line = removal['after_line']
+    anchor = removal['anchor']
+    if anchor is None:
+        return after_line if after_line <= len(lines) else None
+    if 0 < after_line <= len(lines) and lines[after_line - 1] == anchor:
+        return after_line
+    matches = [i + 1 for i, text in enumerate(lines) if text == anchor]
+    return matches[0] if len(matches) == 1 else None
+
+
+def restore_file(project_root, rel_path, removals, write=True):
+    """
+    Re-insert removed preload lines into one file.
+
+    Returns {'restored': [(line, text)], 'present', 'unplaced', 'diff', 'error'}.
+    """
+    result = {'restored': [], 'present': 0, 'unplaced': [], 'diff': None, 'error': None}
+    path = Path(project_root) / rel_path
+    try:
+        with open(path, 'rb') as f:
+            text = f.read().decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        result['error'] = f"Error reading {path}: {e}"
+        return result
+
+    source = SourceFile(path, rel_path, text)
+    lines = text.splitlines()
+    present = {line.strip() for line in lines}
+    newline = '\r\n' if '\r\n' in text else '\n'
+
+    inserts = []
+    for removal in removals:
+        missing = [line for line in removal['lines'] if line.strip() not in present]
+        result['present'] += len(removal['lines']) - len(missing)
+        if not missing:
+            continue
+        index = locate(lines, removal)
+        if index is None:
+            result['unplaced'].extend(missing)
+            continue
+        inserts.append((index, missing))
+        present.update(line.strip() for line in missing)
+
+    if not inserts:
+        return result
+
+    edits = []
+    shift = 0
+    for index, missing in sorted(inserts, key=lambda insert: insert[0]):
+        offset = source.line_offset(index + 1)
+        prefix = newline if offset == len(text) and text and not text.endswith('\n') else ""
+        edits.append(source.edit(offset, offset, prefix + "".join(line + newline for line in missing), RULE_ID))
+        result['restored'].extend((index + shift + 1 + i, line) for i, line in enumerate(missing))
+        shift += len(missing)
+    new_text = apply_edits(text, edits)
+
+    result['diff'] = unified_diff(rel_path, text, new_text)
+    if write:
+        try:
+            write_atomic(path, new_text.encode('utf-8'))
+        except OSError as e:
+            result['error'] = f"Error writing {path}: {e}"
+    return result
+
 
 def main():
+    parser = argparse.ArgumentParser(description='Restore removed .tres/.tscn const preloads')
+    parser.add_argument('revisions', nargs='?', default='HEAD',
+                        help='Commit (diffed against its parent) or range A..B (default: HEAD)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the restoring diff to stdout without modifying files')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     project_root = Path(__file__).parent.parent
+    profiler = start_profiler("restore_tres_preloads", project_root, args)
+    if args.dry_run:
+        # The patch owns stdout; progress and the summary go to stderr
+        patch_stream = sys.stdout
+        sys.stdout = sys.stderr
 
     print("=== Restoring .tres Resource Preloads ===")
+    print(f"Range: {args.revisions}")
     print()
 
-    # Get the diff from the last commit
-    result = subprocess.run(
-        ['git', 'show', 'HEAD'],
-        capture_output=True,
+    # Stream the diff; only matching removed lines are kept in memory
+    process = subprocess.Popen(
+        diff_command(args.revisions),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
+        encoding='utf-8',
+        errors='replace',
         cwd=project_root
     )
+    removals_by_file = defaultdict(list)
+    with profiler.phase("diff"):
+        for rel_path, removal in iter_removed_preloads(process.stdout):
+            removals_by_file[rel_path].append(removal)
+        stderr = process.stderr.read()
+        returncode = process.wait()
+    if returncode != 0:
+        print(f"Error getting git diff: {stderr.strip()}")
+        sys.exit(2)
 
-    if result.returncode != 0:
-        print("Error getting git diff")
+    total = sum(len(r['lines']) for removals in removals_by_file.values() for r in removals)
+    print(f"Found {total} .tres/.tscn preloads removed in {len(removals_by_file)} files")
+    print()
+    if not total:
+        print("✅ No .tres preloads found in removed lines")
+        profiler.finish()
         return
 
-    diff_lines = result.stdout.split('\n')
-
-    # Find removed lines that preload .tres files
-    tres_preloads = []
-    current_file = None
-
-    for line in diff_lines:
-        if line.startswith('---'):
-            # Track which file we're in
-            parts = line.split()
-            if len(parts) > 1:
-                file_path = parts[1].replace('a/', '')
-                current_file = file_path
-        elif line.startswith('-const ') and '.tres' in line:
-            # This is a removed const that loads a .tres file
-            const_line = line[1:]  # Remove the '-' prefix
-            tres_preloads.append({
-                'file': current_file,
-                'line': const_line
-            })
-
-    print(f"Found {len(tres_preloads)} .tres preloads that were incorrectly removed")
-    print()
+    restored = 0
+    already_present = 0
+    unplaced = 0
+    failed = False
+    for rel_path in sorted(removals_by_file):
+        with profiler.phase("restore"):
+            result = restore_file(project_root, rel_path, removals_by_file[rel_path],
+                                  write=not args.dry_run)
+        if result['error']:
+            print(result['error'])
+            failed = True
+            continue
+        restored += len(result['restored'])
+        already_present += result['present']
+        unplaced += len(result['unplaced'])
+        if result['restored'] or result['unplaced']:
+            print(f"📄 {rel_path}")
+            for line_num, text in result['restored']:
+                print(f"   + Line {line_num:4d}: {text.strip()}")
+            for text in result['unplaced']:
+                print(f"   ⚠️  Could not place: {text.strip()}")
+        if args.dry_run and result['diff']:
+            patch_stream.write(result['diff'])
 
-    if tres_preloads:
-        print("Files affected:")
-        files_affected = set(item['file'] for item in tres_preloads)
-        for file_path in sorted(files_affected):
-            count = sum(1 for item in tres_preloads if item['file'] == file_path)
-            print(f"  {file_path} ({count} preloads)")
-        print()
-        print("To restore these, we need to revert the last commit and re-run")
-        print("the fix script with .tres files excluded.")
+    print()
+    print("=== Summary ===")
+    print(f"{'Would restore' if args.dry_run else 'Restored'}: {restored}")
+    print(f"Already present: {already_present}")
+    if unplaced:
+        print(f"Could not place (anchor line gone or ambiguous): {unplaced}")
+    if args.dry_run and restored:
         print()
-        print("Run: git reset --soft HEAD~1")
-        print("Then: python3 tools/fix_shadowed_consts_v2.py")
-    else:
-        print("✅ No .tres preloads found in removed lines")
+        print("💡 To apply these changes, run without --dry-run")
+    profiler.finish()
+
+    if failed:
+        sys.exit(2)
+    if unplaced:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
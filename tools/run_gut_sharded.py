@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Run the GUT suite as parallel, duration-balanced shards.
+
+run_gut_suite.sh runs every test script in one headless Godot process, so
+a full run uses a single core. This runner discovers tests/**/test_*.gd,
+packs the scripts into N shards with longest-processing-time-first
+scheduling using per-script durations from earlier runs, and runs one
+headless Godot per shard. Each shard gets its own HOME (and XDG dirs), so
+user:// writes never collide. Shard JUnit files are merged into one report
+and the measured durations feed the next run's schedule.
+
+Godot is only driven through its command line and the -gjunit_xml_file
+export, so any executable honouring that contract (e.g. a stub script in
+CI) can stand in for it via --godot or GODOT_BIN.
+
+Usage:
+    python3 tools/run_gut_sharded.py
+    python3 tools/run_gut_sharded.py --shards 4
+    python3 tools/run_gut_sharded.py --dry-run
+    python3 tools/run_gut_sharded.py --junit build/gut.xml -- -glog=1
+    python3 tools/run_gut_sharded.py $(python3 tools/select_tests.py --list)   # --no-tests when none
+    GODOT_BIN=/path/to/godot python3 tools/run_gut_sharded.py tests/unit
+    python3 tools/run_gut_sharded.py --profile --dry-run
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+
+from gd_profile import add_profile_arguments, start_profiler
+
+DEFAULT_GODOT_BIN = "/Applications/Godot.app/Contents/MacOS/Godot"
+GUT_CMDLN = "addons/gut/gut_cmdln.gd"
+TESTS_DIR = "tests"
+TEST_PREFIX = "test_"
+
+CACHE_DIR = ".tools_cache"
+HISTORY_FILENAME = "gut_durations.json"
+SHARD_DIRNAME = "gut_shards"
+DEFAULT_JUNIT = f"{CACHE_DIR}/gut_junit.xml"
+
+# Weight of the newest measurement in the duration history
+HISTORY_ALPHA = 0.5
+
+# Seconds assumed for scripts that have never been timed
+DEFAULT_DURATION = 1.0
+
+
+def discover_tests(project_root, roots):
+    """Return sorted res:// paths of test scripts under the given roots."""
+    found = set()
+    for root in roots:
+        root_path = project_root / root
+        if root_path.is_file():
+            found.add("res://" + root_path.relative_to(project_root).as_posix())
+            continue
+        if not root_path.exists():
+            print(f"Warning: {root} not found")
+            continue
+        for dirpath, dirs, files in os.walk(root_path):
+            dirs.sort()
+            for name in files:
+                if name.startswith(TEST_PREFIX) and name.endswith(".gd"):
+                    rel = (Path(dirpath) / name).relative_to(project_root).as_posix()
+                    found.add("res://" + rel)
+    return sorted(found)
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {k: float(v) for k, v in data.items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_history(path, history):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing {path}: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def estimate_durations(tests, history):
+    """Return {test: seconds}, using the median known duration for new scripts."""
+    known = sorted(history[t] for t in tests if t in history)
+    fallback = known[len(known) // 2] if known else DEFAULT_DURATION
+    return {t: history.get(t, fallback) for t in tests}
+
+
+def schedule_shards(durations, shard_count):
+    """Longest-processing-time-first: each script goes to the least loaded shard."""
+    shard_count = max(1, min(shard_count, len(durations)))
+    shards = [[] for _ in range(shard_count)]
+    loads = [(0.0, i) for i in range(shard_count)]
+    heapq.heapify(loads)
+    for test in sorted(durations, key=lambda t: (-durations[t], t)):
+        load, index = heapq.heappop(loads)
+        shards[index].append(test)
+        heapq.heappush(loads, (load + durations[test], index))
+    return [sorted(shard) for shard in shards]
+
+
+def shard_env(shard_home):
+    """Return an environment whose user:// and editor dirs live under shard_home."""
+    env = dict(os.environ)
+    env['HOME'] = str(shard_home)
+    env['XDG_DATA_HOME'] = str(shard_home / ".local/share")
+    env['XDG_CONFIG_HOME'] = str(shard_home / ".config")
+    env['XDG_CACHE_HOME'] = str(shard_home / ".cache")
+    return env
+
+
+def start_shard(godot_bin, project_root, work_dir, index, tests, gut_args):
+    """Launch one shard; return (process, junit_path, log_path)."""
+    shard_home = work_dir / f"home_{index}"
+    shutil.rmtree(shard_home, ignore_errors=True)
+    shard_home.mkdir(parents=True)
+    junit_path = work_dir / f"shard_{index}.xml"
+    log_path = work_dir / f"shard_{index}.log"
+    for stale in (junit_path, log_path):
+        if stale.exists():
+            stale.unlink()
+
+    command = [
+        godot_bin, "--headless", "--path", str(project_root), "-s", GUT_CMDLN,
+        "-gtest=" + ",".join(tests),
+        "-gjunit_xml_file=" + str(junit_path),
+        *gut_args,
+        "-gexit",
+    ]
+    log = open(log_path, 'w', encoding='utf-8')
+    try:
+        process = subprocess.Popen(command, cwd=project_root, env=shard_env(shard_home),
+                                   stdout=log, stderr=subprocess.STDOUT)
+    finally:
+        log.close()
+    return process, junit_path, log_path
+
+
+def read_junit(junit_path):
+    """Return the <testsuite> elements of a shard's JUnit file, or None if unreadable."""
+    try:
+        return ET.parse(junit_path).getroot().findall('testsuite')
+    except (OSError, ET.ParseError):
+        return None
+
+
+def suite_test_path(suite):
+    """Map a GUT testsuite name (res:// stripped) back to the script's res:// path."""
+    name = suite.get('name', '')
+    # Inner-class suites are named "path.gd.InnerClass"
+    script, sep, _inner = name.partition(".gd.")
+    if sep:
+        name = script + ".gd"
+    return name if name.startswith("res://") else "res://" + name
+
+
+def crashed_suite(test, reason):
+    """Build a testsuite element recording a script that produced no results."""
+    suite = ET.Element('testsuite', {
+        'name': test[len("res://"):], 'tests': '1', 'failures': '0', 'errors': '1',
+        'skipped': '0', 'time': '0',
+    })
+    case = ET.SubElement(suite, 'testcase', {'name': 'shard', 'classname': test[len("res://"):]})
+    ET.SubElement(case, 'error', {'message': reason})
+    return suite
+
+
+def merge_junit(suites, output_path):
+    """Write all testsuites into one <testsuites> document; return totals."""
+    totals = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+    root = ET.Element('testsuites', {'name': 'GutTests'})
+    for suite in suites:
+        for key in totals:
+            totals[key] += int(float(suite.get(key, 0) or 0))
+        root.append(suite)
+    for key, value in totals.items():
+        root.set(key, str(value))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ET.indent(root)
+    ET.ElementTree(root).write(output_path, encoding='utf-8', xml_declaration=True)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run GUT tests in parallel duration-balanced shards',
+                                     epilog='Arguments after -- are passed to every GUT shard')
+    parser.add_argument('paths', nargs='*', default=[TESTS_DIR],
+                        help='Test directories or scripts (default: tests)')
+    parser.add_argument('--shards', type=int, default=os.cpu_count() or 1,
+                        help='Number of parallel Godot processes (default: CPU count)')
+    parser.add_argument('--godot', default=os.environ.get('GODOT_BIN', DEFAULT_GODOT_BIN),
+                        help='Godot executable (default: $GODOT_BIN)')
+    parser.add_argument('--junit', default=DEFAULT_JUNIT,
+                        help=f'Merged JUnit XML output (default: {DEFAULT_JUNIT})')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='Kill shards still running after this many seconds')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the shard plan without running Godot')
+    parser.add_argument('--no-tests', action='store_true',
+                        help='Run nothing and exit 0 (select_tests.py prints this for an empty selection)')
+    add_profile_arguments(parser)
+    argv = sys.argv[1:]
+    gut_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, gut_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    project_root = Path(__file__).parent.parent
+    cache_dir = project_root / CACHE_DIR
+    history_path = cache_dir / HISTORY_FILENAME
+    work_dir = cache_dir / SHARD_DIRNAME
+    profiler = start_profiler("run_gut_sharded", project_root, args)
+
+    print("=== Sharded GUT Runner ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    if args.no_tests:
+        print("✅ No tests selected, nothing to run")
+        return
+
+    with profiler.phase("discover"):
+        tests = discover_tests(project_root, args.paths)
+    if not tests:
+        print("❌ No test scripts found")
+        sys.exit(1)
+
+    with profiler.phase("schedule"):
+        history = load_history(history_path)
+        durations = estimate_durations(tests, history)
+        shards = schedule_shards(durations, args.shards)
+    timed = sum(1 for t in tests if t in history)
+
+    print(f"Test scripts: {len(tests)} ({timed} with recorded durations)")
+    print(f"Shards: {len(shards)}")
+    for index, shard in enumerate(shards):
+        estimate = sum(durations[t] for t in shard)
+        print(f"  Shard {index}: {len(shard):4d} scripts, ~{estimate:.1f}s")
+    print()
+
+    if args.dry_run:
+        for index, shard in enumerate(shards):
+            print(f"=== Shard {index} ===")
+            for test in shard:
+                print(f"  {test}")
+        profiler.finish()
+        return
+
+    if shutil.which(args.godot) is None and not Path(args.godot).exists():
+        print(f"❌ Godot executable not found: {args.godot} (set GODOT_BIN or --godot)")
+        sys.exit(1)
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    running = []
+    for index, shard in enumerate(shards):
+        process, junit_path, log_path = start_shard(args.godot, project_root, work_dir,
+                                                    index, shard, gut_args)
+        running.append((index, shard, process, junit_path, log_path, time.perf_counter()))
+
+    suites = []
+    shard_failed = False
+    # Measured this run; history holds the smoothed estimates for scheduling
+    measured = 0.0
+    with profiler.phase("shards"):
+        for index, shard, process, junit_path, log_path, started in running:
+            try:
+                remaining = None
+                if args.timeout is not None:
+                    remaining = max(0.0, args.timeout - (time.perf_counter() - start))
+                returncode = process.wait(timeout=remaining)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                returncode = process.wait()
+                print(f"❌ Shard {index} timed out after {args.timeout:.0f}s")
+            elapsed = time.perf_counter() - started
+
+            shard_suites = read_junit(junit_path)
+            if shard_suites is None:
+                shard_failed = True
+                print(f"❌ Shard {index} produced no JUnit report (exit {returncode}), see {log_path}")
+                suites.extend(crashed_suite(t, f"shard {index} exited {returncode} without results")
+                              for t in shard)
+                continue
+
+            # A script's inner classes report as suites of their own
+            script_seconds = defaultdict(float)
+            for suite in shard_suites:
+                script_seconds[suite_test_path(suite)] += float(suite.get('time', 0) or 0)
+            for test, seconds in script_seconds.items():
+                measured += seconds
+                previous = history.get(test)
+                history[test] = seconds if previous is None else (
+                    HISTORY_ALPHA * seconds + (1 - HISTORY_ALPHA) * previous)
+            suites.extend(shard_suites)
+
+            missing = [t for t in shard if t not in script_seconds]
+            suites.extend(crashed_suite(t, f"no results from shard {index}") for t in missing)
+            status = "✅" if returncode == 0 and not missing else "❌"
+            if returncode != 0:
+                shard_failed = True
+            print(f"{status} Shard {index}: {len(shard)} scripts in {elapsed:.1f}s (exit {returncode})")
+
+    wall = time.perf_counter() - start
+    with profiler.phase("merge"):
+        save_history(history_path, history)
+        junit_output = project_root / args.junit
+        totals = merge_junit(suites, junit_output)
+
+    print()
+    print("=== Summary ===")
+    print(f"Tests: {totals['tests']}")
+    print(f"Failures: {totals['failures']}")
+    print(f"Errors: {totals['errors']}")
+    print(f"Pending: {totals['skipped']}")
+    print(f"Wall time: {wall:.1f}s (sum of measured script times: {measured:.1f}s)")
+    print(f"JUnit report: {junit_output}")
+    profiler.finish()
+
+    if shard_failed or totals['failures'] or totals['errors']:
+        sys.exit(1)
+    print()
+    print("✅ All shards passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,12 @@ export HOME="${ROOT_DIR}/.godot_user"
 mkdir -p "${HOME}"
 
 ARGS=("$@")
+# tools/select_tests.py prints --no-tests when a change affects no test;
+# without this check the empty selection would fall back to the full suite.
+if [ "${#ARGS[@]}" -gt 0 ] && [ "${ARGS[0]}" = "--no-tests" ]; then
+	echo "No tests selected, nothing to run"
+	exit 0
+fi
 if [ "${#ARGS[@]}" -eq 0 ]; then
 	ARGS=(-gdir=res://tests -ginclude_subdirs=true)
 fi
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Scene complexity profiler: predicts what instantiating a .tscn costs.
+
+Every .tscn (and every .tres it reaches) is read whole, since the index
+hashes the full content, and its sections are scanned line by line keeping
+only counters: ext_resource declarations, sub_resource count, [node]
+sections, nodes with a script attached, and the nodes that instance another
+scene (instance=ExtResource(...)). Instanced and inherited scenes are then
+resolved recursively, so each scene gets:
+
+- nodes:         nodes created by one instantiate(), instanced scenes included
+- depth:         maximum instancing depth (0 = instances no other scene)
+- sub_resources: sub_resources of the scene and of every scene/resource it loads
+- scripts:       nodes with a script attached, instanced scenes included
+- bytes:         on-disk bytes of the scene plus everything its ext_resources
+                 reach (the imported artifact for imported assets)
+
+A scene instanced N times counts its nodes N times; resources are loaded
+once, so sub_resources and bytes count each file once. Scripts count their
+own bytes only; their preload chains are what preload_cost_report.py ranks.
+Override sections (a [node] with neither type nor instance, editing a node
+of an instanced scene) do not add nodes.
+
+Per-file counters are cached in .tools_cache/scene_profile_index.json,
+validated by content hash. Files read from a git revision are cached under
+their blob id, so diffing against the same revision again reads nothing;
+those entries survive working-tree runs and the least recently used are
+dropped beyond GIT_ENTRY_LIMIT.
+
+ext_resources that carry only a uid are resolved through the uid
+declared by .tscn/.tres headers and by .import/.uid sidecars, so uid-only
+references to resources and imported assets are followed as well.
+
+--diff compares two revisions (A..B) or a revision and the working tree
+(A) and lists the scenes whose cost changed. Imported artifacts are not
+versioned, so in --diff mode both sides count source bytes. With budgets
+(--max-nodes, --max-depth, --max-bytes) the exit status is 1 when a scene
+exceeds one; in --diff mode only scenes whose cost changed are checked, so
+a change is blocked for the hitches it adds, not for existing ones.
+
+Usage:
+    python3 tools/scene_profile.py                          # Top scenes by node count
+    python3 tools/scene_profile.py scenes/core/gameplay/gameplay_base.tscn
+    python3 tools/scene_profile.py --sort bytes --top 10
+    python3 tools/scene_profile.py --rev origin/main        # Profile another revision
+    python3 tools/scene_profile.py --diff origin/main       # origin/main vs working tree
+    python3 tools/scene_profile.py --diff HEAD~5..HEAD --max-nodes 400 --max-depth 4
+    python3 tools/scene_profile.py --max-bytes 4000000 --format sarif > scenes.sarif
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from gd_config import is_excluded, load_config
+from gd_file_index import FileIndex
+from gd_output import EXIT_CLEAN, EXIT_ERROR, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_profile import active, add_profile_arguments, start_profiler
+from gd_scanner import walk_tree
+from preload_cost_report import format_bytes, load_bytes
+from res_dep_graph import ATTR_PATTERN, EXCLUDED_DIRS, HEADER_UID_PATTERN, resolve_reference, to_res_path
+from validate_resource_refs import SIDECAR_SUFFIXES, owner_of, parse_header_facts
+
+# Section headers of the text scene/resource format
+SECTION_PATTERN = re.compile(
+    r'^\[(gd_scene|gd_resource|ext_resource|sub_resource|node|connection|editable|resource)\b')
+INSTANCE_PATTERN = re.compile(r'\binstance=ExtResource\(\s*"([^"]+)"\s*\)')
+SCRIPT_PROPERTY_PREFIX = "script = "
+
+# Files whose ext_resources are followed (binary .res/.scn are counted as leaves)
+TEXT_RESOURCE_SUFFIXES = (".tscn", ".tres")
+# Files declaring the uid a uid-only ext_resource may name
+UID_SUFFIXES = TEXT_RESOURCE_SUFFIXES + SIDECAR_SUFFIXES
+
+# git:<blob> entries kept beyond those a run used (least recently used dropped first)
+GIT_ENTRY_LIMIT = 4096
+
+METRICS = ["nodes", "depth", "sub_resources", "scripts", "bytes"]
+
+RULES = {
+    "scene-nodes": "scene instantiates more nodes than the budget",
+    "scene-depth": "scene instancing is nested deeper than the budget",
+    "scene-bytes": "scene loads more bytes than the budget",
+    "scene-instance-cycle": "scene instances itself through a chain of scenes",
+}
+
+
+def iter_sections(lines):
+    """
+    Stream (tag, header, script) per section of a .tscn/.tres.
+
+    tag is the section kind ("node", "ext_resource", ...), header the
+    section's header line and script the value of its `script = ...`
+    property (None without one). Section bodies are skipped line by line
+    without being parsed or kept.
+    """
+    tag = None
+    header = None
+    script = None
+    for line in lines:
+        if line.startswith('['):
+            match = SECTION_PATTERN.match(line)
+            if match:
+                if tag is not None:
+                    yield tag, header, script
+                tag, header, script = match.group(1), line, None
+                continue
+        if tag is not None and line.startswith(SCRIPT_PROPERTY_PREFIX):
+            script = line[len(SCRIPT_PROPERTY_PREFIX):].strip()
+    if tag is not None:
+        yield tag, header, script
+
+
+def parse_scene_facts(text):
+    """
+    Return the per-file counters of a .tscn/.tres.
+
+    ext maps ext_resource id -> path (the uid when it has no path);
+    instances lists the ext ids of instancing nodes, one per node;
+    inherits is the ext id of the base scene of an inherited scene.
+    """
+    facts = {'uid': None, 'ext': {}, 'nodes': 0, 'scripts': 0, 'sub_resources': 0,
+             'instances': [], 'inherits': None}
+    for tag, header, script in iter_sections(text.splitlines()):
+        if tag == "ext_resource":
+            attrs = dict(ATTR_PATTERN.findall(header))
+            if 'id' in attrs:
+                facts['ext'][attrs['id']] = attrs.get('path') or attrs.get('uid')
+        elif tag == "sub_resource":
+            facts['sub_resources'] += 1
+        elif tag == "node":
+            instance = INSTANCE_PATTERN.search(header)
+            if instance:
+                if ' parent="' in header:
+                    facts['instances'].append(instance.group(1))
+                else:
+                    facts['inherits'] = instance.group(1)
+            elif ' type="' not in header:
+                # Override of a node that an instanced or inherited scene creates
+                continue
+            facts['nodes'] += 1
+            if script:
+                facts['scripts'] += 1
+        elif tag in ("gd_scene", "gd_resource"):
+            match = HEADER_UID_PATTERN.match(header)
+            if match:
+                facts['uid'] = match.group(1)
+    return facts
+
+
+def parse_file_facts(rel_path, data):
+    """Return the counters of a .tscn/.tres, or just the declared uid of a sidecar."""
+    if rel_path.endswith(SIDECAR_SUFFIXES):
+        return {'uid': parse_header_facts(data, Path(rel_path).suffix)['uid']}
+    return parse_scene_facts(data.decode('utf-8'))
+
+
+class SceneIndex(FileIndex):
+    """FileIndex variant whose entries hold scene/resource counters."""
+
+    version = 1
+    filename = "scene_profile_index.json"
+
+    def extract(self, key, data):
+        return parse_file_facts(key, data)
+
+    def blob_facts(self, rel_path, blob_id, read_blob):
+        """Return the counters of a git blob, calling read_blob() only on a miss."""
+        key = f"git:{blob_id}"
+        if key in self._resolved:
+            return self._resolved[key]
+        entry = self.entries.get(key)
+        if entry:
+            self.hits += 1
+            facts = entry['facts']
+        else:
+            data = read_blob()
+            try:
+                facts = parse_file_facts(rel_path, data) if data is not None else None
+            except UnicodeDecodeError:
+                facts = None
+            if facts is not None:
+                self._record(key, 0, len(data), blob_id, facts)
+        self._resolved[key] = facts
+        return facts
+
+    def prune(self):
+        """
+        Drop entries for files not requested during this run.
+
+        git:<blob> entries are kept: a working-tree run never reads them, but
+        the next --diff against the same revision should. Those this run used
+        move to the end, and the oldest unused ones beyond GIT_ENTRY_LIMIT go.
+        """
+        used = [key for key in self.entries if key.startswith("git:") and key in self._resolved]
+        unused = [key for key in self.entries if key.startswith("git:") and key not in self._resolved]
+        stale = [key for key in self.entries
+                 if not key.startswith("git:") and key not in self._resolved]
+        stale += unused[:max(len(unused) + len(used) - GIT_ENTRY_LIMIT, 0)]
+        for key in stale:
+            del self.entries[key]
+
+        # Re-append used blob entries so the least recently used stay in front
+        order = [key for key in self.entries if key.startswith("git:")]
+        if used and order[-len(used):] != used:
+            for key in used:
+                self.entries[key] = self.entries.pop(key)
+            self._dirty = True
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+
+class WorkTree:
+    """The checked-out project as seen by the profiler."""
+
+    def __init__(self, project_root, index, exclude, source_bytes=False):
+        self.project_root = Path(project_root)
+        self.index = index
+        self.source_bytes = source_bytes
+        self.label = "working tree"
+        tree = walk_tree(self.project_root, EXCLUDED_DIRS, exclude)
+        self.paths = {rel_path: path for path, rel_path in tree.files}
+
+    def files(self, suffixes):
+        return sorted(rel for rel in self.paths if rel.endswith(suffixes))
+
+    def facts(self, rel_path):
+        return self.index.get_facts(self.paths[rel_path]) if rel_path in self.paths else None
+
+    def size(self, rel_path):
+        path = self.paths.get(rel_path)
+        if path is None:
+            return 0
+        size = path.stat().st_size
+        if self.source_bytes:
+            return size
+        return load_bytes(self.project_root, "res://" + rel_path, size)
+
+    def close(self):
+        pass
+
+
+class GitTree:
+    """A committed revision, read through one `git cat-file --batch` process."""
+
+    def __init__(self, project_root, rev, index, exclude):
+        self.project_root = Path(project_root)
+        self.index = index
+        self.label = rev
+        output = subprocess.run(
+            ['git', 'ls-tree', '-r', '-l', '-z', '--full-tree', rev],
+            capture_output=True,
+            cwd=project_root
+        )
+        if output.returncode != 0:
+            raise RuntimeError(f"git ls-tree {rev} failed: {output.stderr.decode().strip()}")
+
+        # rel path -> (blob id, size)
+        self.blobs = {}
+        for record in output.stdout.decode('utf-8', 'replace').split('\0'):
+            if not record:
+                continue
+            meta, rel_path = record.split('\t', 1)
+            _mode, kind, blob_id, size = meta.split()
+            if kind != 'blob' or is_excluded_path(rel_path, exclude):
+                continue
+            self.blobs[rel_path] = (blob_id, int(size))
+        self._process = None
+
+    def files(self, suffixes):
+        return sorted(rel for rel in self.blobs if rel.endswith(suffixes))
+
+    def _read_blob(self, blob_id):
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ['git', 'cat-file', '--batch'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=self.project_root
+            )
+        self._process.stdin.write(blob_id.encode() + b"\n")
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().split()
+        if len(header) < 3 or header[1] == b"missing":
+            print(f"Error reading {self.label}:{blob_id}: missing object")
+            return None
+        data = self._process.stdout.read(int(header[2]))
+        self._process.stdout.read(1)
+        active().file_read(len(data))
+        return data
+
+    def facts(self, rel_path):
+        blob = self.blobs.get(rel_path)
+        if blob is None:
+            return None
+        return self.index.blob_facts(rel_path, blob[0], lambda: self._read_blob(blob[0]))
+
+    def size(self, rel_path):
+        blob = self.blobs.get(rel_path)
+        return blob[1] if blob else 0
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+
+
+def is_excluded_path(rel_path, exclude):
+    """Return True for paths walk_tree would skip."""
+    parts = rel_path.split('/')
+    return any(part in EXCLUDED_DIRS for part in parts[:-1]) or is_excluded(rel_path, exclude)
+
+
+class SceneProfiler:
+    """Resolves instanced scenes recursively over one tree, memoizing every file."""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._uids = None
+        self._memo = {}
+        self._active = []
+        self.cycles = []
+
+    def _rel_path(self, ref, source_rel):
+        """Return the project-relative path an ext_resource reference names, or None."""
+        if ref is None:
+            return None
+        if ref.startswith("uid://"):
+            if self._uids is None:
+                self._uids = {}
+                for rel_path in self.tree.files(UID_SUFFIXES):
+                    facts = self.tree.facts(rel_path)
+                    if facts and facts['uid']:
+                        self._uids[facts['uid']] = owner_of(rel_path)
+            return self._uids.get(ref)
+        return resolve_reference(ref, to_res_path(source_rel))[len("res://"):]
+
+    def resolve(self, rel_path):
+        """
+        Return the recursive cost of one file.
+
+        {'nodes', 'depth', 'scripts', 'closure'}; closure is the set of
+        files loaded with it, itself included.
+        """
+        if rel_path in self._memo:
+            return self._memo[rel_path]
+        if rel_path in self._active:
+            cycle = self._active[self._active.index(rel_path):] + [rel_path]
+            self.cycles.append(cycle)
+            return {'nodes': 1, 'depth': 0, 'scripts': 0, 'closure': frozenset([rel_path])}
+
+        facts = self.tree.facts(rel_path) if rel_path.endswith(TEXT_RESOURCE_SUFFIXES) else None
+        if facts is None:
+            cost = {'nodes': 0, 'depth': 0, 'scripts': 0, 'closure': frozenset([rel_path])}
+            self._memo[rel_path] = cost
+            return cost
+
+        self._active.append(rel_path)
+        targets = {ext_id: self._rel_path(ref, rel_path) for ext_id, ref in facts['ext'].items()}
+        closure = {rel_path}
+        for target in targets.values():
+            if target is not None:
+                closure |= self.resolve(target)['closure']
+
+        nodes = facts['nodes']
+        scripts = facts['scripts']
+        depth = 0
+        instanced = list(facts['instances'])
+        if facts['inherits'] is not None:
+            instanced.append(facts['inherits'])
+        for ext_id in instanced:
+            target = targets.get(ext_id)
+            if target is None:
+                continue
+            child = self.resolve(target)
+            # The instancing node stands in for the child's root node
+            nodes += max(child['nodes'] - 1, 0)
+            scripts += child['scripts']
+            depth = max(depth, child['depth'] + 1)
+        self._active.pop()
+
+        cost = {'nodes': nodes, 'depth': depth, 'scripts': scripts, 'closure': frozenset(closure)}
+        self._memo[rel_path] = cost
+        return cost
+
+    def profile(self, rel_path):
+        """Return the METRICS of one scene, or None if it cannot be read."""
+        if self.tree.facts(rel_path) is None:
+            return None
+        cost = self.resolve(rel_path)
+        sub_resources = 0
+        for member in cost['closure']:
+            if member.endswith(TEXT_RESOURCE_SUFFIXES):
+                facts = self.tree.facts(member)
+                sub_resources += facts['sub_resources'] if facts else 0
+        return {
+            'nodes': cost['nodes'],
+            'depth': cost['depth'],
+            'sub_resources': sub_resources,
+            'scripts': cost['scripts'],
+            'bytes': sum(self.tree.size(member) for member in cost['closure']),
+        }
+
+
+def profile_tree(tree, scenes):
+    """Return ({rel_path: metrics}, cycles) for scenes of one tree."""
+    profiler = SceneProfiler(tree)
+    results = {}
+    for rel_path in scenes:
+        metrics = profiler.profile(rel_path)
+        if metrics is not None:
+            results[rel_path] = metrics
+    return results, profiler.cycles
+
+
+def scene_rel_path(project_root, scene):
+    """Return the project-relative path of a scene given as res://, relative or absolute path."""
+    if scene.startswith("res://"):
+        return scene[len("res://"):]
+    resolved = Path(scene).resolve()
+    try:
+        return resolved.relative_to(Path(project_root).resolve()).as_posix()
+    except ValueError:
+        return Path(scene).as_posix()
+
+
+def budget_violations(metrics, args):
+    """Yield (rule, message) for every budget a scene exceeds."""
+    if args.max_nodes is not None and metrics['nodes'] > args.max_nodes:
+        yield "scene-nodes", f"instantiates {metrics['nodes']} nodes (budget {args.max_nodes})"
+    if args.max_depth is not None and metrics['depth'] > args.max_depth:
+        yield "scene-depth", f"instancing depth {metrics['depth']} (budget {args.max_depth})"
+    if args.max_bytes is not None and metrics['bytes'] > args.max_bytes:
+        yield "scene-bytes", (f"loads {format_bytes(metrics['bytes'])} "
+                              f"(budget {format_bytes(args.max_bytes)})")
+
+
+def format_metric(name, value):
+    return format_bytes(value) if name == 'bytes' else str(value)
+
+
+def format_delta(name, old, new):
+    if old == new:
+        return format_metric(name, new)
+    delta = new - old
+    sign = "+" if delta > 0 else "-"
+    change = format_bytes(abs(delta)) if name == 'bytes' else str(abs(delta))
+    return f"{format_metric(name, old)} → {format_metric(name, new)} ({sign}{change})"
+
+
+def print_table(results, sort_key, top):
+    ranked = sorted(results.items(), key=lambda item: (-item[1][sort_key], item[0]))
+    if top:
+        ranked = ranked[:top]
+    print(f"{'Nodes':>7} {'Depth':>5} {'SubRes':>6} {'Scripts':>7} {'Bytes':>10}  Scene")
+    for rel_path, metrics in ranked:
+        print(f"{metrics['nodes']:7d} {metrics['depth']:5d} {metrics['sub_resources']:6d} "
+              f"{metrics['scripts']:7d} {format_bytes(metrics['bytes']):>10}  {rel_path}")
+
+
+def print_changes(old_results, new_results, sort_key):
+    added = sorted(set(new_results) - set(old_results))
+    removed = sorted(set(old_results) - set(new_results))
+    changed = [rel for rel in set(new_results) & set(old_results)
+               if new_results[rel] != old_results[rel]]
+    changed.sort(key=lambda rel: (-(new_results[rel][sort_key] - old_results[rel][sort_key]), rel))
+
+    for rel_path in changed:
+        print(f"📄 {rel_path}")
+        for name in METRICS:
+            old, new = old_results[rel_path][name], new_results[rel_path][name]
+            if old != new:
+                print(f"   {name:<14} {format_delta(name, old, new)}")
+    for rel_path in added:
+        metrics = new_results[rel_path]
+        print(f"➕ {rel_path}: " + ", ".join(f"{name} {format_metric(name, metrics[name])}"
+                                            for name in METRICS))
+    for rel_path in removed:
+        print(f"➖ {rel_path}")
+    return changed + added
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predict the instantiation cost of .tscn scenes')
+    parser.add_argument('scenes', nargs='*', help='Scenes to report (default: every .tscn)')
+    revision = parser.add_mutually_exclusive_group()
+    revision.add_argument('--rev', metavar='REV', help='Profile a git revision instead of the working tree')
+    revision.add_argument('--diff', metavar='A[..B]',
+                          help='Report scenes whose cost changed between A and B (default B: working tree)')
+    parser.add_argument('--sort', choices=METRICS, default='nodes', help='Ranking metric (default: nodes)')
+    parser.add_argument('--top', type=int, default=20, help='Scenes to list, 0 = all (default: 20)')
+    parser.add_argument('--max-nodes', type=int, help='Budget: nodes per instantiate()')
+    parser.add_argument('--max-depth', type=int, help='Budget: instancing depth')
+    parser.add_argument('--max-bytes', type=int, help='Budget: bytes loaded with the scene')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-read every file')
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    writer = open_writer(args.format, "scene_profile", RULES)
+    profiler = start_profiler("scene_profile", project_root, args)
+
+    print("=== Scene Complexity Profile ===")
+
+    with profiler.phase("index_load"):
+        index = SceneIndex(project_root) if args.no_cache else SceneIndex.load(project_root)
+
+    trees = []
+    try:
+        with profiler.phase("walk"):
+            if args.diff:
+                old_rev, _, new_rev = args.diff.partition('..')
+                trees.append(GitTree(project_root, old_rev.rstrip('.'), index, config['exclude']))
+                if new_rev.lstrip('.'):
+                    trees.append(GitTree(project_root, new_rev.lstrip('.'), index, config['exclude']))
+                else:
+                    trees.append(WorkTree(project_root, index, config['exclude'], source_bytes=True))
+            elif args.rev:
+                trees.append(GitTree(project_root, args.rev, index, config['exclude']))
+            else:
+                trees.append(WorkTree(project_root, index, config['exclude']))
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+
+    print(f"Revision: {' → '.join(tree.label for tree in trees)}")
+    print()
+
+    wanted = [scene_rel_path(project_root, scene) for scene in args.scenes]
+    results = []
+    with profiler.phase("profile"):
+        for tree in trees:
+            scenes = wanted or tree.files((".tscn",))
+            tree_results, tree_cycles = profile_tree(tree, scenes)
+            results.append(tree_results)
+            cycles = tree_cycles
+            tree.close()
+    with profiler.phase("index_save"):
+        # Entries of files this run did not reach must survive a partial run
+        if not wanted:
+            index.prune()
+        index.save()
+
+    new_results = results[-1]
+    checked = sorted(new_results)
+    if args.diff:
+        print("=== Changed Scenes ===")
+        print()
+        checked = print_changes(results[0], new_results, args.sort)
+        if not checked:
+            print("✅ No scene cost changed")
+        print()
+    elif writer is None:
+        for scene in wanted:
+            if scene not in new_results:
+                print(f"⚠️  Not a readable scene in {trees[-1].label}: {scene}")
+        print_table(new_results, args.sort, 0 if wanted else args.top)
+        print()
+
+    findings = 0
+    seen_cycles = set()
+    for cycle in cycles:
+        key = frozenset(cycle)
+        if key in seen_cycles:
+            continue
+        seen_cycles.add(key)
+        findings += 1
+        message = f"instance cycle: {' → '.join(cycle)}"
+        if writer is not None:
+            writer.emit("scene-instance-cycle", cycle[0], 1, message, level='error')
+        else:
+            print(f"❌ {cycle[0]}: {message}")
+    for rel_path in checked:
+        for rule, message in budget_violations(new_results[rel_path], args):
+            findings += 1
+            if writer is not None:
+                writer.emit(rule, rel_path, 1, message, level='error', **new_results[rel_path])
+            else:
+                print(f"❌ {rel_path}: {message}")
+
+    if writer is not None:
+        profiler.finish(index)
+        sys.exit(writer.close({'scenes': len(new_results), 'changed': len(checked) if args.diff else None}))
+
+    print()
+    print("=== Summary ===")
+    print(f"Scenes profiled: {len(new_results)}")
+    if args.diff:
+        print(f"Scenes changed: {len(checked)}")
+    print(f"Budget violations and cycles: {findings}")
+    print(index.summary())
+    profiler.finish(index)
+
+    sys.exit(EXIT_FINDINGS if findings else EXIT_CLEAN)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Select the GUT test scripts affected by a change.
+
+Maps changed files (from git diff) to the test scripts that depend on them
+through preload()/load(), extends, class_name references and .tscn/.tres
+[ext_resource] links, following dependencies transitively. Changes to
+global files (project.godot, the GUT addon) select the full suite.
+
+Per-file references are kept in .tools_cache/test_impact_index.json and
+revalidated by mtime/size, so a selection on an unchanged tree only stats
+files and walks the reverse-dependency graph.
+
+Changed files are those git diff reports plus untracked (not ignored)
+files, so a new test or script is selected before it is ever added.
+
+The argument line goes to stdout and the report to stderr, so the output
+can be passed straight to the suite runners. When no test is affected the
+output is the --no-tests marker, which both run_gut_suite.sh and
+run_gut_sharded.py treat as "nothing to run" (without it they would fall
+back to the full suite).
+
+Usage:
+    tools/run_gut_suite.sh $(python3 tools/select_tests.py)              # vs HEAD
+    tools/run_gut_suite.sh $(python3 tools/select_tests.py --since main)
+    python3 tools/select_tests.py --staged --list
+    python3 tools/run_gut_sharded.py $(python3 tools/select_tests.py --list --since main)
+    python3 tools/select_tests.py --since main --profile
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+from gd_changes import base_class_name, git_changed_paths
+from gd_file_index import FileIndex
+from gd_lexer import NAME, OP, STRING, string_value, tokenize
+from gd_profile import add_profile_arguments, start_profiler
+from res_dep_graph import EXCLUDED_DIRS, resolve_reference, to_res_path
+from run_gut_sharded import TEST_PREFIX, TESTS_DIR
+from validate_resource_refs import (
+    RESOURCE_SUFFIXES,
+    SIDECAR_SUFFIXES,
+    owner_of,
+    parse_header_facts,
+    read_header,
+)
+
+# Changes to these select the whole suite
+GLOBAL_FILES = {"project.godot", ".gutconfig.json", "tools/run_gut_suite.sh"}
+GLOBAL_PREFIXES = ("addons/gut/",)
+
+FULL_SUITE_ARGS = ["-gdir=res://tests", "-ginclude_subdirs=true"]
+# Printed for an empty selection; the runners exit without running anything
+NO_TESTS_MARKER = "--no-tests"
+
+# Names a bare load() call may be qualified with and still load a resource
+LOAD_OWNERS = {"ResourceLoader"}
+
+
+def parse_script_refs(text):
+    """
+    Return the class_name, raw res:// references and capitalised names of a script.
+
+    Everything comes from lexer tokens, so names inside comments and strings
+    never become edges. Attribute names (after '.') are skipped: only a bare
+    capitalised NAME can refer to a global class_name.
+    """
+    tokens = list(tokenize(text))
+    class_name = None
+    refs = []
+    names = set()
+    # Every NAME is followed by at least NEWLINE and EOF, so i + 2 is in range
+    for i, token in enumerate(tokens):
+        if token.kind != NAME:
+            continue
+        value = token.value
+        after = tokens[i + 1]
+        after_dot = i > 0 and tokens[i - 1].kind == OP and tokens[i - 1].value == '.'
+        if value == 'class_name':
+            if after.kind == NAME and class_name is None:
+                class_name = after.value
+        elif value == 'extends':
+            if after.kind == STRING:
+                refs.append(string_value(after.value))
+        elif value in ('preload', 'load'):
+            if after_dot and (value == 'preload' or tokens[i - 2].value not in LOAD_OWNERS):
+                continue
+            if after.value == '(' and tokens[i + 2].kind == STRING:
+                refs.append(string_value(tokens[i + 2].value))
+        elif value[0].isupper() and not after_dot:
+            names.add(value)
+
+    return {
+        'class_name': class_name,
+        'refs': refs,
+        'names': sorted(names),
+    }
+
+
+class ImpactIndex(FileIndex):
+    """FileIndex variant holding the outgoing references of every project file."""
+
+    version = 2
+    filename = "test_impact_index.json"
+
+    def read(self, file_path):
+        file_path = Path(file_path)
+        if file_path.suffix == '.gd':
+            return super().read(file_path)
+        return read_header(file_path)
+
+    def extract(self, key, data):
+        if key.endswith('.gd'):
+            return parse_script_refs(data.decode('utf-8', errors='replace'))
+        return parse_header_facts(data, Path(key).suffix)
+
+    def report_error(self, message):
+        # stdout carries the runner arguments
+        print(message, file=sys.stderr)
+
+
+def iter_indexed_files(project_root):
+    suffixes = ('.gd',) + RESOURCE_SUFFIXES + SIDECAR_SUFFIXES
+    for root, dirs, files in os.walk(project_root):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        for name in sorted(files):
+            if name.endswith(suffixes):
+                yield Path(root) / name
+
+
+def is_test_script(res_path):
+    rel = res_path[len("res://"):]
+    return (rel.startswith(TESTS_DIR + "/") and rel.endswith(".gd")
+            and rel.rsplit("/", 1)[-1].startswith(TEST_PREFIX))
+
+
+def build_reverse_index(facts_by_path):
+    """Return (reverse {target: {sources}}, {class_name: path}) from per-file facts."""
+    uid_to_path = {}
+    class_paths = {}
+    for res_path, facts in facts_by_path.items():
+        if facts.get('uid'):
+            uid_to_path[facts['uid']] = owner_of(res_path)
+        if facts.get('class_name'):
+            class_paths[facts['class_name']] = res_path
+
+    reverse = defaultdict(set)
+    for res_path, facts in facts_by_path.items():
+        if res_path.endswith('.gd'):
+            refs = [resolve_reference(ref, res_path) for ref in facts['refs']]
+            refs += [class_paths[name] for name in facts['names'] if name in class_paths]
+        elif res_path.endswith(RESOURCE_SUFFIXES):
+            refs = [resolve_reference(ref['path'], res_path) if ref['path'] else ref['uid']
+                    for ref in facts['ext_resources']]
+        else:
+            continue
+        for ref in refs:
+            if ref and ref.startswith("uid://"):
+                ref = uid_to_path.get(ref, ref)
+            if ref and ref != res_path:
+                reverse[ref].add(res_path)
+    return reverse, class_paths
+
+
+def affected_tests(changed, reverse):
+    """Return the test scripts that transitively depend on any changed path."""
+    seen = set(changed)
+    queue = deque(changed)
+    while queue:
+        node = queue.popleft()
+        for source in reverse.get(node, ()):
+            if source not in seen:
+                seen.add(source)
+                queue.append(source)
+    return sorted(path for path in seen if is_test_script(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Select GUT tests affected by changed files')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--since', metavar='REV',
+                       help='Files changed since REV plus untracked files (default: uncommitted changes vs HEAD)')
+    group.add_argument('--staged', action='store_true',
+                       help='Files staged for commit')
+    group.add_argument('--files', nargs='+', metavar='PATH',
+                       help='Treat the given files as changed')
+    parser.add_argument('--list', action='store_true',
+                        help='Print selected test paths one per line instead of GUT arguments')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-read every file')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if not (args.since or args.staged or args.files):
+        args.since = 'HEAD'
+
+    project_root = Path(__file__).parent.parent
+    profiler = start_profiler("select_tests", project_root, args)
+    start = time.perf_counter()
+
+    def report(message=""):
+        print(message, file=sys.stderr)
+
+    def finish_profile(index=None):
+        # The profile summary must not end up in the runner arguments on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            profiler.finish(index)
+
+    try:
+        with profiler.phase("changes"):
+            base_rev, changed = git_changed_paths(project_root, args)
+    except RuntimeError as e:
+        report(f"❌ {e}")
+        sys.exit(2)
+
+    report("=== Test Impact Selection ===")
+    report(f"Changed files: {len(changed)}")
+
+    global_changes = [p for p in changed if p in GLOBAL_FILES or p.startswith(GLOBAL_PREFIXES)]
+    if global_changes:
+        report(f"🌐 Global file changed ({global_changes[0]}): selecting the full suite")
+        if args.list:
+            print(TESTS_DIR)
+        else:
+            print(" ".join(FULL_SUITE_ARGS))
+        finish_profile()
+        return
+
+    with profiler.phase("index_load"):
+        index = ImpactIndex(project_root) if args.no_cache else ImpactIndex.load(project_root)
+    facts_by_path = {}
+    with profiler.phase("index"):
+        for file_path in iter_indexed_files(project_root):
+            facts = index.get_facts(file_path)
+            if facts is not None:
+                facts_by_path[to_res_path(file_path.relative_to(project_root))] = facts
+    with profiler.phase("index_save"):
+        index.prune()
+        index.save()
+
+    with profiler.phase("graph"):
+        reverse, class_paths = build_reverse_index(facts_by_path)
+
+    # A script whose class_name changed or vanished still affects every user
+    # of the old name, which the current tree can no longer resolve to it
+    seeds = [to_res_path(path) for path in changed]
+    with profiler.phase("renames"):
+        for path in changed:
+            if not path.endswith('.gd'):
+                continue
+            res_path = to_res_path(path)
+            current = facts_by_path.get(res_path, {}).get('class_name')
+            previous = base_class_name(project_root, base_rev, path)
+            if previous and previous != current:
+                seeds.extend(source for source, facts in facts_by_path.items()
+                             if source.endswith('.gd') and previous in facts['names'])
+
+    with profiler.phase("select"):
+        tests = affected_tests(seeds, reverse)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    total_tests = sum(1 for path in facts_by_path if is_test_script(path))
+    report(f"Selected tests: {len(tests)} of {total_tests}")
+    report(index.summary())
+    report(f"Elapsed: {elapsed_ms:.0f} ms")
+    for test in tests:
+        report(f"   {test}")
+    if not tests:
+        report("✅ No tests depend on the changed files")
+
+    if not tests:
+        print(NO_TESTS_MARKER)
+    elif args.list:
+        for test in tests:
+            print(test[len("res://"):])
+    else:
+        print("-gtest=" + ",".join(tests))
+    finish_profile(index)
+
+
+if __name__ == "__main__":
+    main()
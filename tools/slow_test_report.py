@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Static slow-test detector for the GUT suite.
+
+Adds up the real time each test waits on, as far as it is known without
+running it:
+
+- await wait_seconds(s) / await get_tree().create_timer(s).timeout -> s seconds
+- await wait_frames(n), wait_process_frames(n), wait_idle_frames(n) -> n process frames
+- await wait_physics_frames(n)                                   -> n physics frames
+- await get_tree().process_frame / .physics_frame                -> 1 frame
+
+Amounts may be literals, arithmetic on the file's consts, or parameters of
+a helper defined in the same file; awaited calls to such helpers are
+followed with their arguments bound, so `await _await_frames(10)` counts
+the frames its loop waits. A `for` over range(n) (or over n) multiplies
+the waits in its body by n. Waits whose amount is not static, or that sit
+inside a while loop or a loop of unknown length, count once and make the
+total a lower bound (shown as "≥"). Waits in a `for` whose body can
+`return` or `break` (a polling loop with a timeout) count as if the loop
+ran to its limit but only as an upper bound (shown as "≤"); they are left
+out of the budget check, which would otherwise flag timeouts.
+
+Per test the waits are turned into an estimate at --fps frames per second
+(default: the project's physics tick rate). A file's total also counts
+before_each/after_each once per test and before_all/after_all once.
+
+The per-file wait budget (seconds) comes from `[tests] wait_budget` in
+gdtools.toml or --budget; files over it are reported and the exit status
+is 1. Per-file results are cached in .tools_cache/slow_test_index.json,
+validated by content hash.
+
+Usage:
+    python3 tools/slow_test_report.py                     # Rank files and tests by wait time
+    python3 tools/slow_test_report.py --top 30
+    python3 tools/slow_test_report.py --budget 2.5        # Override the configured budget
+    python3 tools/slow_test_report.py --staged            # Only test files staged for commit
+    python3 tools/slow_test_report.py --format ndjson > slow_tests.ndjson
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from gd_changes import (add_change_arguments, describe_change_mode, git_changed_paths, is_change_mode,
+                        staged_blobs)
+from gd_config import load_config
+from gd_file_index import FileIndex
+from gd_lexer import DEDENT, INDENT, NAME, NEWLINE, NUMBER, OP, tokenize
+from gd_output import EXIT_CLEAN, EXIT_ERROR, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_parser import iter_functions, matching_bracket, parse_tokens, split_top_level
+from gd_profile import add_profile_arguments, start_profiler
+from gd_scanner import default_jobs, index_files, iter_gd_files
+from hot_path_lint import find_functions
+
+TEST_DIRS = ["tests/"]
+
+# Awaited calls whose first argument is a wait in seconds
+SECONDS_CALLS = {"wait_seconds", "create_timer"}
+# Awaited GUT calls whose first argument is a frame count -> frame kind
+FRAME_CALLS = {
+    "wait_frames": "process",
+    "wait_process_frames": "process",
+    "wait_idle_frames": "process",
+    "wait_physics_frames": "physics",
+}
+# SceneTree signals that fire once per frame -> frame kind
+FRAME_SIGNALS = {"process_frame": "process", "physics_frame": "physics"}
+
+# GUT hooks: run around every test, or once per file
+PER_TEST_HOOKS = ("before_each", "after_each")
+PER_FILE_HOOKS = ("before_all", "after_all")
+
+ARITHMETIC_OPS = {"+", "-", "*", "/", "%", "(", ")"}
+
+PHYSICS_TICKS_PATTERN = re.compile(r'^common/physics_ticks_per_second\s*=\s*(\d+)')
+DEFAULT_FPS = 60
+
+RULES = {
+    "test-wait-budget": "test file waits on real time longer than the budget",
+}
+
+
+def static_value(tokens, env):
+    """Return the number an expression of literals and env names evaluates to, or None."""
+    parts = []
+    for token in tokens:
+        if token.kind == NUMBER:
+            parts.append(token.value)
+        elif token.kind == OP and token.value in ARITHMETIC_OPS:
+            parts.append(token.value)
+        elif token.kind == NAME and isinstance(env.get(token.value), (int, float)):
+            parts.append(repr(env[token.value]))
+        else:
+            return None
+    if not parts:
+        return None
+    try:
+        # Only digits, names already replaced by numbers, and operators get here
+        value = eval("".join(parts), {"__builtins__": {}}, {})
+    except (SyntaxError, ArithmeticError, TypeError):
+        return None
+    return value if isinstance(value, (int, float)) else None
+
+
+def expression_value(text, env):
+    """static_value() of an expression given as source text."""
+    tokens = [t for t in tokenize(text) if t.kind in (NAME, NUMBER, OP)]
+    return static_value(tokens, env)
+
+
+def empty_amounts():
+    return {'seconds': 0.0, 'process_frames': 0, 'physics_frames': 0}
+
+
+def empty_cost():
+    # capped: the part of the amounts that sits in loops able to exit early
+    return {**empty_amounts(), 'dynamic': 0, 'capped': empty_amounts(), 'waits': []}
+
+
+def add_wait(cost, line, what, seconds=0.0, process_frames=0, physics_frames=0, dynamic=0,
+             capped=None):
+    """Add one wait; capped is the part of its amounts that is only an upper bound."""
+    cost['seconds'] += seconds
+    cost['process_frames'] += process_frames
+    cost['physics_frames'] += physics_frames
+    cost['dynamic'] += dynamic
+    if capped:
+        for key in capped:
+            cost['capped'][key] += capped[key]
+    cost['waits'].append({'line': line, 'what': what, 'seconds': seconds,
+                          'process_frames': process_frames, 'physics_frames': physics_frames,
+                          'dynamic': dynamic, 'capped': bool(capped and any(capped.values()))})
+
+
+def loop_count(tokens, i, end, env):
+    """Return (iterations, known) for the `for` statement at i."""
+    j = i + 1
+    while j < end and not (tokens[j].kind == NAME and tokens[j].value == 'in'):
+        j += 1
+    colon = j + 1
+    while colon < end and tokens[colon].kind != NEWLINE:
+        colon += 1
+    while colon > j and not (tokens[colon].kind == OP and tokens[colon].value == ':'):
+        colon -= 1
+    iterable = range(j + 1, colon)
+    if not iterable:
+        return 1, False
+
+    first = tokens[iterable[0]]
+    if first.kind == NAME and first.value == 'range' and tokens[iterable[0] + 1].value == '(':
+        close = matching_bracket(tokens, iterable[0] + 1)
+        args = [static_value([tokens[k] for k in part], env)
+                for part in split_top_level(tokens, iterable[0] + 2, close)]
+        if close != colon - 1 or not args or None in args:
+            return 1, False
+        start, stop, step = (0, args[0], 1) if len(args) == 1 else (args + [1])[:3]
+        if not step:
+            return 1, False
+        return max(0, int(-(-(stop - start) // step))), True
+
+    count = static_value([tokens[k] for k in iterable], env)
+    if isinstance(count, int):
+        return max(0, count), True
+    return 1, False
+
+
+def exits_early(tokens, i, end):
+    """Whether the body of the loop statement at i contains a return or a break of its own."""
+    j = i
+    while j < end and tokens[j].kind != NEWLINE:
+        j += 1
+    if j + 1 >= end or tokens[j + 1].kind != INDENT:
+        # Body on the header line
+        return any(t.kind == NAME and t.value in ('return', 'break') for t in tokens[i + 1:j])
+
+    depth = 0
+    nested = []                 # depths of the bodies of loops inside this one
+    loop_header = False         # the current line starts a nested loop
+    for k in range(j + 1, end):
+        token = tokens[k]
+        if token.kind == INDENT:
+            depth += 1
+            if loop_header:
+                nested.append(depth)
+            loop_header = False
+            continue
+        if token.kind == DEDENT:
+            if nested and nested[-1] == depth:
+                nested.pop()
+            depth -= 1
+            if depth == 0:
+                return False
+            continue
+        if token.kind == NEWLINE:
+            if tokens[k + 1].kind != INDENT:
+                loop_header = False
+            continue
+        if token.kind != NAME:
+            continue
+        if token.value == 'return':
+            return True
+        if token.value == 'break' and not nested and not loop_header:
+            return True
+        if token.value in ('for', 'while') and tokens[k - 1].kind in (NEWLINE, INDENT, DEDENT):
+            loop_header = True
+    return False
+
+
+class WaitAnalyzer:
+    """Resolves the waits of one file's functions, following awaited same-file helpers."""
+
+    def __init__(self, text, parse=parse_tokens):
+        self.tokens = list(tokenize(text))
+        tree = parse(self.tokens)
+        self.functions = find_functions(self.tokens, tree)
+        self.params = {(owner, func['name']): func['params'] for owner, func in iter_functions(tree)}
+        self.consts = {}
+        for const in tree['consts']:
+            value = expression_value(const['value'], self.consts)
+            if value is not None:
+                self.consts[const['name']] = value
+        self._memo = {}
+        self._active = set()
+
+    def cost(self, key, args=()):
+        """Return the wait cost of one call of function key with static args (None = unknown)."""
+        memo_key = (key, args)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        if key in self._active:
+            return empty_cost()
+
+        env = dict(self.consts)
+        for index, param in enumerate(self.params.get(key, [])):
+            if index < len(args):
+                env[param['name']] = args[index]
+            elif param['default'] is not None:
+                env[param['name']] = expression_value(param['default'], self.consts)
+            else:
+                env[param['name']] = None
+
+        self._active.add(key)
+        func = self.functions[key]
+        cost = self._scan(key[0], func['start'], func['end'], env)
+        self._active.discard(key)
+        self._memo[memo_key] = cost
+        return cost
+
+    def _scan(self, owner, start, end, env):
+        tokens = self.tokens
+        cost = empty_cost()
+        blocks = []                 # (iterations, known, exits_early) per open block
+        block_loop = (1, True, False)
+        awaiting = False
+
+        for i in range(start, end):
+            token = tokens[i]
+            kind, value = token.kind, token.value
+
+            if kind == INDENT:
+                blocks.append(block_loop)
+                continue
+            if kind == DEDENT:
+                if blocks:
+                    blocks.pop()
+                continue
+            if kind == NEWLINE:
+                continue
+            if tokens[i - 1].kind in (NEWLINE, INDENT, DEDENT) or i == start:
+                awaiting = False
+                if kind == NAME and value == 'for':
+                    block_loop = (*loop_count(tokens, i, end, env), exits_early(tokens, i, end))
+                elif kind == NAME and value == 'while':
+                    block_loop = (1, False, False)
+                else:
+                    block_loop = (1, True, False)
+
+            if kind != NAME:
+                continue
+            if value == 'await':
+                awaiting = True
+                continue
+            if not awaiting:
+                continue
+
+            times = 1
+            dynamic = 0
+            capped = False
+            for iterations, known, early in blocks:
+                times *= iterations
+                if not known:
+                    dynamic = 1
+                if early:
+                    capped = True
+            previous = tokens[i - 1]
+            following = tokens[i + 1]
+            is_method = previous.kind == OP and previous.value == '.'
+
+            if value in FRAME_SIGNALS and is_method and following.value not in ('.', '('):
+                frames = {FRAME_SIGNALS[value] + '_frames': times}
+                add_wait(cost, token.line, value, dynamic=dynamic, capped=frames if capped else None,
+                         **frames)
+                continue
+            if not (following.kind == OP and following.value == '('):
+                continue
+
+            close = matching_bracket(tokens, i + 1)
+            arg_parts = split_top_level(tokens, i + 2, close)
+            receiver = tokens[i - 2].value if is_method else None
+            helper = (owner, value)
+            if helper in self.functions and (not is_method or receiver == 'self'):
+                args = tuple(static_value([tokens[k] for k in part], env) for part in arg_parts)
+                inner = self.cost(helper, args)
+                if inner['seconds'] or inner['process_frames'] or inner['physics_frames'] or inner['dynamic']:
+                    amounts = {key: inner[key] * times for key in empty_amounts()}
+                    # Inside an early-exit loop the whole call is capped, else only its own capped part
+                    inner_capped = amounts if capped else {key: inner['capped'][key] * times
+                                                           for key in empty_amounts()}
+                    add_wait(cost, token.line, f"{value}()", dynamic=max(inner['dynamic'], dynamic),
+                             capped=inner_capped, **amounts)
+                continue
+
+            amount = static_value([tokens[k] for k in arg_parts[0]], env) if arg_parts else None
+            if value in SECONDS_CALLS:
+                seconds = (amount or 0) * times
+                add_wait(cost, token.line, value, seconds, dynamic=int(amount is None or dynamic),
+                         capped={'seconds': seconds} if capped else None)
+            elif value in FRAME_CALLS and not is_method:
+                frames = {FRAME_CALLS[value] + '_frames': (amount or 0) * times}
+                add_wait(cost, token.line, value, dynamic=int(amount is None or dynamic),
+                         capped=frames if capped else None, **frames)
+
+        return cost
+
+
+def analyze_source(text, parse=parse_tokens):
+    """
+    Return {'tests': [...], 'hooks': {...}} with the wait cost of a test file.
+
+    parse turns the token list into a gd_parser tree (see WaitAnalyzer).
+    """
+    if "func test_" not in text:
+        return {'tests': [], 'hooks': {}}
+
+    analyzer = WaitAnalyzer(text, parse)
+    tests = []
+    hooks = {}
+    for owner, name in analyzer.functions:
+        if owner is not None:
+            continue
+        if name.startswith("test_"):
+            cost = analyzer.cost((owner, name))
+            tests.append({'name': name, 'line': analyzer.functions[(owner, name)]['line'], **cost})
+        elif name in PER_TEST_HOOKS or name in PER_FILE_HOOKS:
+            hooks[name] = analyzer.cost((owner, name))
+    tests.sort(key=lambda test: test['line'])
+    return {'tests': tests, 'hooks': hooks}
+
+
+class SlowTestIndex(FileIndex):
+    """FileIndex variant whose entries hold each test file's wait cost."""
+
+    version = 2
+    filename = "slow_test_index.json"
+
+    extract_phase = "analyze"
+
+    def extract(self, key, data):
+        return analyze_source(data.decode('utf-8'), lambda tokens: self.parse_tree(data, tokens))
+
+
+def project_fps(project_root):
+    """Return the physics tick rate set in project.godot (Godot's default if unset)."""
+    try:
+        with open(Path(project_root) / "project.godot", 'r', encoding='utf-8') as f:
+            for line in f:
+                match = PHYSICS_TICKS_PATTERN.match(line)
+                if match:
+                    return int(match.group(1))
+    except OSError:
+        pass
+    return DEFAULT_FPS
+
+
+def estimate(cost, fps):
+    """Return the estimated seconds a cost waits at fps."""
+    return cost['seconds'] + (cost['process_frames'] + cost['physics_frames']) / fps
+
+
+def firm_estimate(cost, fps):
+    """Return the seconds of a cost that do not depend on a loop exiting early."""
+    return estimate(cost, fps) - estimate(cost['capped'], fps)
+
+
+def file_estimate(facts, fps):
+    """Return (seconds, firm_seconds, dynamic) for a whole test file, hooks included."""
+    hooks = facts['hooks']
+    seconds = sum(estimate(test, fps) for test in facts['tests'])
+    firm = sum(firm_estimate(test, fps) for test in facts['tests'])
+    dynamic = sum(test['dynamic'] for test in facts['tests'])
+    for name, hook in hooks.items():
+        runs = len(facts['tests']) if name in PER_TEST_HOOKS else 1
+        seconds += estimate(hook, fps) * runs
+        firm += firm_estimate(hook, fps) * runs
+        dynamic += hook['dynamic'] * runs
+    return seconds, firm, dynamic
+
+
+def format_seconds(seconds, dynamic, capped=False):
+    """Prefix "≥" for a lower bound, "≤" for an upper bound, "~" when it is both."""
+    marker = {(False, False): ' ', (True, False): '≥', (False, True): '≤', (True, True): '~'}
+    return f"{marker[(bool(dynamic), bool(capped))]}{seconds:7.2f}s"
+
+
+def format_frames(cost):
+    frames = []
+    if cost['process_frames']:
+        frames.append(f"{cost['process_frames']:g} process")
+    if cost['physics_frames']:
+        frames.append(f"{cost['physics_frames']:g} physics")
+    return f"{', '.join(frames)} frames" if frames else ""
+
+
+def print_report(ranked_files, ranked_tests, fps, top, budget, cache_summary, total_tests):
+    print(f"=== Slowest Test Files (frames at {fps} fps) ===")
+    print()
+    for rel_path, seconds, firm, dynamic, test_count in ranked_files[:top or None]:
+        over = " ❌ over budget" if budget is not None and firm > budget else ""
+        print(f"{format_seconds(seconds, dynamic, seconds > firm)}  {rel_path} ({test_count} tests){over}")
+    print()
+
+    print("=== Slowest Tests ===")
+    print()
+    for rel_path, test, seconds in ranked_tests[:top or None]:
+        capped = estimate(test['capped'], fps) > 0
+        print(f"{format_seconds(seconds, test['dynamic'], capped)}  {rel_path}:{test['line']} {test['name']}")
+        worst = sorted(test['waits'], key=lambda w: -estimate(w, fps))[:3]
+        for wait in worst:
+            detail = format_frames(wait) or f"{wait['seconds']:g}s"
+            if wait['capped']:
+                detail = f"up to {detail}, loop can exit early"
+            print(f"              Line {wait['line']:4d}: {wait['what']} ({detail})")
+    print()
+
+    total = sum(seconds for _rel, seconds, _firm, _dynamic, _count in ranked_files)
+    firm_total = sum(firm for _rel, _seconds, firm, _dynamic, _count in ranked_files)
+    print("=== Summary ===")
+    print(f"Test files: {len(ranked_files)}")
+    print(f"Tests: {total_tests}")
+    print(f"Statically known wait time: {firm_total:.1f}s")
+    if total > firm_total:
+        print(f"Plus up to {total - firm_total:.1f}s in loops that can exit early (not budgeted)")
+    if budget is not None:
+        over = sum(1 for _rel, _seconds, firm, _dynamic, _count in ranked_files if firm > budget)
+        print(f"Files over the {budget:g}s budget: {over}")
+    print(cache_summary)
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank GUT tests by the real time they wait on')
+    parser.add_argument('--top', type=int, default=20, help='Files and tests to list, 0 = all (default: 20)')
+    parser.add_argument('--budget', type=float,
+                        help='Per-file wait budget in seconds (default: [tests] wait_budget in gdtools.toml)')
+    parser.add_argument('--fps', type=int, help='Frames per second for frame waits (default: physics tick rate)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-analyze every file')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for cold files (default: CPU count, 1 = serial)')
+    add_change_arguments(parser)
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    budget = args.budget if args.budget is not None else config['test_wait_budget']
+    fps = args.fps or project_fps(project_root)
+    writer = open_writer(args.format, "slow_test_report", RULES)
+    profiler = start_profiler("slow_test_report", project_root, args)
+
+    print("=== Slow Test Report ===")
+    print(f"Project root: {project_root}")
+    print(f"Budget: {f'{budget:g}s per file' if budget is not None else 'none'}")
+    print()
+
+    with profiler.phase("index_load"):
+        index = SlowTestIndex(project_root) if args.no_cache else SlowTestIndex.load(project_root)
+    with profiler.phase("walk"):
+        walked = list(iter_gd_files(project_root, TEST_DIRS, config['exclude']))
+
+    if is_change_mode(args):
+        try:
+            _base_rev, changed = git_changed_paths(project_root, args)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+        changed = set(changed)
+        walked = [(gd_file, rel_path) for gd_file, rel_path in walked if rel_path in changed]
+        print(f"Mode: {describe_change_mode(args)} ({len(walked)} files to check)")
+        print()
+
+    with profiler.phase("analyze"):
+        if args.staged:
+            # Check what will be committed, not the working tree
+            try:
+                blobs = staged_blobs(project_root, [rel_path for _gd_file, rel_path in walked])
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                sys.exit(writer.close(failed=True) if writer is not None else EXIT_ERROR)
+            all_facts = [index.extract_content(gd_file, blobs[rel_path]) if rel_path in blobs else None
+                         for gd_file, rel_path in walked]
+        else:
+            all_facts = index_files([gd_file for gd_file, _rel in walked], index, args.jobs)
+    with profiler.phase("index_save"):
+        # A partial walk must not drop the entries of files it skipped
+        if not is_change_mode(args):
+            index.prune()
+        index.save()
+
+    ranked_files = []
+    ranked_tests = []
+    for (_gd_file, rel_path), facts in zip(walked, all_facts):
+        if not facts or not facts['tests']:
+            continue
+        seconds, firm, dynamic = file_estimate(facts, fps)
+        ranked_files.append((rel_path, seconds, firm, dynamic, len(facts['tests'])))
+        ranked_tests.extend((rel_path, test, estimate(test, fps)) for test in facts['tests'])
+    ranked_files.sort(key=lambda item: (-item[1], item[0]))
+    ranked_tests.sort(key=lambda item: (-item[2], item[0], item[1]['line']))
+
+    # Upper bounds from loops that can exit early are not held against the budget
+    over_budget = [item for item in ranked_files if budget is not None and item[2] > budget]
+    if writer is not None:
+        for rel_path, _seconds, firm, dynamic, test_count in over_budget:
+            slowest = next(test for rel, test, _seconds in ranked_tests if rel == rel_path)
+            writer.emit("test-wait-budget", rel_path, slowest['line'],
+                        f"tests wait {'at least ' if dynamic else ''}{firm:.2f}s (budget {budget:g}s); "
+                        f"slowest: {slowest['name']}",
+                        level='error', seconds=round(firm, 3), tests=test_count,
+                        slowest_test=slowest['name'])
+        profiler.finish(index)
+        sys.exit(writer.close({'files': len(ranked_files), 'tests': len(ranked_tests),
+                               'wait_seconds': round(sum(item[2] for item in ranked_files), 3),
+                               'capped_wait_seconds': round(sum(item[1] - item[2] for item in ranked_files), 3)}))
+
+    with profiler.phase("report"):
+        print_report(ranked_files, ranked_tests, fps, args.top, budget, index.summary(), len(ranked_tests))
+    profiler.finish(index)
+
+    if over_budget:
+        print(f"❌ {len(over_budget)} test files wait longer than the {budget:g}s budget")
+        print("💡 Fix: drive the code under test with a mocked time source instead of waiting")
+        sys.exit(EXIT_FINDINGS)
+    print("✅ All test files within the wait budget" if budget is not None else "✅ Done")
+    sys.exit(EXIT_CLEAN)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Static dispatch-frequency and subscriber analysis for the state store.
+
+Every M_StateStore.dispatch() runs the reducer of every registered slice,
+deep-copies the action, deep-copies the whole state once for the
+subscribe() callbacks (when there are any) and calls each of them, and
+emits action_dispatched; slices that changed are marked dirty for the
+batched slice_updated signal. A dispatch on every frame multiplies all of
+that by the frame rate.
+
+This maps, per action type:
+- the action creators in scripts/core/state/actions that build it
+  (const ACTION_X := StringName("slice/name") plus the static funcs whose
+  body references ACTION_X)
+- the slice reducers that handle it (the reducer registered per slice in
+  u_state_slice_manager.gd, following calls into other reducers)
+- the selectors (scripts/core/state/selectors) and store subscribers
+  (subscribe(), slice_updated and action_dispatched handlers) that read
+  the slices it changes
+- every dispatch(...) call site, resolved through the creator call, a
+  local var assigned from one, or ACTION_X referenced in the argument
+
+and flags dispatch sites reachable from _process, _physics_process or
+process_tick through helpers in the same file (the same roots and walk
+as hot_path_lint.py). Reachable does not mean every frame: a dispatch
+behind a throttle still shows up, with the helper chain that reaches it.
+
+Per-file facts are cached in .tools_cache/state_dispatch_index.json, and
+only files that mention the store's vocabulary are tokenized at all.
+
+Usage:
+    python3 tools/state_dispatch_report.py                       # Per-frame dispatches and action map
+    python3 tools/state_dispatch_report.py --action gameplay/    # Only action types with this prefix
+    python3 tools/state_dispatch_report.py --top 0               # List every action type
+    python3 tools/state_dispatch_report.py --fail-on-frame       # Exit 1 on per-frame dispatches
+    python3 tools/state_dispatch_report.py --format sarif > state_dispatch.sarif
+"""
+
+import argparse
+import re
+import sys
+from collections import defaultdict, deque
+from pathlib import Path
+
+from gd_config import load_config
+from gd_file_index import FileIndex
+from gd_lexer import DEDENT, INDENT, NAME, NEWLINE, OP, STRING, string_value, tokenize
+from gd_output import EXIT_CLEAN, EXIT_FINDINGS, add_format_argument, open_writer
+from gd_parser import matching_bracket, parse_tokens, split_top_level
+from gd_profile import add_profile_arguments, start_profiler
+from gd_scanner import default_jobs, index_files, iter_gd_files
+from hot_path_lint import FRAME_ROOTS, find_functions
+
+ACTIONS_DIR = "scripts/core/state/actions/"
+# Tests dispatch to exercise reducers, not at runtime
+TEST_DIRS = ("tests/",)
+REDUCERS_DIR = "scripts/core/state/reducers/"
+SELECTORS_DIR = "scripts/core/state/selectors/"
+SLICE_MANAGER = "scripts/core/state/utils/u_state_slice_manager.gd"
+
+# Files without any of these never touch the store
+MARKERS = ("dispatch(", "ACTION_", "subscribe(", "slice_updated", "action_dispatched",
+           "Selectors", "_SELECTORS", "reducer")
+# Store signals whose connect() registers a subscriber
+STORE_SIGNALS = ("slice_updated", "action_dispatched")
+# Calls whose first argument names a slice (or a key inside one)
+KEY_GETTERS = {"get", "get_slice", "has"}
+
+ACTION_VALUE_PATTERN = re.compile(r'^(?:StringName\(\s*)?&?"([^"]+)"\s*\)?$')
+SLICE_CONFIG_PATTERN = re.compile(r'RS_StateSliceConfig\.new\(\s*StringName\(\s*"(\w+)"\s*\)')
+SLICE_REDUCER_PATTERN = re.compile(r'\.reducer\s*=\s*Callable\(\s*(\w+)\s*,\s*"(\w+)"\s*\)')
+
+RULES = {
+    "state-dispatch-per-frame": "store dispatch reachable from a per-frame function",
+    "state-action-unhandled": "dispatched action type that no slice reducer handles",
+}
+
+
+def _label(key):
+    return f"{key[0]}.{key[1]}" if key[0] else key[1]
+
+
+def _statement_start(tokens, i):
+    while i > 0 and tokens[i - 1].kind not in (NEWLINE, INDENT, DEDENT):
+        i -= 1
+    return i
+
+
+def _is_key_string(tokens, i):
+    """True if STRING token i is a dictionary key or slice name rather than text."""
+    before, after = i - 1, i + 1
+    if tokens[before].value == '(' and tokens[before - 1].value == 'StringName':
+        before, after = before - 2, after + 1
+    prev = tokens[before]
+    if prev.kind == OP and prev.value == '(' and tokens[before - 1].value in KEY_GETTERS:
+        return True
+    if prev.kind == OP and prev.value == '[' and tokens[after].value == ']':
+        return True
+    return prev.value in ('==', '!=') or tokens[after].value in ('==', '!=')
+
+
+def scan_function(tokens, start, end, lines):
+    """
+    Return the store-related facts of one function body.
+
+    {'calls' (bare and self. callees), 'ext_calls' ([receiver, method] on
+    capitalized receivers), 'keys' (string keys read), 'action_refs'
+    ([receiver or None, ACTION_X]), 'dispatches', 'subscriptions'}.
+    """
+    facts = {'calls': [], 'ext_calls': [], 'keys': [], 'action_refs': [],
+             'dispatches': [], 'subscriptions': []}
+    assigned = {}
+    for i in range(start, end):
+        token = tokens[i]
+        if token.kind == STRING:
+            if _is_key_string(tokens, i):
+                facts['keys'].append(string_value(token.value))
+            continue
+        if token.kind != NAME:
+            continue
+
+        is_member = tokens[i - 1].kind == OP and tokens[i - 1].value == '.'
+        receiver = None
+        if is_member and tokens[i - 2].kind == NAME and tokens[i - 3].value != '.':
+            receiver = tokens[i - 2].value
+
+        if token.value.startswith("ACTION_"):
+            facts['action_refs'].append([receiver if is_member else None, token.value])
+            continue
+        if not (tokens[i + 1].kind == OP and tokens[i + 1].value == '('):
+            continue
+
+        close = matching_bracket(tokens, i + 1)
+        if not is_member or receiver == 'self':
+            facts['calls'].append(token.value)
+        elif receiver and receiver[0].isupper():
+            facts['ext_calls'].append([receiver, token.value])
+            # var action := U_X.creator(...), for dispatch(action) further down
+            if tokens[i - 3].kind == OP and tokens[i - 3].value in ('=', ':='):
+                first = _statement_start(tokens, i - 3)
+                target = tokens[first + 1] if tokens[first].value == 'var' else tokens[first]
+                assigned[target.value] = [receiver, token.value]
+
+        if not is_member:
+            continue
+        if token.value == 'dispatch':
+            args = split_top_level(tokens, i + 2, close)
+            if len(args) != 1:
+                continue
+            arg = args[0]
+            creator = None
+            if (len(arg) > 3 and tokens[arg[0]].kind == NAME and tokens[arg[1]].value == '.'
+                    and tokens[arg[2]].kind == NAME and tokens[arg[3]].value == '('):
+                creator = [tokens[arg[0]].value, tokens[arg[2]].value]
+            elif len(arg) == 1 and tokens[arg[0]].kind == NAME:
+                creator = assigned.get(tokens[arg[0]].value)
+            refs = [[tokens[j - 2].value if tokens[j - 1].value == '.' else None, tokens[j].value]
+                    for j in arg if tokens[j].kind == NAME and tokens[j].value.startswith("ACTION_")]
+            facts['dispatches'].append({
+                'line': token.line,
+                'creator': creator,
+                'action_refs': refs,
+                'text': lines[token.line - 1].strip(),
+            })
+        elif token.value == 'subscribe' or (token.value == 'connect' and tokens[i - 2].value in STORE_SIGNALS):
+            args = split_top_level(tokens, i + 2, close)
+            # The event buses' subscribe(event, callback) takes two arguments
+            if len(args) != 1:
+                continue
+            arg = [j for j in args[0] if tokens[j].value not in ('self', '.')]
+            if len(arg) == 1 and tokens[arg[0]].kind == NAME:
+                facts['subscriptions'].append({
+                    'line': token.line,
+                    'kind': tokens[i - 2].value if token.value == 'connect' else 'subscribe',
+                    'callback': tokens[arg[0]].value,
+                })
+    return facts
+
+
+def analyze_source(text, parse=parse_tokens):
+    """
+    Return {'class_name', 'aliases', 'action_types', 'functions', 'frame'} for one script.
+
+    parse turns the token list into a gd_parser tree; StateDispatchIndex
+    passes one that goes through the shared ParseCache.
+    """
+    if not any(marker in text for marker in MARKERS):
+        return {'class_name': None, 'aliases': {}, 'action_types': {}, 'functions': {}, 'frame': {}}
+
+    tokens = list(tokenize(text))
+    tree = parse(tokens)
+    lines = text.splitlines()
+    aliases = {}
+    action_types = {}
+    for const in tree['consts']:
+        if const['preload']:
+            aliases[const['name']] = const['preload']
+        elif const['name'].startswith("ACTION_"):
+            match = ACTION_VALUE_PATTERN.match(const['value'] or "")
+            if match:
+                action_types[const['name']] = match.group(1)
+
+    functions = find_functions(tokens, tree)
+    scanned = {key: scan_function(tokens, body['start'], body['end'], lines)
+               for key, body in functions.items()}
+
+    # Breadth-first from the frame roots over same-file helpers, as in hot_path_lint
+    frame = {}
+    queue = deque()
+    for key in functions:
+        if key[1] in FRAME_ROOTS:
+            frame[key] = [_label(key)]
+            queue.append(key)
+    while queue:
+        key = queue.popleft()
+        for callee in scanned[key]['calls']:
+            target = (key[0], callee)
+            if target in functions and target not in frame:
+                frame[target] = frame[key] + [_label(target)]
+                queue.append(target)
+
+    return {
+        'class_name': tree['class_name'],
+        'aliases': aliases,
+        'action_types': action_types,
+        'functions': {_label(key): {'line': functions[key]['line'], 'owner': key[0], **facts}
+                      for key, facts in scanned.items()},
+        'frame': {_label(key): via for key, via in frame.items()},
+    }
+
+
+class StateDispatchIndex(FileIndex):
+    """FileIndex variant whose entries hold each script's store-related facts."""
+
+    version = 1
+    filename = "state_dispatch_index.json"
+
+    extract_phase = "analyze"
+
+    def extract(self, key, data):
+        return analyze_source(data.decode('utf-8'), lambda tokens: self.parse_tree(data, tokens))
+
+
+class StoreModel:
+    """Cross-file view of the store: action types, reducers, readers and dispatch sites."""
+
+    def __init__(self, scripts, slice_manager_text):
+        self.scripts = scripts
+        self.class_paths = {facts['class_name']: rel for rel, facts in scripts.items() if facts['class_name']}
+        self._reads = {}
+        self._reducer_types = {}
+
+        # (actions file, ACTION_X) -> type, and type -> creators
+        self.action_types = {}
+        self.creators = defaultdict(list)
+        for rel, facts in scripts.items():
+            if not rel.startswith(ACTIONS_DIR):
+                continue
+            for const, action_type in facts['action_types'].items():
+                self.action_types[(rel, const)] = action_type
+            for label in facts['functions']:
+                # _static_init only registers the types; creators are the public funcs
+                if label.startswith("_"):
+                    continue
+                for action_type in self._closure_types(rel, label):
+                    self.creators[action_type].append(f"{facts['class_name'] or rel}.{label}")
+        self.types = sorted(set(self.action_types.values()))
+
+        # slice -> reducer file, from the registrations in the slice manager
+        self.slice_reducers = {}
+        manager_facts = scripts.get(SLICE_MANAGER)
+        current = None
+        for line in slice_manager_text.splitlines():
+            match = SLICE_CONFIG_PATTERN.search(line)
+            if match:
+                current = match.group(1)
+            match = SLICE_REDUCER_PATTERN.search(line)
+            if match and current and manager_facts:
+                reducer = self.resolve(SLICE_MANAGER, match.group(1))
+                if reducer:
+                    self.slice_reducers[current] = reducer
+        self.slices = set(self.slice_reducers)
+        self.handled_by = defaultdict(list)
+        for slice_name, reducer in sorted(self.slice_reducers.items()):
+            for action_type in self.reducer_types(reducer, set()):
+                self.handled_by[action_type].append(slice_name)
+
+    def resolve(self, rel, receiver):
+        """Return the script a receiver (const preload or class_name) names from rel, or None."""
+        preload = self.scripts[rel]['aliases'].get(receiver) if rel in self.scripts else None
+        if preload:
+            target = preload[len("res://"):] if preload.startswith("res://") else preload
+            return target if target in self.scripts else None
+        return self.class_paths.get(receiver)
+
+    def action_type(self, rel, receiver, const):
+        target = self.resolve(rel, receiver) if receiver else rel
+        return self.action_types.get((target, const))
+
+    def _closure_types(self, rel, label):
+        """Action types referenced by a function and the same-file helpers it calls."""
+        functions = self.scripts[rel]['functions']
+        seen = {label}
+        queue = [label]
+        found = set()
+        while queue:
+            func = functions[queue.pop()]
+            for receiver, const in func['action_refs']:
+                action_type = self.action_type(rel, receiver, const)
+                if action_type:
+                    found.add(action_type)
+            for callee in func['calls']:
+                target = f"{func['owner']}.{callee}" if func['owner'] else callee
+                if target in functions and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return found
+
+    def reducer_types(self, rel, visiting):
+        """Action types a reducer script handles, following calls into other reducers."""
+        if rel in self._reducer_types:
+            return self._reducer_types[rel]
+        visiting.add(rel)
+        found = set()
+        for func in self.scripts[rel]['functions'].values():
+            for receiver, const in func['action_refs']:
+                action_type = self.action_type(rel, receiver, const)
+                if action_type:
+                    found.add(action_type)
+            for receiver, _method in func['ext_calls']:
+                target = self.resolve(rel, receiver)
+                if target and target.startswith(REDUCERS_DIR) and target not in visiting:
+                    found |= self.reducer_types(target, visiting)
+        self._reducer_types[rel] = found
+        return found
+
+    def reads(self, rel, label):
+        """Slices a function reads, directly, through same-file helpers or through selectors."""
+        key = (rel, label)
+        if key in self._reads:
+            return self._reads[key]
+        self._reads[key] = set()
+        func = self.scripts[rel]['functions'][label]
+        found = {key for key in func['keys'] if key in self.slices}
+        for callee in func['calls']:
+            target = f"{func['owner']}.{callee}" if func['owner'] else callee
+            if target in self.scripts[rel]['functions']:
+                found |= self.reads(rel, target)
+        for receiver, method in func['ext_calls']:
+            target = self.resolve(rel, receiver)
+            if target and target.startswith(SELECTORS_DIR) and method in self.scripts[target]['functions']:
+                found |= self.reads(target, method)
+        self._reads[key] = found
+        return found
+
+    def dispatch_types(self, rel, dispatch):
+        """Action types a dispatch site sends; empty when it cannot be resolved statically."""
+        found = set()
+        if dispatch['creator']:
+            receiver, method = dispatch['creator']
+            target = self.resolve(rel, receiver)
+            if target and target.startswith(ACTIONS_DIR) and method in self.scripts[target]['functions']:
+                found |= self._closure_types(target, method)
+        for receiver, const in dispatch['action_refs']:
+            action_type = self.action_type(rel, receiver, const)
+            if action_type:
+                found.add(action_type)
+        return found
+
+
+def build_report(model):
+    """Return (dispatches, subscribers, selectors) gathered over every script."""
+    dispatches = []
+    subscribers = []
+    selectors = defaultdict(set)
+    for rel, facts in sorted(model.scripts.items()):
+        if rel.startswith(TEST_DIRS):
+            continue
+        for label, func in facts['functions'].items():
+            if rel.startswith(SELECTORS_DIR) and not label.startswith("_"):
+                for slice_name in model.reads(rel, label):
+                    selectors[slice_name].add(f"{facts['class_name'] or rel}.{label}")
+            for dispatch in func['dispatches']:
+                dispatches.append({
+                    'path': rel,
+                    'function': label,
+                    'types': sorted(model.dispatch_types(rel, dispatch)),
+                    'via': facts['frame'].get(label),
+                    **dispatch,
+                })
+            for subscription in func['subscriptions']:
+                callback = (f"{func['owner']}.{subscription['callback']}" if func['owner']
+                            else subscription['callback'])
+                if callback not in facts['functions']:
+                    continue
+                subscribers.append({
+                    'path': rel,
+                    'line': subscription['line'],
+                    'kind': subscription['kind'],
+                    'callback': callback,
+                    'slices': sorted(model.reads(rel, callback)),
+                    'types': sorted(model._closure_types(rel, callback)),
+                })
+    return dispatches, subscribers, selectors
+
+
+def dispatch_cost(model, subscribers, types):
+    """Describe the work one dispatch of these action types does in the store."""
+    per_kind = defaultdict(int)
+    for subscriber in subscribers:
+        per_kind[subscriber['kind']] += 1
+    changed = sorted({slice_name for action_type in types for slice_name in model.handled_by[action_type]})
+    readers = [s for s in subscribers if s['kind'] == 'slice_updated' and set(s['slices']) & set(changed)]
+    parts = [f"{len(model.slice_reducers)} reducers"]
+    if per_kind['subscribe']:
+        parts.append(f"1 state deep copy for {per_kind['subscribe']} subscribe() callbacks")
+    if per_kind['action_dispatched']:
+        parts.append(f"{per_kind['action_dispatched']} action_dispatched handlers")
+    if changed:
+        parts.append(f"changes {', '.join(changed)}"
+                     + (f" ({len(readers)} slice_updated readers)" if readers else ""))
+    return ", ".join(parts)
+
+
+def print_report(model, dispatches, subscribers, selectors, hot, action_filter, top):
+    sites = defaultdict(list)
+    for dispatch in dispatches:
+        for action_type in dispatch['types']:
+            sites[action_type].append(dispatch)
+    types = [t for t in model.types if t.startswith(action_filter or "")]
+    if action_filter:
+        hot = [d for d in hot if any(t.startswith(action_filter) for t in d['types'])]
+    types.sort(key=lambda t: (-sum(1 for d in sites[t] if d['via']), -len(sites[t]), t))
+
+    print("=== Per-Frame Dispatches ===")
+    print()
+    if not hot:
+        print("✅ No dispatch reachable from a per-frame function")
+    for dispatch in hot:
+        what = ", ".join(dispatch['types']) or "unresolved action"
+        print(f"🔥 {dispatch['path']}:{dispatch['line']} {what}")
+        print(f"   {dispatch['text']}")
+        print(f"   via {' → '.join(dispatch['via'])}")
+        print(f"   each call: {dispatch_cost(model, subscribers, dispatch['types'])}")
+    print()
+
+    print("=== Action Types ===")
+    print()
+    for action_type in types[:top or None]:
+        changed = model.handled_by[action_type]
+        per_frame = sum(1 for d in sites[action_type] if d['via'])
+        icon = "🔥" if per_frame else ("⚠️ " if sites[action_type] and not changed else "🎬")
+        print(f"{icon} {action_type}: {len(sites[action_type])} dispatch sites"
+              + (f" ({per_frame} per-frame)" if per_frame else ""))
+        print(f"   creators: {', '.join(model.creators[action_type]) or '-'}")
+        print(f"   reducers: {', '.join(changed) or 'none (no slice changes)'}")
+        readers = sorted({reader for slice_name in changed for reader in selectors[slice_name]})
+        if readers:
+            print(f"   selectors: {len(readers)} ({', '.join(readers[:4])}{', ...' if len(readers) > 4 else ''})")
+        watching = [s for s in subscribers
+                    if set(s['slices']) & set(changed) or action_type in s['types']]
+        for subscriber in watching:
+            print(f"   subscriber: {subscriber['path']}:{subscriber['line']} "
+                  f"{subscriber['kind']} → {subscriber['callback']}")
+    if len(types) > (top or len(types)):
+        print(f"   ... {len(types) - top} more (--top 0 lists all)")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Map store actions to reducers and readers, find per-frame dispatches')
+    parser.add_argument('--action', metavar='PREFIX', help='Only list action types starting with PREFIX')
+    parser.add_argument('--top', type=int, default=20, help='Action types to list, 0 = all (default: 20)')
+    parser.add_argument('--fail-on-frame', action='store_true',
+                        help='Exit with status 1 if any dispatch is reachable from a per-frame function')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-analyze every file')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for cold files (default: CPU count, 1 = serial)')
+    add_profile_arguments(parser)
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root)
+    writer = open_writer(args.format, "state_dispatch_report", RULES)
+    profiler = start_profiler("state_dispatch_report", project_root, args)
+
+    print("=== State Store Dispatch Report ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    with profiler.phase("index_load"):
+        index = StateDispatchIndex(project_root) if args.no_cache else StateDispatchIndex.load(project_root)
+    with profiler.phase("walk"):
+        walked = list(iter_gd_files(project_root, config['scan_roots'], config['exclude']))
+    with profiler.phase("analyze"):
+        all_facts = index_files([gd_file for gd_file, _rel in walked], index, args.jobs)
+    with profiler.phase("index_save"):
+        index.prune()
+        index.save()
+
+    scripts = {rel: facts for (_gd_file, rel), facts in zip(walked, all_facts)
+               if facts and (facts['functions'] or facts['action_types'])}
+    try:
+        slice_manager_text = (project_root / SLICE_MANAGER).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {SLICE_MANAGER}: {e}")
+        slice_manager_text = ""
+
+    with profiler.phase("resolve"):
+        model = StoreModel(scripts, slice_manager_text)
+        dispatches, subscribers, selectors = build_report(model)
+    hot = [d for d in dispatches if d['via']]
+    unresolved = [d for d in dispatches if not d['types']]
+    unhandled = sorted({t for d in dispatches for t in d['types'] if not model.handled_by[t]})
+
+    if writer is not None:
+        for dispatch in hot:
+            what = ", ".join(dispatch['types']) or "an unresolved action"
+            writer.emit("state-dispatch-per-frame", dispatch['path'], dispatch['line'],
+                        f"dispatch of {what} reachable from {dispatch['via'][0]}; each call runs "
+                        f"{dispatch_cost(model, subscribers, dispatch['types'])}",
+                        function=dispatch['function'], via=dispatch['via'], action_types=dispatch['types'])
+        for dispatch in dispatches:
+            missing = [t for t in dispatch['types'] if t in unhandled]
+            if missing:
+                writer.emit("state-action-unhandled", dispatch['path'], dispatch['line'],
+                            f"{', '.join(missing)} is handled by no slice reducer", level='note',
+                            action_types=missing)
+        profiler.finish(index)
+        exit_code = writer.close({'scripts': len(scripts), 'action_types': len(model.types),
+                                  'dispatch_sites': len(dispatches), 'per_frame': len(hot),
+                                  'unresolved': len(unresolved), 'subscribers': len(subscribers)})
+        if exit_code == EXIT_FINDINGS and not (args.fail_on_frame and hot):
+            exit_code = EXIT_CLEAN
+        sys.exit(exit_code)
+
+    with profiler.phase("report"):
+        print_report(model, dispatches, subscribers, selectors, hot, args.action, args.top)
+
+    print("=== Summary ===")
+    print(f"Scripts touching the store: {len(scripts)}")
+    print(f"Slices: {len(model.slice_reducers)} (every dispatch runs all their reducers)")
+    print(f"Action types: {len(model.types)} ({sum(1 for t in model.types if model.creators[t])} with creators)")
+    print(f"Dispatch sites: {len(dispatches)} ({len(unresolved)} unresolved)")
+    print(f"Subscribers: {len(subscribers)}")
+    if unhandled:
+        print(f"⚠️  Dispatched but handled by no reducer: {', '.join(unhandled)}")
+    print(f"Per-frame dispatch sites: {len(hot)}")
+    print(index.summary())
+    print()
+    if hot:
+        print("💡 Fix: dispatch on change or on a timer instead of every frame, or keep per-frame "
+              "values in components")
+    profiler.finish(index)
+
+    if args.fail_on_frame and hot:
+        sys.exit(EXIT_FINDINGS)
+
+
+if __name__ == "__main__":
+    main()
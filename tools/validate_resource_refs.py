@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Validate [ext_resource] references in .tres and .tscn files.
+
+Godot records every dependency of a resource or scene twice: as path= and
+as uid="uid://...". Godot loads by UID first and only falls back to the
+path, so a stale UID silently loads the wrong file and a stale path breaks
+as soon as the UID cache is rebuilt. This tool checks both without
+launching Godot:
+
+- Broken references: the path does not exist and the UID does not resolve
+- UID mismatches: the UID is declared by a different file than the path
+- Duplicate UIDs: two files declare the same UID
+- Inconsistent UIDs (warning): referrers disagree on the UID of one path,
+  or on the path of one undeclared UID
+
+Only the header section of each .tres/.tscn is read (through mmap, up to
+the first [sub_resource]/[node]/[resource] section). The UID->path index
+built from resource headers, .import and .uid sidecars is persisted in
+.tools_cache/resource_ref_index.json, so unchanged files are only stat()ed
+on later runs.
+
+Usage:
+    python3 tools/validate_resource_refs.py
+    python3 tools/validate_resource_refs.py --strict      # warnings fail too
+    python3 tools/validate_resource_refs.py --no-cache
+    python3 tools/validate_resource_refs.py --profile
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from gd_config import load_config
+from gd_file_index import FileIndex
+from gd_profile import active, add_profile_arguments, start_profiler
+from res_dep_graph import (
+    ATTR_PATTERN,
+    BODY_SECTION_PREFIXES,
+    EXCLUDED_DIRS,
+    EXT_RESOURCE_PATTERN,
+    HEADER_UID_PATTERN,
+    IMPORT_UID_PATTERN,
+    resolve_reference,
+    to_res_path,
+)
+from gd_scanner import walk_tree
+
+RESOURCE_SUFFIXES = ('.tres', '.tscn')
+SIDECAR_SUFFIXES = ('.import', '.uid')
+
+_BODY_PREFIXES = tuple(prefix.encode('ascii') for prefix in BODY_SECTION_PREFIXES)
+
+
+def read_header(file_path):
+    """Return the bytes of a file's header section (whole file for sidecars)."""
+    with open(file_path, 'rb') as f:
+        if not file_path.name.endswith(RESOURCE_SUFFIXES):
+            return f.read()
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while True:
+                line = mm.readline()
+                if not line or line.startswith(_BODY_PREFIXES):
+                    return mm[:mm.tell() - len(line)]
+
+
+def parse_header_facts(header, suffix):
+    """Extract the declared UID and ext_resource references from header bytes."""
+    text = header.decode('utf-8', errors='replace')
+    facts = {'uid': None, 'ext_resources': []}
+
+    if suffix == '.uid':
+        first = text.strip()
+        facts['uid'] = first if first.startswith('uid://') else None
+        return facts
+
+    for line_num, line in enumerate(text.splitlines(), 1):
+        if suffix == '.import':
+            match = IMPORT_UID_PATTERN.match(line)
+            if match:
+                facts['uid'] = match.group(1)
+                break
+            continue
+
+        match = HEADER_UID_PATTERN.match(line)
+        if match:
+            facts['uid'] = match.group(1)
+            continue
+        match = EXT_RESOURCE_PATTERN.match(line)
+        if match:
+            attrs = dict(ATTR_PATTERN.findall(match.group(1)))
+            facts['ext_resources'].append({
+                'line': line_num,
+                'type': attrs.get('type', ''),
+                'path': attrs.get('path'),
+                'uid': attrs.get('uid'),
+                'id': attrs.get('id', ''),
+            })
+
+    return facts
+
+
+class ResourceRefIndex(FileIndex):
+    """FileIndex variant whose entries hold header facts of resources and sidecars."""
+
+    version = 1
+    filename = "resource_ref_index.json"
+    extract_phase = "headers"
+
+    def read(self, file_path):
+        return read_header(Path(file_path))
+
+    def extract(self, key, data):
+        return parse_header_facts(data, Path(key).suffix)
+
+
+def walk_project(tree):
+    """Return (all res:// paths, files to index) from a walk_tree() result."""
+    all_paths = {"res://" + rel_path for _path, rel_path in tree.files}
+    to_index = [path for path, rel_path in tree.files
+                if rel_path.endswith(RESOURCE_SUFFIXES) or rel_path.endswith(SIDECAR_SUFFIXES)]
+    return all_paths, to_index
+
+
+def check_resources(project_root, index, tree):
+    """Index every header in tree and return (errors, warnings, unverified, facts_by_path)."""
+    profiler = active()
+    all_paths, to_index = walk_project(tree)
+    facts_by_path = {}
+    with profiler.phase("headers"):
+        for file_path in to_index:
+            facts = index.get_facts(file_path)
+            if facts is not None:
+                facts_by_path[to_res_path(file_path.relative_to(project_root))] = facts
+    with profiler.phase("validate"):
+        errors, warnings, unverified = validate(project_root, facts_by_path, all_paths)
+    return errors, warnings, unverified, facts_by_path
+
+
+def owner_of(res_path):
+    """Return the file a UID declaration belongs to (strips sidecar suffixes)."""
+    for suffix in SIDECAR_SUFFIXES:
+        if res_path.endswith(suffix):
+            return res_path[:-len(suffix)]
+    return res_path
+
+
+def validate(project_root, facts_by_path, all_paths):
+    """Return (errors, warnings, unverified) from indexed header facts."""
+    declared = defaultdict(set)
+    for res_path, facts in facts_by_path.items():
+        if facts['uid']:
+            declared[facts['uid']].add(owner_of(res_path))
+
+    errors = defaultdict(list)
+    warnings = defaultdict(list)
+
+    for uid, owners in sorted(declared.items()):
+        if len(owners) > 1:
+            for owner in sorted(owners):
+                others = ", ".join(sorted(owners - {owner}))
+                errors[owner].append({'line': 1, 'message': f"Duplicate UID {uid} (also declared by {others})"})
+    uid_to_path = {uid: min(owners) for uid, owners in declared.items()}
+
+    def exists(res_path):
+        if res_path in all_paths:
+            return True
+        return res_path.startswith("res://") and (project_root / res_path[len("res://"):]).exists()
+
+    uids_by_target = defaultdict(lambda: defaultdict(list))
+    targets_by_uid = defaultdict(lambda: defaultdict(list))
+    unverified = 0
+
+    for res_path in sorted(facts_by_path):
+        for ref in facts_by_path[res_path]['ext_resources']:
+            path = resolve_reference(ref['path'], res_path) if ref['path'] else None
+            uid = ref['uid']
+            uid_target = uid_to_path.get(uid) if uid else None
+            label = f"{ref['type'] or 'Resource'} id={ref['id']}"
+
+            if path and uid:
+                uids_by_target[path][uid].append((res_path, ref['line']))
+                targets_by_uid[uid][path].append((res_path, ref['line']))
+
+            if uid_target and path and uid_target != path:
+                errors[res_path].append({
+                    'line': ref['line'],
+                    'message': f"UID mismatch: {label} {uid} is {uid_target}, path says {path}"
+                })
+            elif path and not exists(path) and not uid_target:
+                errors[res_path].append({'line': ref['line'], 'message': f"Broken path: {label} {path}"})
+            elif not path and uid and not uid_target:
+                errors[res_path].append({'line': ref['line'], 'message': f"Unknown UID: {label} {uid}"})
+            elif uid and not uid_target:
+                # Scripts have no sidecar unless .uid files are committed
+                unverified += 1
+
+    for path, uids in sorted(uids_by_target.items()):
+        if len(uids) < 2:
+            continue
+        for uid, sites in sorted(uids.items()):
+            for res_path, line in sites:
+                others = ", ".join(sorted(set(uids) - {uid}))
+                warnings[res_path].append({
+                    'line': line,
+                    'message': f"Inconsistent UID for {path}: {uid} here, {others} elsewhere"
+                })
+
+    for uid, paths in sorted(targets_by_uid.items()):
+        if len(paths) < 2 or uid in uid_to_path:
+            continue
+        for path, sites in sorted(paths.items()):
+            for res_path, line in sites:
+                others = ", ".join(sorted(set(paths) - {path}))
+                warnings[res_path].append({
+                    'line': line,
+                    'message': f"Inconsistent paths for {uid}: {path} here, {others} elsewhere"
+                })
+
+    return errors, warnings, unverified
+
+
+def print_findings(title, findings, icon):
+    print(f"=== {title} ===")
+    print()
+    for res_path in sorted(findings):
+        print(f"{icon} {res_path}")
+        for finding in sorted(findings[res_path], key=lambda f: f['line']):
+            print(f"   Line {finding['line']:4d}: {finding['message']}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate .tres/.tscn ext_resource paths and UIDs')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk index and re-read every header')
+    parser.add_argument('--strict', action='store_true',
+                        help='Exit non-zero on warnings as well as errors')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    start = time.perf_counter()
+    profiler = start_profiler("validate_resource_refs", project_root, args)
+
+    print("=== Resource Reference Validator ===")
+    print(f"Project root: {project_root}")
+    print()
+
+    with profiler.phase("index_load"):
+        index = ResourceRefIndex(project_root) if args.no_cache else ResourceRefIndex.load(project_root)
+    with profiler.phase("walk"):
+        tree = walk_tree(project_root, EXCLUDED_DIRS, load_config(project_root)['exclude'])
+
+    errors, warnings, unverified, facts_by_path = check_resources(project_root, index, tree)
+    with profiler.phase("index_save"):
+        index.prune()
+        index.save()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    resources = sum(1 for p in facts_by_path if p.endswith(RESOURCE_SUFFIXES))
+    references = sum(len(f['ext_resources']) for f in facts_by_path.values())
+    uids = sum(1 for f in facts_by_path.values() if f['uid'])
+    print(f"Resources scanned: {resources} ({references} ext_resource references)")
+    print(f"UIDs indexed: {uids}")
+    if unverified:
+        print(f"UIDs without a declaring file (path checked only): {unverified}")
+    print(index.summary())
+    print(f"Elapsed: {elapsed_ms:.0f} ms")
+    print()
+
+    if errors:
+        print_findings("Errors Found", errors, "❌")
+    if warnings:
+        print_findings("Warnings", warnings, "⚠️")
+
+    error_count = sum(len(e) for e in errors.values())
+    warning_count = sum(len(w) for w in warnings.values())
+    if not errors and not warnings:
+        print("✅ All resource references resolve!")
+    else:
+        print(f"Total errors: {error_count}")
+        print(f"Total warnings: {warning_count}")
+        print()
+        print("💡 Fix: Re-save the referencing resource in the editor, or correct path=/uid= by hand")
+
+    profiler.finish(index)
+    if error_count or (args.strict and warning_count):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()